@@ -0,0 +1,42 @@
+"""add review hot path indexes
+
+Revision ID: 3c7e91b2d4f0
+Revises: a10ccf203e5f
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e91b2d4f0'
+down_revision: Union[str, None] = 'a10ccf203e5f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_words_language_code', 'words', ['language_code'], unique=False)
+    op.create_index('ix_groups_language_code', 'groups', ['language_code'], unique=False)
+    op.create_index('ix_word_groups_group_id_word_id', 'word_groups', ['group_id', 'word_id'], unique=False)
+    op.create_index('ix_study_sessions_group_id_created_at', 'study_sessions', ['group_id', 'created_at'], unique=False)
+    op.create_index('ix_study_sessions_study_activity_id_created_at', 'study_sessions', ['study_activity_id', 'created_at'], unique=False)
+    op.create_index('ix_study_sessions_created_at', 'study_sessions', ['created_at'], unique=False)
+    op.create_index('ix_word_review_items_word_id_correct', 'word_review_items', ['word_id', 'correct'], unique=False)
+    op.create_index('ix_word_review_items_study_session_id_created_at_correct', 'word_review_items', ['study_session_id', 'created_at', 'correct'], unique=False)
+    # Give the planner fresh statistics for the new indexes
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_word_review_items_study_session_id_created_at_correct', table_name='word_review_items')
+    op.drop_index('ix_word_review_items_word_id_correct', table_name='word_review_items')
+    op.drop_index('ix_study_sessions_created_at', table_name='study_sessions')
+    op.drop_index('ix_study_sessions_study_activity_id_created_at', table_name='study_sessions')
+    op.drop_index('ix_study_sessions_group_id_created_at', table_name='study_sessions')
+    op.drop_index('ix_word_groups_group_id_word_id', table_name='word_groups')
+    op.drop_index('ix_groups_language_code', table_name='groups')
+    op.drop_index('ix_words_language_code', table_name='words')
@@ -0,0 +1,129 @@
+"""add daily activity rollup
+
+Revision ID: 5b9e2d7f3a61
+Revises: 8d2f4a6c1e93
+Create Date: 2026-10-18 14:26:40.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e2d7f3a61'
+down_revision: Union[str, None] = '8d2f4a6c1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('daily_activity',
+    sa.Column('language_code', sa.String(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('sessions', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('reviews', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('correct', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['language_code'], ['languages.code'], ),
+    sa.PrimaryKeyConstraint('language_code', 'date')
+    )
+
+    # Backfill the rollup from the existing sessions and reviews
+    op.execute("""
+        INSERT INTO daily_activity (language_code, date, sessions, reviews, correct)
+        SELECT language_code, day, sum(sessions), sum(reviews), sum(correct) FROM (
+            SELECT groups.language_code AS language_code, date(study_sessions.created_at) AS day,
+                   1 AS sessions, 0 AS reviews, 0 AS correct
+            FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+            WHERE study_sessions.created_at IS NOT NULL
+            UNION ALL
+            SELECT groups.language_code, date(word_review_items.created_at),
+                   0, 1, (CASE WHEN word_review_items.correct THEN 1 ELSE 0 END)
+            FROM word_review_items
+            JOIN study_sessions ON study_sessions.id = word_review_items.study_session_id
+            JOIN groups ON groups.id = study_sessions.group_id
+            WHERE word_review_items.created_at IS NOT NULL
+        )
+        GROUP BY language_code, day
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trg_study_sessions_activity_insert AFTER INSERT ON study_sessions
+        BEGIN
+            INSERT INTO daily_activity (language_code, date, sessions, reviews, correct)
+            SELECT language_code, date(NEW.created_at), 1, 0, 0
+            FROM groups WHERE id = NEW.group_id AND NEW.created_at IS NOT NULL
+            ON CONFLICT (language_code, date) DO UPDATE SET sessions = sessions + 1;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_study_sessions_activity_delete AFTER DELETE ON study_sessions
+        BEGIN
+            UPDATE daily_activity SET sessions = sessions - 1
+            WHERE language_code = (SELECT language_code FROM groups WHERE id = OLD.group_id)
+              AND date = date(OLD.created_at);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_study_sessions_activity_update AFTER UPDATE OF group_id, created_at ON study_sessions
+        BEGIN
+            UPDATE daily_activity SET sessions = sessions - 1
+            WHERE language_code = (SELECT language_code FROM groups WHERE id = OLD.group_id)
+              AND date = date(OLD.created_at);
+            INSERT INTO daily_activity (language_code, date, sessions, reviews, correct)
+            SELECT language_code, date(NEW.created_at), 1, 0, 0
+            FROM groups WHERE id = NEW.group_id AND NEW.created_at IS NOT NULL
+            ON CONFLICT (language_code, date) DO UPDATE SET sessions = sessions + 1;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_review_items_activity_insert AFTER INSERT ON word_review_items
+        BEGIN
+            INSERT INTO daily_activity (language_code, date, sessions, reviews, correct)
+            SELECT groups.language_code, date(NEW.created_at), 0, 1, (CASE WHEN NEW.correct THEN 1 ELSE 0 END)
+            FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+            WHERE study_sessions.id = NEW.study_session_id AND NEW.created_at IS NOT NULL
+            ON CONFLICT (language_code, date) DO UPDATE
+            SET reviews = reviews + 1, correct = correct + excluded.correct;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_review_items_activity_delete AFTER DELETE ON word_review_items
+        BEGIN
+            UPDATE daily_activity
+            SET reviews = reviews - 1, correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+            WHERE language_code = (
+                SELECT groups.language_code FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+                WHERE study_sessions.id = OLD.study_session_id
+            ) AND date = date(OLD.created_at);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_review_items_activity_update
+        AFTER UPDATE OF study_session_id, correct, created_at ON word_review_items
+        BEGIN
+            UPDATE daily_activity
+            SET reviews = reviews - 1, correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+            WHERE language_code = (
+                SELECT groups.language_code FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+                WHERE study_sessions.id = OLD.study_session_id
+            ) AND date = date(OLD.created_at);
+            INSERT INTO daily_activity (language_code, date, sessions, reviews, correct)
+            SELECT groups.language_code, date(NEW.created_at), 0, 1, (CASE WHEN NEW.correct THEN 1 ELSE 0 END)
+            FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+            WHERE study_sessions.id = NEW.study_session_id AND NEW.created_at IS NOT NULL
+            ON CONFLICT (language_code, date) DO UPDATE
+            SET reviews = reviews + 1, correct = correct + excluded.correct;
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_activity_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_activity_delete')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_activity_insert')
+    op.execute('DROP TRIGGER IF EXISTS trg_study_sessions_activity_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_study_sessions_activity_delete')
+    op.execute('DROP TRIGGER IF EXISTS trg_study_sessions_activity_insert')
+    op.drop_table('daily_activity')
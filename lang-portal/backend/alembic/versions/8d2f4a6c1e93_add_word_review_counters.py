@@ -0,0 +1,78 @@
+"""add word review counters
+
+Revision ID: 8d2f4a6c1e93
+Revises: 3c7e91b2d4f0
+Create Date: 2026-10-18 11:02:17.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4a6c1e93'
+down_revision: Union[str, None] = '3c7e91b2d4f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('words', sa.Column('correct_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('words', sa.Column('wrong_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill the counters from the existing reviews
+    op.execute("""
+        UPDATE words SET
+            correct_count = (SELECT count(*) FROM word_review_items
+                             WHERE word_review_items.word_id = words.id AND word_review_items.correct),
+            wrong_count = (SELECT count(*) FROM word_review_items
+                           WHERE word_review_items.word_id = words.id AND NOT word_review_items.correct)
+    """)
+
+    op.create_index('ix_words_language_code_correct_count', 'words', ['language_code', 'correct_count'], unique=False)
+    op.create_index('ix_words_language_code_wrong_count', 'words', ['language_code', 'wrong_count'], unique=False)
+
+    op.execute("""
+        CREATE TRIGGER trg_word_review_items_stats_insert AFTER INSERT ON word_review_items
+        BEGIN
+            UPDATE words
+            SET correct_count = correct_count + (CASE WHEN NEW.correct THEN 1 ELSE 0 END),
+                wrong_count = wrong_count + (CASE WHEN NEW.correct THEN 0 ELSE 1 END)
+            WHERE id = NEW.word_id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_review_items_stats_delete AFTER DELETE ON word_review_items
+        BEGIN
+            UPDATE words
+            SET correct_count = correct_count - (CASE WHEN OLD.correct THEN 1 ELSE 0 END),
+                wrong_count = wrong_count - (CASE WHEN OLD.correct THEN 0 ELSE 1 END)
+            WHERE id = OLD.word_id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_review_items_stats_update AFTER UPDATE OF word_id, correct ON word_review_items
+        BEGIN
+            UPDATE words
+            SET correct_count = correct_count - (CASE WHEN OLD.correct THEN 1 ELSE 0 END),
+                wrong_count = wrong_count - (CASE WHEN OLD.correct THEN 0 ELSE 1 END)
+            WHERE id = OLD.word_id;
+            UPDATE words
+            SET correct_count = correct_count + (CASE WHEN NEW.correct THEN 1 ELSE 0 END),
+                wrong_count = wrong_count + (CASE WHEN NEW.correct THEN 0 ELSE 1 END)
+            WHERE id = NEW.word_id;
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_stats_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_stats_delete')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_stats_insert')
+    op.drop_index('ix_words_language_code_wrong_count', table_name='words')
+    op.drop_index('ix_words_language_code_correct_count', table_name='words')
+    with op.batch_alter_table('words') as batch_op:
+        batch_op.drop_column('wrong_count')
+        batch_op.drop_column('correct_count')
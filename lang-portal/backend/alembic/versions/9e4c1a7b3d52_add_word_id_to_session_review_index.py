@@ -0,0 +1,29 @@
+"""add word_id to session review index
+
+Revision ID: 9e4c1a7b3d52
+Revises: d5b1f7a3c924
+Create Date: 2026-10-18 23:05:12.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4c1a7b3d52'
+down_revision: Union[str, None] = 'd5b1f7a3c924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The wider index also covers the per-bucket distinct words of /analytics/reviews
+    op.create_index('ix_word_review_items_session_id_created_at_correct_word_id', 'word_review_items', ['study_session_id', 'created_at', 'correct', 'word_id'], unique=False)
+    op.drop_index('ix_word_review_items_study_session_id_created_at_correct', table_name='word_review_items')
+
+
+def downgrade() -> None:
+    op.create_index('ix_word_review_items_study_session_id_created_at_correct', 'word_review_items', ['study_session_id', 'created_at', 'correct'], unique=False)
+    op.drop_index('ix_word_review_items_session_id_created_at_correct_word_id', table_name='word_review_items')
@@ -0,0 +1,41 @@
+"""add word difficulty
+
+Revision ID: a7c3e9d2b415
+Revises: f2d84b1c9e56
+Create Date: 2026-10-18 21:12:40.318502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d2b415'
+down_revision: Union[str, None] = 'f2d84b1c9e56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('word_difficulty',
+    sa.Column('language_code', sa.String(), nullable=False),
+    sa.Column('window_days', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('word_id', sa.Integer(), nullable=False),
+    sa.Column('error_rate', sa.Float(), nullable=False),
+    sa.Column('reviews', sa.Integer(), nullable=False),
+    sa.Column('wrong', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['language_code'], ['languages.code'], ),
+    sa.ForeignKeyConstraint(['word_id'], ['words.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('language_code', 'window_days', 'rank')
+    )
+    op.create_index('ix_word_review_items_created_at_word_id_correct', 'word_review_items', ['created_at', 'word_id', 'correct'], unique=False)
+    # The table fills at the next refresh, or right away with POST /admin/rebuild-word-difficulty
+
+
+def downgrade() -> None:
+    op.drop_index('ix_word_review_items_created_at_word_id_correct', table_name='word_review_items')
+    op.drop_table('word_difficulty')
@@ -0,0 +1,81 @@
+"""add group words count
+
+Revision ID: b3f8d1a6c7e2
+Revises: e4a7c2f19b38
+Create Date: 2026-10-18 17:41:05.522913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f8d1a6c7e2'
+down_revision: Union[str, None] = 'e4a7c2f19b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('groups', sa.Column('words_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing links, counting only words in the group's language
+    op.execute("""
+        UPDATE groups SET words_count = (
+            SELECT count(*) FROM word_groups JOIN words ON words.id = word_groups.word_id
+            WHERE word_groups.group_id = groups.id AND words.language_code = groups.language_code
+        )
+    """)
+
+    op.create_index('ix_groups_language_code_words_count', 'groups', ['language_code', 'words_count'], unique=False)
+
+    op.execute("""
+        CREATE TRIGGER trg_word_groups_words_count_insert AFTER INSERT ON word_groups
+        BEGIN
+            UPDATE groups SET words_count = words_count + 1
+            WHERE id = NEW.group_id
+              AND language_code = (SELECT language_code FROM words WHERE id = NEW.word_id);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_groups_words_count_delete AFTER DELETE ON word_groups
+        BEGIN
+            UPDATE groups SET words_count = words_count - 1
+            WHERE id = OLD.group_id
+              AND language_code = (SELECT language_code FROM words WHERE id = OLD.word_id);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_groups_words_count_update AFTER UPDATE OF word_id, group_id ON word_groups
+        BEGIN
+            UPDATE groups SET words_count = words_count - 1
+            WHERE id = OLD.group_id
+              AND language_code = (SELECT language_code FROM words WHERE id = OLD.word_id);
+            UPDATE groups SET words_count = words_count + 1
+            WHERE id = NEW.group_id
+              AND language_code = (SELECT language_code FROM words WHERE id = NEW.word_id);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_words_words_count_language_update AFTER UPDATE OF language_code ON words
+        BEGIN
+            UPDATE groups SET words_count = words_count - 1
+            WHERE language_code = OLD.language_code
+              AND id IN (SELECT group_id FROM word_groups WHERE word_id = NEW.id);
+            UPDATE groups SET words_count = words_count + 1
+            WHERE language_code = NEW.language_code
+              AND id IN (SELECT group_id FROM word_groups WHERE word_id = NEW.id);
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_words_words_count_language_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_groups_words_count_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_groups_words_count_delete')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_groups_words_count_insert')
+    op.drop_index('ix_groups_language_code_words_count', table_name='groups')
+    # Native DROP COLUMN: a batch rebuild of groups would break the triggers that reference it
+    op.drop_column('groups', 'words_count')
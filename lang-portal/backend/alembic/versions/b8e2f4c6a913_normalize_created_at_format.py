@@ -0,0 +1,35 @@
+"""normalize created_at format
+
+Revision ID: b8e2f4c6a913
+Revises: 9e4c1a7b3d52
+Create Date: 2026-10-19 09:14:37.215904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f4c6a913'
+down_revision: Union[str, None] = '9e4c1a7b3d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('study_sessions', 'word_review_items')
+
+
+def upgrade() -> None:
+    # Rows written by the CURRENT_TIMESTAMP default are stored as 'YYYY-MM-DD HH:MM:SS', rows
+    # written from Python as 'YYYY-MM-DD HH:MM:SS.ffffff'; keyset cursors compare the text, so
+    # give every row the Python format. PostgreSQL stores timestamps, not text.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+
+def downgrade() -> None:
+    # The microsecond format is what the models write; nothing to undo
+    pass
@@ -0,0 +1,33 @@
+"""unlink deleted words
+
+Revision ID: c4d9a2e7f1b5
+Revises: b8e2f4c6a913
+Create Date: 2026-10-19 15:02:48.731406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9a2e7f1b5'
+down_revision: Union[str, None] = 'b8e2f4c6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Unlink a word before it is deleted, so trg_word_groups_words_count_delete still finds
+    # its language and decrements groups.words_count
+    op.execute("""
+        CREATE TRIGGER trg_words_words_count_delete BEFORE DELETE ON words
+        BEGIN
+            DELETE FROM word_groups WHERE word_id = OLD.id;
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_words_words_count_delete')
@@ -0,0 +1,89 @@
+"""add words fts
+
+Revision ID: c6a9e3f5d217
+Revises: b3f8d1a6c7e2
+Create Date: 2026-10-18 18:52:37.104826
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a9e3f5d217'
+down_revision: Union[str, None] = 'b3f8d1a6c7e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Arabic folds as of this revision (app.utils.search.ARABIC_FOLDS): code point -> replacement or None
+ARABIC_FOLDS = {
+    **{code: None for code in range(0x064B, 0x0656)},
+    0x0670: None,
+    0x0640: None,
+    0x0622: 0x0627,
+    0x0623: 0x0627,
+    0x0625: 0x0627,
+    0x0671: 0x0627,
+    0x0649: 0x064A,
+    0x0629: 0x0647,
+}
+
+
+def fold(expression: str) -> str:
+    folded = expression
+    for code, replacement in ARABIC_FOLDS.items():
+        target = f"char({replacement})" if replacement else "''"
+        folded = f"replace({folded}, char({code}), {target})"
+    glob = f"*[{chr(min(ARABIC_FOLDS))}-{chr(max(ARABIC_FOLDS))}]*"
+    return f"CASE WHEN {expression} GLOB '{glob}' THEN {folded} ELSE {expression} END"
+
+
+def fold_columns(prefix: str) -> str:
+    return ", ".join(fold(f"{prefix}{column}") for column in ("script", "transliteration", "meaning"))
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE VIRTUAL TABLE words_fts USING fts5(
+            script, transliteration, meaning, language_code,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+
+    op.execute(f"""
+        INSERT INTO words_fts (rowid, script, transliteration, meaning, language_code)
+        SELECT id, {fold_columns("")}, language_code FROM words
+    """)
+
+    insert = f"""
+            INSERT INTO words_fts (rowid, script, transliteration, meaning, language_code)
+            VALUES (NEW.id, {fold_columns("NEW.")}, NEW.language_code);
+    """
+    op.execute(f"""
+        CREATE TRIGGER trg_words_fts_insert AFTER INSERT ON words
+        BEGIN
+            {insert}
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_words_fts_delete AFTER DELETE ON words
+        BEGIN
+            DELETE FROM words_fts WHERE rowid = OLD.id;
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_words_fts_update AFTER UPDATE OF script, transliteration, meaning, language_code ON words
+        BEGIN
+            DELETE FROM words_fts WHERE rowid = OLD.id;
+            {insert}
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_words_fts_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_words_fts_delete')
+    op.execute('DROP TRIGGER IF EXISTS trg_words_fts_insert')
+    op.execute('DROP TABLE IF EXISTS words_fts')
@@ -0,0 +1,153 @@
+"""add progress buckets
+
+Revision ID: d5b1f7a3c924
+Revises: a7c3e9d2b415
+Create Date: 2026-10-18 21:47:05.901236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b1f7a3c924'
+down_revision: Union[str, None] = 'a7c3e9d2b415'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REVIEW_LANGUAGE_SQL = """(
+            SELECT groups.language_code FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+            WHERE study_sessions.id = {row}.study_session_id
+        )"""
+SESSION_LANGUAGE_SQL = "(SELECT language_code FROM groups WHERE id = {row}.group_id)"
+
+STUDIED_WORD_ADD = f"""
+        INSERT INTO daily_studied_words (language_code, date, word_id, reviews)
+        SELECT groups.language_code, date(NEW.created_at), NEW.word_id, 1
+        FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+        WHERE study_sessions.id = NEW.study_session_id AND NEW.created_at IS NOT NULL
+        ON CONFLICT (language_code, date, word_id) DO UPDATE SET reviews = reviews + 1;
+        DELETE FROM daily_studied_words
+        WHERE language_code = {REVIEW_LANGUAGE_SQL.format(row="NEW")}
+          AND date < date(NEW.created_at, '-30 days');
+"""
+
+STUDIED_WORD_REMOVE = f"""
+        UPDATE daily_studied_words SET reviews = reviews - 1
+        WHERE language_code = {REVIEW_LANGUAGE_SQL.format(row="OLD")}
+          AND date = date(OLD.created_at) AND word_id = OLD.word_id;
+        DELETE FROM daily_studied_words
+        WHERE language_code = {REVIEW_LANGUAGE_SQL.format(row="OLD")}
+          AND date = date(OLD.created_at) AND word_id = OLD.word_id AND reviews <= 0;
+"""
+
+ACTIVE_GROUP_ADD = f"""
+        INSERT INTO daily_active_groups (language_code, date, group_id, sessions)
+        SELECT language_code, date(NEW.created_at), NEW.group_id, 1
+        FROM groups WHERE id = NEW.group_id AND NEW.created_at IS NOT NULL
+        ON CONFLICT (language_code, date, group_id) DO UPDATE SET sessions = sessions + 1;
+        DELETE FROM daily_active_groups
+        WHERE language_code = {SESSION_LANGUAGE_SQL.format(row="NEW")}
+          AND date < date(NEW.created_at, '-30 days');
+"""
+
+ACTIVE_GROUP_REMOVE = f"""
+        UPDATE daily_active_groups SET sessions = sessions - 1
+        WHERE language_code = {SESSION_LANGUAGE_SQL.format(row="OLD")}
+          AND date = date(OLD.created_at) AND group_id = OLD.group_id;
+        DELETE FROM daily_active_groups
+        WHERE language_code = {SESSION_LANGUAGE_SQL.format(row="OLD")}
+          AND date = date(OLD.created_at) AND group_id = OLD.group_id AND sessions <= 0;
+"""
+
+
+def upgrade() -> None:
+    op.create_table('daily_studied_words',
+    sa.Column('language_code', sa.String(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('word_id', sa.Integer(), nullable=False),
+    sa.Column('reviews', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['language_code'], ['languages.code'], ),
+    sa.PrimaryKeyConstraint('language_code', 'date', 'word_id')
+    )
+    op.create_table('daily_active_groups',
+    sa.Column('language_code', sa.String(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('sessions', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['language_code'], ['languages.code'], ),
+    sa.PrimaryKeyConstraint('language_code', 'date', 'group_id')
+    )
+
+    # Backfill the window's buckets (today and the 30 days before) from the existing rows
+    op.execute("""
+        INSERT INTO daily_studied_words (language_code, date, word_id, reviews)
+        SELECT groups.language_code, date(word_review_items.created_at), word_review_items.word_id, count(*)
+        FROM word_review_items
+        JOIN study_sessions ON study_sessions.id = word_review_items.study_session_id
+        JOIN groups ON groups.id = study_sessions.group_id
+        WHERE date(word_review_items.created_at) >= date('now', '-30 days')
+        GROUP BY groups.language_code, date(word_review_items.created_at), word_review_items.word_id
+    """)
+    op.execute("""
+        INSERT INTO daily_active_groups (language_code, date, group_id, sessions)
+        SELECT groups.language_code, date(study_sessions.created_at), study_sessions.group_id, count(*)
+        FROM study_sessions
+        JOIN groups ON groups.id = study_sessions.group_id
+        WHERE date(study_sessions.created_at) >= date('now', '-30 days')
+        GROUP BY groups.language_code, date(study_sessions.created_at), study_sessions.group_id
+    """)
+
+    op.execute(f"""
+        CREATE TRIGGER trg_word_review_items_progress_insert AFTER INSERT ON word_review_items
+        BEGIN
+            {STUDIED_WORD_ADD}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_word_review_items_progress_delete AFTER DELETE ON word_review_items
+        BEGIN
+            {STUDIED_WORD_REMOVE}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_word_review_items_progress_update
+        AFTER UPDATE OF word_id, study_session_id, created_at ON word_review_items
+        BEGIN
+            {STUDIED_WORD_REMOVE}
+            {STUDIED_WORD_ADD}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_study_sessions_progress_insert AFTER INSERT ON study_sessions
+        BEGIN
+            {ACTIVE_GROUP_ADD}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_study_sessions_progress_delete AFTER DELETE ON study_sessions
+        BEGIN
+            {ACTIVE_GROUP_REMOVE}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_study_sessions_progress_update AFTER UPDATE OF group_id, created_at ON study_sessions
+        BEGIN
+            {ACTIVE_GROUP_REMOVE}
+            {ACTIVE_GROUP_ADD}
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_study_sessions_progress_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_study_sessions_progress_delete')
+    op.execute('DROP TRIGGER IF EXISTS trg_study_sessions_progress_insert')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_progress_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_progress_delete')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_review_items_progress_insert')
+    op.drop_table('daily_active_groups')
+    op.drop_table('daily_studied_words')
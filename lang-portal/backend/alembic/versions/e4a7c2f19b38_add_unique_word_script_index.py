@@ -0,0 +1,49 @@
+"""add unique word script index
+
+Revision ID: e4a7c2f19b38
+Revises: 5b9e2d7f3a61
+Create Date: 2026-10-18 16:08:51.347290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2f19b38'
+down_revision: Union[str, None] = '5b9e2d7f3a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Maps every duplicate word (same language and script) to the oldest word it is merged into
+DUPLICATES = """
+    SELECT words.id AS duplicate_id, keep.id AS keep_id
+    FROM words
+    JOIN (SELECT language_code, script, min(id) AS id FROM words GROUP BY language_code, script) AS keep
+      ON keep.language_code = words.language_code AND keep.script = words.script
+    WHERE words.id <> keep.id
+"""
+
+
+def upgrade() -> None:
+    # Merge duplicates into the oldest word; the review triggers move their counters along
+    op.execute(f"""
+        UPDATE word_review_items
+        SET word_id = (SELECT keep_id FROM ({DUPLICATES}) WHERE duplicate_id = word_review_items.word_id)
+        WHERE word_id IN (SELECT duplicate_id FROM ({DUPLICATES}))
+    """)
+    op.execute(f"""
+        INSERT OR IGNORE INTO word_groups (word_id, group_id)
+        SELECT duplicates.keep_id, word_groups.group_id
+        FROM word_groups JOIN ({DUPLICATES}) AS duplicates ON duplicates.duplicate_id = word_groups.word_id
+    """)
+    op.execute(f"DELETE FROM word_groups WHERE word_id IN (SELECT duplicate_id FROM ({DUPLICATES}))")
+    op.execute(f"DELETE FROM words WHERE id IN (SELECT duplicate_id FROM ({DUPLICATES}))")
+
+    op.create_index('ix_words_language_code_script', 'words', ['language_code', 'script'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_words_language_code_script', table_name='words')
@@ -0,0 +1,64 @@
+"""add review schedules
+
+Revision ID: f2d84b1c9e56
+Revises: c6a9e3f5d217
+Create Date: 2026-10-18 20:03:14.638190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d84b1c9e56'
+down_revision: Union[str, None] = 'c6a9e3f5d217'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('review_schedules',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('word_id', sa.Integer(), nullable=False),
+    sa.Column('due_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('interval_days', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('ease', sa.Float(), server_default='2.5', nullable=False),
+    sa.Column('repetitions', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['word_id'], ['words.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id', 'word_id')
+    )
+    op.create_index('ix_review_schedules_group_id_due_at_word_id', 'review_schedules', ['group_id', 'due_at', 'word_id'], unique=False)
+
+    # Every existing link starts out due; POST /admin/rebuild-review-schedules replays past reviews
+    op.execute("INSERT INTO review_schedules (group_id, word_id) SELECT group_id, word_id FROM word_groups")
+
+    op.execute("""
+        CREATE TRIGGER trg_word_groups_review_schedules_insert AFTER INSERT ON word_groups
+        BEGIN
+            INSERT OR IGNORE INTO review_schedules (group_id, word_id) VALUES (NEW.group_id, NEW.word_id);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_groups_review_schedules_delete AFTER DELETE ON word_groups
+        BEGIN
+            DELETE FROM review_schedules WHERE group_id = OLD.group_id AND word_id = OLD.word_id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_word_groups_review_schedules_update AFTER UPDATE OF word_id, group_id ON word_groups
+        BEGIN
+            DELETE FROM review_schedules WHERE group_id = OLD.group_id AND word_id = OLD.word_id;
+            INSERT OR IGNORE INTO review_schedules (group_id, word_id) VALUES (NEW.group_id, NEW.word_id);
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_word_groups_review_schedules_update')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_groups_review_schedules_delete')
+    op.execute('DROP TRIGGER IF EXISTS trg_word_groups_review_schedules_insert')
+    op.drop_index('ix_review_schedules_group_id_due_at_word_id', table_name='review_schedules')
+    op.drop_table('review_schedules')
@@ -0,0 +1,221 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from app.core.config import settings
+
+class MemoryBackend:
+    """In-process LRU cache with a TTL per entry."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self.counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        return [self.counters.get(key, 0) for key in keys]
+
+    async def incr(self, key: str):
+        self.counters[key] = self.counters.get(key, 0) + 1
+
+    async def clear(self):
+        self.entries.clear()
+        self.counters.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self.entries)
+
+class RedisBackend:
+    """Cache shared by every worker process, stored in Redis (requires the redis package)."""
+
+    name = "redis"
+    prefix = "lang-portal:cache:"
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the redis package (pip install redis)")
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        await self.client.set(self.prefix + key, value, ex=ttl)
+
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        values = await self.client.mget([self.prefix + key for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def incr(self, key: str):
+        await self.client.incr(self.prefix + key)
+
+    async def clear(self):
+        async for key in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+class ResponseCache:
+    """Caches serialized GET responses of routes marked with @cached.
+
+    Every entry's key embeds a version counter for each table its route reads.
+    Writers call invalidate() with the tables they changed, which bumps those
+    counters so affected entries are never looked up again and age out through
+    TTL/LRU, while entries of routes reading other tables stay valid. Because
+    the versions live in the backend, invalidation reaches every worker when a
+    shared backend is used.
+    """
+
+    # Version counter bumped by invalidate() without tables, shared by every entry
+    ALL = "*"
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0}
+
+    async def key_for(self, request: Request, tables: Iterable[str]) -> str:
+        tables = sorted(tables)
+        versions = await self.backend.get_counters([f"table:{self.ALL}"] + [f"table:{t}" for t in tables])
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        tags = ",".join(f"{t}@{v}" for t, v in zip([self.ALL] + tables, versions))
+        return f"response:{request.url.path}?{query}#{tags}"
+
+    async def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        etag, body = value.split(b"\n", 1)
+        return etag.decode(), body
+
+    async def set(self, key: str, etag: str, body: bytes):
+        await self.backend.set(key, etag.encode() + b"\n" + body, self.ttl)
+
+    async def get_value(self, name: str) -> Optional[bytes]:
+        """A value stored with set_value(); like every response, it is dropped by invalidate() without tables."""
+        return await self.backend.get(await self._value_key(name))
+
+    async def set_value(self, name: str, value: bytes, ttl: int):
+        await self.backend.set(await self._value_key(name), value, ttl)
+
+    async def _value_key(self, name: str) -> str:
+        [version] = await self.backend.get_counters([f"table:{self.ALL}"])
+        return f"value:{name}#{self.ALL}@{version}"
+
+    async def invalidate(self, *tables: str):
+        """Drop the cached responses of every route reading any of tables (all routes if none given)."""
+        self.stats["invalidations"] += 1
+        for table in tables or (self.ALL,):
+            await self.backend.incr(f"table:{table}")
+
+    async def clear(self):
+        await self.backend.clear()
+        for name in self.stats:
+            self.stats[name] = 0
+
+    def get_stats(self) -> Dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "backend": self.backend.name,
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": self.backend.size(),
+        }
+
+def create_response_cache() -> Optional[ResponseCache]:
+    if settings.RESPONSE_CACHE_BACKEND == "off":
+        return None
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        backend = RedisBackend(settings.RESPONSE_CACHE_REDIS_URL)
+    else:
+        backend = MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    return ResponseCache(backend, settings.RESPONSE_CACHE_TTL)
+
+response_cache = create_response_cache()
+
+async def invalidate(*tables: str):
+    """Invalidate cached responses after a write to tables (every response if none given)."""
+    if response_cache is not None:
+        await response_cache.invalidate(*tables)
+
+def cached(*tables: str):
+    """Mark a GET endpoint as cacheable; tables are the tables its response is built from.
+
+    Takes effect on routers created with route_class=CachedRoute.
+    """
+    def decorator(endpoint):
+        endpoint.cache_tables = tables
+        return endpoint
+    return decorator
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+class CachedRoute(APIRoute):
+    """Route class serving @cached endpoints from the response cache, with ETag revalidation."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        tables = getattr(self.endpoint, "cache_tables", None)
+        if tables is None or "GET" not in self.methods:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            if response_cache is None:
+                return await handler(request)
+
+            key = await response_cache.key_for(request, tables)
+            entry = await response_cache.get(key)
+            if entry is not None:
+                etag, body = entry
+                status = "HIT"
+            else:
+                response = await handler(request)
+                if response.status_code != 200:
+                    return response
+                body = response.body
+                etag = make_etag(body)
+                await response_cache.set(key, etag, body)
+                status = "MISS"
+
+            # Clients revalidate every time and get a 304 while the data is unchanged
+            headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Cache": status}
+            if etag_matches(request, etag):
+                response_cache.stats["not_modified"] += 1
+                return Response(status_code=304, headers=headers)
+            return Response(body, media_type="application/json", headers=headers)
+
+        return cached_handler
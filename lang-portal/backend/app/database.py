@@ -1,7 +1,21 @@
+import asyncio
 import os
+import re
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import AsyncIterator, Callable, Mapping, Optional, Sequence, Set, TypeVar, Union
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, Row, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.sql import Select
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, only single-process deployments are supported
+    fcntl = None
 
 # Get the absolute path to the backend directory
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -9,25 +23,264 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 Base = declarative_base()
 
 # Production database
-def get_db_url():
+def get_db_url(db_url: Optional[str] = None):
     # Special case for running tests on dev
     if os.getenv("RUNNING_TEST_ON_DEV") == "true":
         return "sqlite:///:memory:"
+    # settings.DATABASE_URL, or the environment for the command line tools,
+    # e.g. a PostgreSQL server or a synthetic database file for benchmarks
+    db_url = db_url or os.getenv("DATABASE_URL")
+    if db_url:
+        return db_url
     # Normal case
     db_path = BASE_DIR / "app" / "app.db"
     return f"sqlite:///{db_path}"
 
 def get_test_db_url():
-    return "sqlite:///:memory:"
+    # e.g. TEST_DATABASE_URL=postgresql://postgres@localhost/lang_portal_test to run the suite on PostgreSQL
+    return os.getenv("TEST_DATABASE_URL", "sqlite:///:memory:")
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Mapping[str, Union[str, int]]):
+    """Run the given PRAGMAs on every new DBAPI connection of a SQLite engine."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def engine_options(db_url: str, pool_size: Optional[int], read_only: bool,
+                   options: Optional[Mapping[str, int]]) -> dict:
+    """create_engine options shared by setup_db and setup_async_db.
+
+    SQLite connections are shared between threads. Server databases get the pool,
+    recycling and statement timeout of options (see settings.db_options), and
+    read_only sessions that refuse writes.
+    """
+    url = make_url(db_url)
+    if url.get_backend_name() == "sqlite":
+        engine_kwargs = {"connect_args": {"check_same_thread": False}}
+        if pool_size is not None:
+            engine_kwargs.update(pool_size=pool_size, max_overflow=0)
+        return engine_kwargs
+
+    options = options or {}
+    engine_kwargs = {
+        "pool_size": pool_size if pool_size is not None else options.get("pool_size", 5),
+        "max_overflow": 0 if pool_size is not None else options.get("max_overflow", 10),
+        "pool_recycle": options.get("pool_recycle", -1),
+        # Server connections can be closed behind the pool's back, e.g. by a restart
+        "pool_pre_ping": True,
+    }
+    server_settings = {}
+    if options.get("statement_timeout_ms"):
+        server_settings["statement_timeout"] = str(options["statement_timeout_ms"])
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    if server_settings and url.get_backend_name() == "postgresql":
+        if url.get_driver_name() == "asyncpg":
+            engine_kwargs["connect_args"] = {"server_settings": server_settings}
+        else:
+            engine_kwargs["connect_args"] = {
+                "options": " ".join(f"-c {name}={value}" for name, value in server_settings.items())
+            }
+    return engine_kwargs
+
+def with_read_only(pragmas: Optional[Mapping[str, Union[str, int]]], read_only: bool):
+    # query_only goes last so the other PRAGMAs can still be applied
+    return {**(pragmas or {}), "query_only": 1} if read_only else pragmas
+
+def setup_db(db_url: str, pragmas: Optional[Mapping[str, Union[str, int]]] = None,
+             read_only: bool = False, pool_size: Optional[int] = None,
+             options: Optional[Mapping[str, int]] = None):
+    """Create an engine and session factory for db_url.
 
-def setup_db(db_url: str):
+    read_only connections refuse writes (PRAGMA query_only on SQLite); pool_size
+    caps the pool at that many connections, e.g. 1 for a single writer connection.
+    options configure the pool of server databases (see engine_options).
+    """
     engine = create_engine(
         db_url,
-        connect_args={"check_same_thread": False},
+        **engine_options(db_url, pool_size, read_only, options),
         # echo=True
     )
+    pragmas = with_read_only(pragmas, read_only)
+    if pragmas:
+        apply_sqlite_pragmas(engine, pragmas)
     session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return engine, session_factory
 
-# Initialize the database engine and SessionLocal for direct imports
-engine, SessionLocal = setup_db(get_db_url())
+# Async drivers of the sync URLs' databases
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+def get_async_db_url(db_url: str) -> str:
+    """Switch a sync SQLite or PostgreSQL URL to the aiosqlite or asyncpg driver."""
+    url = make_url(db_url)
+    if url.get_driver_name() not in ("aiosqlite", "asyncpg") and url.get_backend_name() in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+    return url.render_as_string(hide_password=False)
+
+def setup_async_db(db_url: str, pragmas: Optional[Mapping[str, Union[str, int]]] = None,
+                   read_only: bool = False, pool_size: Optional[int] = None,
+                   options: Optional[Mapping[str, int]] = None):
+    async_url = get_async_db_url(db_url)
+    engine = create_async_engine(
+        async_url,
+        **engine_options(async_url, pool_size, read_only, options),
+    )
+    pragmas = with_read_only(pragmas, read_only)
+    if pragmas:
+        apply_sqlite_pragmas(engine.sync_engine, pragmas)
+    session_factory = async_sessionmaker(engine, autoflush=False)
+    return engine, session_factory
+
+def is_sqlite_file(db_url: str) -> bool:
+    """Whether db_url is a SQLite database file, which separate connections can share."""
+    url = make_url(db_url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+def get_startup_lock_path(db_url: str) -> str:
+    """Lock file guarding schema creation and seeding of the database at db_url."""
+    if is_sqlite_file(db_url):
+        return make_url(db_url).database + ".startup.lock"
+    return os.path.join(tempfile.gettempdir(), "lang-portal.startup.lock")
+
+# pg_advisory_lock key of schema creation and seeding on PostgreSQL
+STARTUP_ADVISORY_LOCK = 0x6C616E67
+
+@contextmanager
+def startup_lock(engine: Engine, db_url: str):
+    """Hold the lock guarding schema creation and seeding while the block runs.
+
+    A lock file next to a SQLite database; a session-level advisory lock on a
+    server database, which workers on other hosts wait for too.
+    """
+    if engine.dialect.name != "postgresql":
+        with file_lock(get_startup_lock_path(db_url)):
+            yield
+        return
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"SELECT pg_advisory_lock({STARTUP_ADVISORY_LOCK})")
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.exec_driver_sql(f"SELECT pg_advisory_unlock({STARTUP_ADVISORY_LOCK})")
+            conn.commit()
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock on path while the block runs, waiting for other processes holding it."""
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+ALEMBIC_VERSIONS_DIR = BASE_DIR / "alembic" / "versions"
+
+# Revision headers of the migration scripts, e.g. `down_revision: Union[str, None] = 'c6a9e3f5d217'`
+REVISION_HEADER = re.compile(r"^revision(?::[^=]+)? = ['\"](\w+)['\"]", re.MULTILINE)
+DOWN_REVISION_HEADER = re.compile(r"^down_revision(?::[^=]+)? = (.+)$", re.MULTILINE)
+
+def get_alembic_heads(versions_dir: Path = ALEMBIC_VERSIONS_DIR) -> Set[str]:
+    """Head revisions of the migration scripts.
+
+    Reads the revision headers instead of loading the scripts through Alembic,
+    which costs a few milliseconds instead of a few hundred on every start.
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text()
+        revision = REVISION_HEADER.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = DOWN_REVISION_HEADER.search(source)
+        if down_revision is not None:
+            # A merge revision lists several parents
+            parents.update(re.findall(r"['\"](\w+)['\"]", down_revision.group(1)))
+    return revisions - parents
+
+def schema_is_current(engine: Engine) -> bool:
+    """Whether the database is stamped with the latest migration, so its schema needs no check."""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table("alembic_version"):
+            return False
+        current = {version for (version,) in conn.exec_driver_sql("SELECT version_num FROM alembic_version")}
+    return current == get_alembic_heads()
+
+def stamp_alembic_heads(engine: Engine):
+    """Record the latest migrations as applied, for a schema just created from the models."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS alembic_version ("
+            "version_num VARCHAR(32) NOT NULL, CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num))"
+        )
+        conn.exec_driver_sql("DELETE FROM alembic_version")
+        for head in sorted(get_alembic_heads()):
+            conn.exec_driver_sql(f"INSERT INTO alembic_version (version_num) VALUES ('{head}')")
+
+def run_sqlite_maintenance(engine: Engine):
+    """Refresh planner statistics and fold the WAL back into the main database file."""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+async def sqlite_maintenance_loop(engine: Engine, interval: int):
+    """Run run_sqlite_maintenance every interval seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(run_sqlite_maintenance, engine)
+        except Exception as e:
+            # A busy database only delays maintenance until the next run
+            print(f"SQLite maintenance failed: {e}")
+
+# Routers receive either session flavour depending on settings.DB_MODE
+DbSession = Union[Session, AsyncSession]
+T = TypeVar("T")
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a synchronous query function against the request's session.
+
+    With an AsyncSession the function runs through run_sync, so every statement
+    goes through the async driver without blocking the event loop. With a plain
+    Session it runs on the threadpool, as sync route handlers did before.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+async def stream_db(db: DbSession, statement: Select, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+    """Stream the rows of statement in batches of batch_size from a server-side cursor.
+
+    The statement runs on the session's connection as a Core select, so rows
+    are plain tuples without ORM result processing. Meant for StreamingResponse
+    bodies, which run after get_db's teardown; the session is closed here once
+    the stream ends or the client goes away.
+    """
+    statement = statement.execution_options(yield_per=batch_size)
+    try:
+        if isinstance(db, AsyncSession):
+            connection = await db.connection()
+            result = await connection.stream(statement)
+            async for partition in result.partitions():
+                yield partition
+        else:
+            def partitions():
+                yield from db.connection().execute(statement).partitions()
+
+            async for partition in iterate_in_threadpool(partitions()):
+                yield partition
+    finally:
+        if isinstance(db, AsyncSession):
+            await db.close()
+        else:
+            db.close()
@@ -1,8 +1,26 @@
-from fastapi import HTTPException, Depends
-from app.main import get_db
+from fastapi import HTTPException, Depends, Request
+
+# Requests that only read; they get a session from the read-only pool
+READ_METHODS = {"GET", "HEAD"}
+
+def get_db(request: Request):
+    """Session for the request, from the session factories lifespan stores on app.state."""
+    state = request.app.state
+    session_factory = state.ReadSessionLocal if request.method in READ_METHODS else state.SessionLocal
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db(request: Request):
+    state = request.app.state
+    session_factory = state.AsyncReadSessionLocal if request.method in READ_METHODS else state.AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
 
 def admin_only():
     """Dependency for admin-only routes"""
     # TODO: Add proper admin authentication
     # For now, allow all requests in development
-    return True 
\ No newline at end of file
+    return True 
@@ -1,66 +1,153 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
-from app.database import setup_db, Base, get_db_url
+from fastapi.responses import PlainTextResponse
+from app.database import (
+    setup_db, setup_async_db, Base, get_db_url, is_sqlite_file, run_sqlite_maintenance, schema_is_current,
+    sqlite_maintenance_loop, stamp_alembic_heads, startup_lock
+)
+from app.dependencies import get_async_db, get_db
 from app.models import Language
 from app.seed import seed_all
+from app.utils.difficulty import word_difficulty_refresh_loop
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 import os
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.metrics import MetricsMiddleware, instrument_engine, metrics
+# Routers get their dependencies from app.dependencies, not from this module
+from app.routers import admin, groups, languages, words, activities, sessions, dashboard, export, analytics
 
 # Load environment variables from .env file
 load_dotenv()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Import routers here to avoid circular imports
-    from app.routers import admin, groups, languages, words, activities, sessions, dashboard
-    app.include_router(admin.router)
-    app.include_router(groups.router)
-    app.include_router(languages.router)
-    app.include_router(words.router)
-    app.include_router(activities.router)
-    app.include_router(sessions.router)
-    app.include_router(dashboard.router)
-
     if os.getenv("TESTING") == "true":
         yield  # Skip lifespan for tests
         return
     
-    engine, SessionLocal = setup_db(get_db_url())
+    db_url = get_db_url(settings.DATABASE_URL)
+    sqlite = db_url.startswith("sqlite")
+    # A file database can be opened by several connections: reads get their own read-only
+    # pool and writes a single connection, so each worker has at most one writer
+    split = settings.DB_READ_WRITE_SPLIT and is_sqlite_file(db_url)
+    engine, SessionLocal = setup_db(
+        db_url, pragmas=settings.sqlite_pragmas, pool_size=1 if split else None, options=settings.db_options
+    )
     # print("Using DB URL:", engine.url)
 
+    # Workers start concurrently; the first one to get the lock creates and seeds the
+    # database, the others find it ready
+    with startup_lock(engine, db_url):
+        prepare_database(engine)
+
+    read_engine, ReadSessionLocal = engine, SessionLocal
+    if split:
+        read_engine, ReadSessionLocal = setup_db(
+            db_url, pragmas=settings.sqlite_pragmas, read_only=True, options=settings.db_options
+        )
+    engines = [engine, read_engine] if split else [engine]
+
     app.state.engine = engine
     app.state.SessionLocal = SessionLocal
-    Base.metadata.create_all(bind=engine)
+    app.state.ReadSessionLocal = ReadSessionLocal
 
+    async_engines = []
+    if settings.DB_MODE == "async":
+        async_engine, AsyncSessionLocal = setup_async_db(
+            db_url, pragmas=settings.sqlite_pragmas, pool_size=1 if split else None, options=settings.db_options
+        )
+        async_read_engine, AsyncReadSessionLocal = async_engine, AsyncSessionLocal
+        if split:
+            async_read_engine, AsyncReadSessionLocal = setup_async_db(
+                db_url, pragmas=settings.sqlite_pragmas, read_only=True, options=settings.db_options
+            )
+        async_engines = [async_engine, async_read_engine] if split else [async_engine]
+        app.state.async_engine = async_engine
+        app.state.AsyncSessionLocal = AsyncSessionLocal
+        app.state.AsyncReadSessionLocal = AsyncReadSessionLocal
+        # Routers depend on get_db; in async mode it resolves to an AsyncSession instead
+        app.dependency_overrides.setdefault(get_db, get_async_db)
+
+    if settings.METRICS_ENABLED:
+        for instrumented in engines + [async_engine.sync_engine for async_engine in async_engines]:
+            instrument_engine(instrumented)
+
+    maintenance_task = None
+    if sqlite and settings.SQLITE_MAINTENANCE_INTERVAL > 0:
+        maintenance_task = asyncio.create_task(
+            sqlite_maintenance_loop(engine, settings.SQLITE_MAINTENANCE_INTERVAL)
+        )
+    difficulty_task = None
+    if settings.WORD_DIFFICULTY_REFRESH_INTERVAL > 0:
+        difficulty_task = asyncio.create_task(
+            word_difficulty_refresh_loop(SessionLocal, settings.WORD_DIFFICULTY_REFRESH_INTERVAL, ReadSessionLocal)
+        )
+    yield
+    for task in (maintenance_task, difficulty_task):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    # SQLite recommends PRAGMA optimize before closing long-lived connections
+    if sqlite:
+        run_sqlite_maintenance(engine)
+    for async_engine in async_engines:
+        await async_engine.dispose()
+    for sync_engine in engines:
+        sync_engine.dispose()
+
+def prepare_database(engine):
+    """Create missing tables and, in development, seed an empty database."""
+    # A database migrated to the latest revision already has every table
+    if not schema_is_current(engine):
+        fresh = not inspect(engine).get_table_names()
+        Base.metadata.create_all(bind=engine)
+        # The migrations are SQLite scripts: a new database, e.g. on PostgreSQL, is
+        # created from the models instead and recorded as up to date
+        if fresh:
+            stamp_alembic_heads(engine)
     if settings.ENVIRONMENT == "development":
+        # The check's session is closed first: seed_all resets the schema through the
+        # engine, whose pool may hold a single connection
         with Session(engine) as db:
-            if not db.query(Language).first():
-                print("No data found. Seeding database with test data...")
+            empty = db.query(Language).first() is None
+        if empty:
+            print("No data found. Seeding database with test data...")
+            with Session(engine) as db:
                 seed_all(db, include_test_data=True)
-                print("Database seeding completed!")
-    yield
-    engine.dispose()
-
-def get_db():
-    session_factory = app.state.SessionLocal
-    db = session_factory()
-    try:
-        yield db
-    finally:
-        db.close()
+            print("Database seeding completed!")
 
 app = FastAPI(
     title="Language Learning Portal",
     lifespan=lifespan
 )
 
+app.include_router(admin.router)
+app.include_router(groups.router)
+app.include_router(languages.router)
+app.include_router(words.router)
+app.include_router(activities.router)
+app.include_router(sessions.router)
+app.include_router(dashboard.router)
+app.include_router(export.router)
+app.include_router(analytics.router)
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Request and SQL metrics of this process in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[settings.FRONTEND_URL],
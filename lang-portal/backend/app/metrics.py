@@ -0,0 +1,224 @@
+"""Request latency and SQL metrics, served in the Prometheus text format on /metrics.
+
+MetricsMiddleware times every request and labels it with its route template
+(e.g. /groups/{group_id}), so paths with ids do not multiply the series.
+instrument_engine() hooks the engine's cursor events: statements and their
+time are added to the request running them, found through a context variable
+that follows the request into run_db's threadpool or run_sync greenlet.
+Statements slower than settings.SLOW_QUERY_MS are logged with their plan.
+
+Metrics live in the process; with several workers each one reports its own.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Label of requests that matched no route, so unknown paths share one series
+UNMATCHED_ROUTE = "unmatched"
+
+class Histogram:
+    """Cumulative Prometheus histogram of observed values."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+class RequestStats:
+    """SQL statements run on behalf of one request."""
+
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+class Metrics:
+    """Counters and histograms of this process, keyed by (method, route)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.statements: Dict[Tuple[str, str], Histogram] = {}
+        self.db_time: Dict[Tuple[str, str], Histogram] = {}
+        self.slow_queries = 0
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        with self.lock:
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.statements.setdefault(key, Histogram(STATEMENT_BUCKETS)).observe(stats.statements)
+            self.db_time.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(stats.db_seconds)
+
+    def observe_slow_query(self):
+        with self.lock:
+            self.slow_queries += 1
+
+    def clear(self):
+        with self.lock:
+            self.requests.clear()
+            self.latency.clear()
+            self.statements.clear()
+            self.db_time.clear()
+            self.slow_queries = 0
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self.lock:
+            lines = [
+                "# HELP http_requests_total Requests handled, by route template and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{labels(method=method, route=route, status=status)} {count}")
+            for name, help_text, histograms in (
+                ("http_request_duration_seconds", "Time from request to the end of the response body.", self.latency),
+                ("http_request_db_statements", "SQL statements run per request.", self.statements),
+                ("http_request_db_duration_seconds", "Time spent executing SQL per request.", self.db_time),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(histograms.items()):
+                    lines += render_histogram(name, histogram, method=method, route=route)
+            lines += [
+                f"# HELP db_slow_queries_total SQL statements slower than {settings.SLOW_QUERY_MS} ms.",
+                "# TYPE db_slow_queries_total counter",
+                f"db_slow_queries_total {self.slow_queries}",
+            ]
+        return "\n".join(lines) + "\n"
+
+def labels(**values) -> str:
+    escaped = (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        for value in values.values()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(values, escaped)) + "}"
+
+def render_histogram(name: str, histogram: Histogram, **label_values):
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        yield f"{name}_bucket{labels(**label_values, le=float(bound))} {count}"
+    yield f"{name}_bucket{labels(**label_values, le='+Inf')} {histogram.count}"
+    yield f"{name}_sum{labels(**label_values)} {histogram.sum}"
+    yield f"{name}_count{labels(**label_values)} {histogram.count}"
+
+metrics = Metrics()
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL statistics of every HTTP request.
+
+    Timing ends with the last body chunk, so streamed responses count in full.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - start
+            current_request.reset(token)
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            metrics.observe_request(scope["method"], route_path, status, seconds, stats)
+
+# Statements worth explaining; PRAGMAs, DDL and transaction control are not
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+def explain(conn, statement: str, parameters) -> str:
+    """The query plan of statement, run on the raw DBAPI connection so it is not instrumented itself.
+
+    On PostgreSQL a failed statement aborts the whole transaction, so EXPLAIN runs
+    in a savepoint that is rolled back if it fails and the request's transaction
+    carries on.
+    """
+    sqlite = conn.dialect.name == "sqlite"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if sqlite:
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            rows = cursor.fetchall()
+        else:
+            cursor.execute("SAVEPOINT explain_slow_query")
+            try:
+                cursor.execute("EXPLAIN " + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+                raise
+            finally:
+                cursor.execute("RELEASE SAVEPOINT explain_slow_query")
+    finally:
+        cursor.close()
+    if sqlite:
+        # (id, parent, notused, detail)
+        return "\n".join(row[3] for row in rows)
+    return "\n".join(str(row[0]) for row in rows)
+
+def log_slow_query(conn, statement: str, parameters, seconds: float, executemany: bool):
+    metrics.observe_slow_query()
+    plan = None
+    if not executemany and statement.lstrip().upper().startswith(EXPLAINABLE):
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as e:
+            plan = f"(EXPLAIN failed: {e})"
+    logger.warning(
+        "Slow query (%.1f ms): %s\nParameters: %r\nPlan:\n%s",
+        seconds * 1000, statement, parameters, plan or "(not explained)"
+    )
+
+def instrument_engine(engine: Engine):
+    """Record the statements run on engine in the current request's stats and log slow ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += seconds
+        if settings.SLOW_QUERY_MS > 0 and seconds * 1000 >= settings.SLOW_QUERY_MS:
+            log_slow_query(conn, statement, parameters, seconds, executemany)
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, and_, UniqueConstraint, ForeignKeyConstraint, CheckConstraint, event
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, Boolean, Date, DateTime, and_, UniqueConstraint, ForeignKeyConstraint, CheckConstraint, Index, DDL, event
 from sqlalchemy.orm import relationship, validates
-from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.db_utils import utcnow
+from app.utils.search import fold_diacritics_sql, fold_sql
 
 class Language(Base):
     __tablename__ = "languages"
@@ -24,28 +26,54 @@ class Word(Base):
     transliteration = Column(String)
     meaning = Column(String, nullable=False)
     language_code = Column(String, ForeignKey("languages.code"), nullable=False)
+    # Denormalized review counters, kept current by triggers on word_review_items
+    correct_count = Column(Integer, nullable=False, default=0, server_default="0")
+    wrong_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     language = relationship("Language", back_populates="words")
     groups = relationship("Group", secondary="word_groups", back_populates="words")
     review_items = relationship("WordReviewItem", back_populates="word")
 
+    __table_args__ = (
+        # /words and the dashboard filter words by language
+        Index("ix_words_language_code", "language_code"),
+        # Sorting a language's words by their review counters
+        Index("ix_words_language_code_correct_count", "language_code", "correct_count"),
+        Index("ix_words_language_code_wrong_count", "language_code", "wrong_count"),
+        # A word is identified by its script within a language; vocab imports upsert on it
+        Index("ix_words_language_code_script", "language_code", "script", unique=True),
+    )
+
 class Group(Base):
     __tablename__ = "groups"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     language_code = Column(String, ForeignKey("languages.code"), nullable=False)
+    # Denormalized count of the group's words in its language, kept current by triggers on word_groups
+    words_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     language = relationship("Language", back_populates="groups")
     words = relationship("Word", secondary="word_groups", back_populates="groups")
     sessions = relationship("StudySession", back_populates="group")
 
+    __table_args__ = (
+        Index("ix_groups_language_code", "language_code"),
+        # Sorting a language's groups by size
+        Index("ix_groups_language_code_words_count", "language_code", "words_count"),
+    )
+
 class WordGroup(Base):
     __tablename__ = "word_groups"
     word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"), primary_key=True)
     group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
 
+    __table_args__ = (
+        # The primary key leads with word_id; group pages look words up by group
+        Index("ix_word_groups_group_id_word_id", "group_id", "word_id"),
+    )
+
 class StudyActivity(Base):
     __tablename__ = "study_activities"
     id = Column(Integer, primary_key=True, index=True)
@@ -69,20 +97,398 @@ class StudySession(Base):
     id = Column(Integer, primary_key=True, index=True)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
     study_activity_id = Column(Integer, ForeignKey("study_activities.id"), nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    # Written from Python so that every row has the microsecond text format of SQLite
+    # DateTime binds, which cursor bounds (see app.utils.pagination) compare against
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
 
     # Relationships
     activity = relationship("StudyActivity", back_populates="sessions")
     group = relationship("Group", back_populates="sessions")
     review_items = relationship("WordReviewItem", back_populates="session")
 
+    __table_args__ = (
+        # Session listings and dashboard stats are filtered by group/activity and sorted by date
+        Index("ix_study_sessions_group_id_created_at", "group_id", "created_at"),
+        Index("ix_study_sessions_study_activity_id_created_at", "study_activity_id", "created_at"),
+        Index("ix_study_sessions_created_at", "created_at"),
+    )
+
 class WordReviewItem(Base):
     __tablename__ = "word_review_items"
     id = Column(Integer, primary_key=True, index=True)
     word_id = Column(Integer, ForeignKey("words.id"), nullable=False)
     study_session_id = Column(Integer, ForeignKey("study_sessions.id"), nullable=False)
     correct = Column(Boolean, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     word = relationship("Word", back_populates="review_items")
-    session = relationship("StudySession", back_populates="review_items") 
\ No newline at end of file
+    session = relationship("StudySession", back_populates="review_items")
+
+    __table_args__ = (
+        # Covering indexes for the per-word and per-session review aggregations, the latter
+        # also read per session over a created_at range by app.utils.review_analytics
+        Index("ix_word_review_items_word_id_correct", "word_id", "correct"),
+        Index(
+            "ix_word_review_items_session_id_created_at_correct_word_id",
+            "study_session_id", "created_at", "correct", "word_id"
+        ),
+        # Covering index for the recent-reviews slice ranked by app.utils.difficulty
+        Index("ix_word_review_items_created_at_word_id_correct", "created_at", "word_id", "correct"),
+    )
+
+class ReviewSchedule(Base):
+    """Spaced-repetition (SM-2) state of a word in a group, one row per word_groups link.
+
+    Rows are created and removed with the links by triggers; reviews update them
+    through app.utils.scheduler. A new word is due from the moment it is linked.
+    """
+    __tablename__ = "review_schedules"
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"), primary_key=True)
+    due_at = Column(DateTime, nullable=False, server_default=utcnow())
+    interval_days = Column(Integer, nullable=False, default=0, server_default="0")
+    ease = Column(Float, nullable=False, default=2.5, server_default="2.5")
+    repetitions = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # /study-sessions/{id}/next reads a group's due words in due order
+        Index("ix_review_schedules_group_id_due_at_word_id", "group_id", "due_at", "word_id"),
+    )
+
+class DailyActivity(Base):
+    """Per-language, per-day study totals, kept current by triggers on study_sessions and word_review_items."""
+    __tablename__ = "daily_activity"
+    language_code = Column(String, ForeignKey("languages.code"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    sessions = Column(Integer, nullable=False, default=0, server_default="0")
+    reviews = Column(Integer, nullable=False, default=0, server_default="0")
+    correct = Column(Integer, nullable=False, default=0, server_default="0")
+
+class DailyStudiedWord(Base):
+    """A word reviewed in a language on a UTC day, kept by triggers for the recent days only.
+
+    With DailyActiveGroup, the per-day sets that /dashboard/progress unions over its window.
+    reviews counts the day's reviews of the word, so a row goes when the last one is deleted.
+    """
+    __tablename__ = "daily_studied_words"
+    language_code = Column(String, ForeignKey("languages.code"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    word_id = Column(Integer, primary_key=True)
+    reviews = Column(Integer, nullable=False, default=0, server_default="0")
+
+class DailyActiveGroup(Base):
+    """A group studied in a language on a UTC day, kept by triggers for the recent days only."""
+    __tablename__ = "daily_active_groups"
+    language_code = Column(String, ForeignKey("languages.code"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    group_id = Column(Integer, primary_key=True)
+    sessions = Column(Integer, nullable=False, default=0, server_default="0")
+
+class WordDifficulty(Base):
+    """The hardest words of each language over each review window, ranked from 1.
+
+    A materialized ranking rebuilt periodically by app.utils.difficulty, so
+    /words/hardest reads a few rows by primary key instead of ranking reviews.
+    """
+    __tablename__ = "word_difficulty"
+    language_code = Column(String, ForeignKey("languages.code"), primary_key=True)
+    window_days = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"), nullable=False)
+    error_rate = Column(Float, nullable=False)
+    reviews = Column(Integer, nullable=False)
+    wrong = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime, nullable=False)
+
+def add_triggers(table, triggers):
+    """Create row triggers with table, on SQLite and on PostgreSQL.
+
+    triggers are (name, timing, body): timing is e.g. "AFTER UPDATE OF word_id, correct"
+    and body the statements run for each row, reading NEW and OLD. A body may also be
+    a function of the dialect name, for SQL that differs between the two. On PostgreSQL
+    the body becomes a plpgsql trigger function of the same name; a BEFORE trigger's
+    function returns the row unchanged, so the operation still goes ahead.
+    """
+    for name, timing, body in triggers:
+        sqlite_body = body("sqlite") if callable(body) else body
+        postgresql_body = body("postgresql") if callable(body) else body
+        returned = "NULL"
+        if timing.startswith("BEFORE"):
+            returned = "OLD" if "DELETE" in timing else "NEW"
+        event.listen(table, "after_create", DDL(
+            f"CREATE TRIGGER {name} {timing} ON {table.name} BEGIN {sqlite_body} END"
+        ).execute_if(dialect="sqlite"))
+        event.listen(table, "after_create", DDL(
+            f"CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$ "
+            f"BEGIN {postgresql_body} RETURN {returned}; END $$"
+        ).execute_if(dialect="postgresql"))
+        event.listen(table, "after_create", DDL(
+            f"CREATE TRIGGER {name} {timing} ON {table.name} FOR EACH ROW EXECUTE FUNCTION {name}()"
+        ).execute_if(dialect="postgresql"))
+
+# Word.correct_count/wrong_count follow every insert, update and delete on word_review_items,
+# inside the same transaction as the review itself
+WORD_REVIEW_STATS_TRIGGERS = [
+    ("trg_word_review_items_stats_insert", "AFTER INSERT", """
+        UPDATE words
+        SET correct_count = correct_count + (CASE WHEN NEW.correct THEN 1 ELSE 0 END),
+            wrong_count = wrong_count + (CASE WHEN NEW.correct THEN 0 ELSE 1 END)
+        WHERE id = NEW.word_id;
+    """),
+    ("trg_word_review_items_stats_delete", "AFTER DELETE", """
+        UPDATE words
+        SET correct_count = correct_count - (CASE WHEN OLD.correct THEN 1 ELSE 0 END),
+            wrong_count = wrong_count - (CASE WHEN OLD.correct THEN 0 ELSE 1 END)
+        WHERE id = OLD.word_id;
+    """),
+    ("trg_word_review_items_stats_update", "AFTER UPDATE OF word_id, correct", """
+        UPDATE words
+        SET correct_count = correct_count - (CASE WHEN OLD.correct THEN 1 ELSE 0 END),
+            wrong_count = wrong_count - (CASE WHEN OLD.correct THEN 0 ELSE 1 END)
+        WHERE id = OLD.word_id;
+        UPDATE words
+        SET correct_count = correct_count + (CASE WHEN NEW.correct THEN 1 ELSE 0 END),
+            wrong_count = wrong_count + (CASE WHEN NEW.correct THEN 0 ELSE 1 END)
+        WHERE id = NEW.word_id;
+    """),
+]
+
+add_triggers(WordReviewItem.__table__, WORD_REVIEW_STATS_TRIGGERS)
+
+# daily_activity follows every session and review, attributed to the language of the session's
+# group and the UTC day of the row's created_at; a day's row is created on first use.
+# Upserts name the updated table's columns, which PostgreSQL would find ambiguous with excluded's.
+SESSION_ACTIVITY_ADD = """
+        INSERT INTO daily_activity (language_code, date, sessions, reviews, correct)
+        SELECT language_code, date(NEW.created_at), 1, 0, 0
+        FROM groups WHERE id = NEW.group_id AND NEW.created_at IS NOT NULL
+        ON CONFLICT (language_code, date) DO UPDATE SET sessions = daily_activity.sessions + 1;
+"""
+
+SESSION_ACTIVITY_REMOVE = """
+        UPDATE daily_activity SET sessions = sessions - 1
+        WHERE language_code = (SELECT language_code FROM groups WHERE id = OLD.group_id)
+          AND date = date(OLD.created_at);
+"""
+
+REVIEW_ACTIVITY_ADD = """
+        INSERT INTO daily_activity (language_code, date, sessions, reviews, correct)
+        SELECT groups.language_code, date(NEW.created_at), 0, 1, (CASE WHEN NEW.correct THEN 1 ELSE 0 END)
+        FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+        WHERE study_sessions.id = NEW.study_session_id AND NEW.created_at IS NOT NULL
+        ON CONFLICT (language_code, date) DO UPDATE
+        SET reviews = daily_activity.reviews + 1, correct = daily_activity.correct + excluded.correct;
+"""
+
+REVIEW_ACTIVITY_REMOVE = """
+        UPDATE daily_activity
+        SET reviews = reviews - 1, correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+        WHERE language_code = (
+            SELECT groups.language_code FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+            WHERE study_sessions.id = OLD.study_session_id
+        ) AND date = date(OLD.created_at);
+"""
+
+STUDY_SESSION_ACTIVITY_TRIGGERS = [
+    ("trg_study_sessions_activity_insert", "AFTER INSERT", SESSION_ACTIVITY_ADD),
+    ("trg_study_sessions_activity_delete", "AFTER DELETE", SESSION_ACTIVITY_REMOVE),
+    ("trg_study_sessions_activity_update", "AFTER UPDATE OF group_id, created_at",
+     SESSION_ACTIVITY_REMOVE + SESSION_ACTIVITY_ADD),
+]
+
+WORD_REVIEW_ACTIVITY_TRIGGERS = [
+    ("trg_word_review_items_activity_insert", "AFTER INSERT", REVIEW_ACTIVITY_ADD),
+    ("trg_word_review_items_activity_delete", "AFTER DELETE", REVIEW_ACTIVITY_REMOVE),
+    ("trg_word_review_items_activity_update", "AFTER UPDATE OF study_session_id, correct, created_at",
+     REVIEW_ACTIVITY_REMOVE + REVIEW_ACTIVITY_ADD),
+]
+
+add_triggers(StudySession.__table__, STUDY_SESSION_ACTIVITY_TRIGGERS)
+add_triggers(WordReviewItem.__table__, WORD_REVIEW_ACTIVITY_TRIGGERS)
+
+# Days of progress buckets in daily_studied_words and daily_active_groups. Every insert drops
+# its language's buckets older than that before its own day, so the tables hold about one
+# window of days; the dashboard only reads the days of its window.
+PROGRESS_WINDOW_DAYS = 30
+
+# SQL of the language of a review's session, and of a session's group
+REVIEW_LANGUAGE_SQL = """(
+            SELECT groups.language_code FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+            WHERE study_sessions.id = {row}.study_session_id
+        )"""
+SESSION_LANGUAGE_SQL = "(SELECT language_code FROM groups WHERE id = {row}.group_id)"
+
+def window_start_sql(dialect: str) -> str:
+    """SQL of the first day of the progress window ending on the day of NEW.created_at."""
+    if dialect == "postgresql":
+        return f"date(NEW.created_at) - {PROGRESS_WINDOW_DAYS}"
+    return f"date(NEW.created_at, '-{PROGRESS_WINDOW_DAYS} days')"
+
+def studied_word_add(dialect: str) -> str:
+    return f"""
+        INSERT INTO daily_studied_words (language_code, date, word_id, reviews)
+        SELECT groups.language_code, date(NEW.created_at), NEW.word_id, 1
+        FROM study_sessions JOIN groups ON groups.id = study_sessions.group_id
+        WHERE study_sessions.id = NEW.study_session_id AND NEW.created_at IS NOT NULL
+        ON CONFLICT (language_code, date, word_id) DO UPDATE SET reviews = daily_studied_words.reviews + 1;
+        DELETE FROM daily_studied_words
+        WHERE language_code = {REVIEW_LANGUAGE_SQL.format(row="NEW")}
+          AND date < {window_start_sql(dialect)};
+"""
+
+STUDIED_WORD_REMOVE = f"""
+        UPDATE daily_studied_words SET reviews = reviews - 1
+        WHERE language_code = {REVIEW_LANGUAGE_SQL.format(row="OLD")}
+          AND date = date(OLD.created_at) AND word_id = OLD.word_id;
+        DELETE FROM daily_studied_words
+        WHERE language_code = {REVIEW_LANGUAGE_SQL.format(row="OLD")}
+          AND date = date(OLD.created_at) AND word_id = OLD.word_id AND reviews <= 0;
+"""
+
+def active_group_add(dialect: str) -> str:
+    return f"""
+        INSERT INTO daily_active_groups (language_code, date, group_id, sessions)
+        SELECT language_code, date(NEW.created_at), NEW.group_id, 1
+        FROM groups WHERE id = NEW.group_id AND NEW.created_at IS NOT NULL
+        ON CONFLICT (language_code, date, group_id) DO UPDATE SET sessions = daily_active_groups.sessions + 1;
+        DELETE FROM daily_active_groups
+        WHERE language_code = {SESSION_LANGUAGE_SQL.format(row="NEW")}
+          AND date < {window_start_sql(dialect)};
+"""
+
+ACTIVE_GROUP_REMOVE = f"""
+        UPDATE daily_active_groups SET sessions = sessions - 1
+        WHERE language_code = {SESSION_LANGUAGE_SQL.format(row="OLD")}
+          AND date = date(OLD.created_at) AND group_id = OLD.group_id;
+        DELETE FROM daily_active_groups
+        WHERE language_code = {SESSION_LANGUAGE_SQL.format(row="OLD")}
+          AND date = date(OLD.created_at) AND group_id = OLD.group_id AND sessions <= 0;
+"""
+
+WORD_REVIEW_PROGRESS_TRIGGERS = [
+    ("trg_word_review_items_progress_insert", "AFTER INSERT", studied_word_add),
+    ("trg_word_review_items_progress_delete", "AFTER DELETE", STUDIED_WORD_REMOVE),
+    ("trg_word_review_items_progress_update", "AFTER UPDATE OF word_id, study_session_id, created_at",
+     lambda dialect: STUDIED_WORD_REMOVE + studied_word_add(dialect)),
+]
+
+STUDY_SESSION_PROGRESS_TRIGGERS = [
+    ("trg_study_sessions_progress_insert", "AFTER INSERT", active_group_add),
+    ("trg_study_sessions_progress_delete", "AFTER DELETE", ACTIVE_GROUP_REMOVE),
+    ("trg_study_sessions_progress_update", "AFTER UPDATE OF group_id, created_at",
+     lambda dialect: ACTIVE_GROUP_REMOVE + active_group_add(dialect)),
+]
+
+add_triggers(WordReviewItem.__table__, WORD_REVIEW_PROGRESS_TRIGGERS)
+add_triggers(StudySession.__table__, STUDY_SESSION_PROGRESS_TRIGGERS)
+
+# Group.words_count follows every link and unlink on word_groups; only words in the group's
+# language are counted. A word moving to another language leaves the counts of its groups.
+GROUP_WORDS_COUNT_ADD = """
+        UPDATE groups SET words_count = words_count + 1
+        WHERE id = NEW.group_id
+          AND language_code = (SELECT language_code FROM words WHERE id = NEW.word_id);
+"""
+
+GROUP_WORDS_COUNT_REMOVE = """
+        UPDATE groups SET words_count = words_count - 1
+        WHERE id = OLD.group_id
+          AND language_code = (SELECT language_code FROM words WHERE id = OLD.word_id);
+"""
+
+GROUP_WORDS_COUNT_TRIGGERS = [
+    ("trg_word_groups_words_count_insert", "AFTER INSERT", GROUP_WORDS_COUNT_ADD),
+    ("trg_word_groups_words_count_delete", "AFTER DELETE", GROUP_WORDS_COUNT_REMOVE),
+    ("trg_word_groups_words_count_update", "AFTER UPDATE OF word_id, group_id",
+     GROUP_WORDS_COUNT_REMOVE + GROUP_WORDS_COUNT_ADD),
+]
+
+WORD_LANGUAGE_WORDS_COUNT_TRIGGERS = [
+    # A deleted word is unlinked while it still exists: the word_groups delete trigger reads
+    # its language, and on PostgreSQL the ON DELETE CASCADE runs after the row is gone
+    ("trg_words_words_count_delete", "BEFORE DELETE", """
+        DELETE FROM word_groups WHERE word_id = OLD.id;
+    """),
+    ("trg_words_words_count_language_update", "AFTER UPDATE OF language_code", """
+        UPDATE groups SET words_count = words_count - 1
+        WHERE language_code = OLD.language_code
+          AND id IN (SELECT group_id FROM word_groups WHERE word_id = NEW.id);
+        UPDATE groups SET words_count = words_count + 1
+        WHERE language_code = NEW.language_code
+          AND id IN (SELECT group_id FROM word_groups WHERE word_id = NEW.id);
+    """),
+]
+
+add_triggers(WordGroup.__table__, GROUP_WORDS_COUNT_TRIGGERS)
+add_triggers(Word.__table__, WORD_LANGUAGE_WORDS_COUNT_TRIGGERS)
+
+# Full-text index over the words' text for /words/search, one row per word (rowid = words.id).
+# Text is folded like search queries (app.utils.search); language_code is indexed so a
+# search can be restricted to one language within the MATCH expression. PostgreSQL has no
+# FTS5: there the table holds a weighted tsvector per word under a GIN index instead.
+WORDS_FTS_TABLE = {
+    "sqlite": """
+    CREATE VIRTUAL TABLE words_fts USING fts5(
+        script, transliteration, meaning, language_code,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    "postgresql": """
+    CREATE TABLE words_fts (
+        rowid INTEGER PRIMARY KEY,
+        language_code VARCHAR NOT NULL,
+        document TSVECTOR NOT NULL
+    );
+    CREATE INDEX ix_words_fts_document ON words_fts USING gin (document)
+    """,
+}
+
+def words_fts_insert(dialect: str) -> str:
+    if dialect == "postgresql":
+        document = " || ".join(
+            f"setweight(to_tsvector('simple', {fold_diacritics_sql(f'coalesce(NEW.{name}, {empty})')}), '{weight}')"
+            for name, weight, empty in (("script", "A", "''"), ("transliteration", "A", "''"), ("meaning", "B", "''"))
+        )
+        return f"""
+        INSERT INTO words_fts (rowid, language_code, document) VALUES (NEW.id, NEW.language_code, {document});
+"""
+    return f"""
+        INSERT INTO words_fts (rowid, script, transliteration, meaning, language_code)
+        VALUES (NEW.id, {fold_sql("NEW.script")}, {fold_sql("NEW.transliteration")}, {fold_sql("NEW.meaning")}, NEW.language_code);
+"""
+
+WORDS_FTS_DELETE = """
+        DELETE FROM words_fts WHERE rowid = OLD.id;
+"""
+
+WORDS_FTS_TRIGGERS = [
+    ("trg_words_fts_insert", "AFTER INSERT", words_fts_insert),
+    ("trg_words_fts_delete", "AFTER DELETE", WORDS_FTS_DELETE),
+    ("trg_words_fts_update", "AFTER UPDATE OF script, transliteration, meaning, language_code",
+     lambda dialect: WORDS_FTS_DELETE + words_fts_insert(dialect)),
+]
+
+for dialect, statement in WORDS_FTS_TABLE.items():
+    event.listen(Word.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(Word.__table__, "before_drop", DDL("DROP TABLE IF EXISTS words_fts"))
+
+add_triggers(Word.__table__, WORDS_FTS_TRIGGERS)
+
+# Every word_groups link has a review_schedules row, starting out due when the link is made
+REVIEW_SCHEDULE_ADD = """
+        INSERT INTO review_schedules (group_id, word_id) VALUES (NEW.group_id, NEW.word_id)
+        ON CONFLICT DO NOTHING;
+"""
+
+REVIEW_SCHEDULE_REMOVE = """
+        DELETE FROM review_schedules WHERE group_id = OLD.group_id AND word_id = OLD.word_id;
+"""
+
+REVIEW_SCHEDULE_TRIGGERS = [
+    ("trg_word_groups_review_schedules_insert", "AFTER INSERT", REVIEW_SCHEDULE_ADD),
+    ("trg_word_groups_review_schedules_delete", "AFTER DELETE", REVIEW_SCHEDULE_REMOVE),
+    ("trg_word_groups_review_schedules_update", "AFTER UPDATE OF word_id, group_id",
+     REVIEW_SCHEDULE_REMOVE + REVIEW_SCHEDULE_ADD),
+]
+
+add_triggers(WordGroup.__table__, REVIEW_SCHEDULE_TRIGGERS)
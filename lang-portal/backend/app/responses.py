@@ -0,0 +1,16 @@
+"""Fast JSON responses for the list endpoints.
+
+Returning a Response from an endpoint skips FastAPI's response_model validation
+and serialization. The schemas in app.schemas still document these routes in
+OpenAPI; the endpoints build plain dicts and lists from named SQL columns in the
+same shape, which orjson encodes in one pass.
+"""
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson: compact, UTF-8, datetimes as ISO 8601 like datetime.isoformat()."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
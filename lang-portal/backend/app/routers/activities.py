@@ -1,123 +1,138 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, and_
-from typing import List
-from app.main import get_db
-from app.models import StudyActivity, ActivityLanguageSupport, StudySession, WordReviewItem
+from typing import List, Optional
+from app.cache import CachedRoute, cached
+from app.database import DbSession, run_db
+from app.dependencies import get_db
+from app.utils.pagination import MAX_PER_PAGE, paginate
+from app.models import StudyActivity, ActivityLanguageSupport, StudySession, WordReviewItem, Group
 from app.schemas import StudyActivity as StudyActivitySchema
-from app.schemas import StudyActivityWithSessions, PaginatedStudySessions, StudySessionDetail
+from app.schemas import StudyActivityWithSessions
+from app.responses import FastJSONResponse
+from app.routers.sessions import session_item, session_rows
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 @router.get("/study-activities", response_model=List[StudyActivitySchema])
-def get_study_activities(
+@cached("study_activities", "activity_language_support")
+async def get_study_activities(
     language_code: str,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """
     Get all study activities available for a specific language.
     This includes both universal activities and language-specific ones that support the given language.
     """
-    # Get all universal activities (is_language_specific = False)
-    # and language-specific activities that support the given language
-    activities = db.query(StudyActivity).filter(
-        (StudyActivity.is_language_specific == False) |  # Universal activities
-        and_(
-            StudyActivity.is_language_specific == True,  # Language-specific activities
-            StudyActivity.id.in_(
-                db.query(ActivityLanguageSupport.activity_id)
-                .filter(ActivityLanguageSupport.language_code == language_code)
+    def run(db: Session):
+        # Get all universal activities (is_language_specific = False)
+        # and language-specific activities that support the given language
+        activities = db.query(StudyActivity).filter(
+            (StudyActivity.is_language_specific == False) |  # Universal activities
+            and_(
+                StudyActivity.is_language_specific == True,  # Language-specific activities
+                StudyActivity.id.in_(
+                    db.query(ActivityLanguageSupport.activity_id)
+                    .filter(ActivityLanguageSupport.language_code == language_code)
+                )
             )
-        )
-    ).all()
-    
-    return activities
+        ).all()
+
+        return activities
+
+    return await run_db(db, run)
 
 @router.get("/study-activities/{activity_id}", response_model=StudyActivityWithSessions)
-def get_study_activity(
+async def get_study_activity(
     activity_id: int,
     language_code: str,
     page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1, le=100),
+    per_page: int = Query(10, ge=1, le=MAX_PER_PAGE),
     sort_by: str = Query("created_at", pattern="^(created_at|last_review_at|reviews_count)$"),
     order: str = Query("desc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set to false to skip counting the total (e.g. for infinite scroll)"),
+    db: DbSession = Depends(get_db)
 ):
     """
     Get detailed information about a specific study activity, including its sessions history
     for the specified language.
     """
-    # Get the activity
-    activity = db.query(StudyActivity).filter(StudyActivity.id == activity_id).first()
-    if not activity:
-        raise HTTPException(status_code=404, detail=f"Study activity with id {activity_id} not found")
-    
-    # Get sessions with their review statistics
-    sessions_query = db.query(
-        StudySession,
-        func.max(WordReviewItem.created_at).label("last_review_at"),
-        func.count(WordReviewItem.id).label("reviews_count")
-    ).join(
-        StudySession.group
-    ).outerjoin(
-        WordReviewItem,
-        WordReviewItem.study_session_id == StudySession.id
-    ).filter(
-        StudySession.study_activity_id == activity_id,
-        StudySession.group.has(language_code=language_code)
-    ).group_by(
-        StudySession.id
-    )
-    
-    # Apply sorting
-    if sort_by == "created_at":
-        sort_column = StudySession.created_at
-    elif sort_by == "last_review_at":
-        sort_column = func.max(WordReviewItem.created_at)
-    else:  # reviews_count
-        sort_column = func.count(WordReviewItem.id)
-    
-    if order == "desc":
-        sessions_query = sessions_query.order_by(desc(sort_column))
-    else:
-        sessions_query = sessions_query.order_by(sort_column)
-    
-    # Get total count
-    total = sessions_query.count()
-    
-    # Apply pagination
-    sessions = sessions_query.offset((page - 1) * per_page).limit(per_page).all()
-    
-    # Convert to response format
-    session_items = []
-    for session, last_review_at, reviews_count in sessions:
-        session_detail = StudySessionDetail(
-            id=session.id,
-            group=session.group,
-            activity=session.activity,
-            created_at=session.created_at.isoformat(),
-            last_review_at=last_review_at.isoformat() if last_review_at else None,
-            reviews_count=reviews_count
+    def run(db: Session):
+        # Get the activity
+        activity = db.query(
+            StudyActivity.name,
+            StudyActivity.url,
+            StudyActivity.description,
+            StudyActivity.image_url,
+            StudyActivity.is_language_specific
+        ).filter(StudyActivity.id == activity_id).first()
+        if not activity:
+            raise HTTPException(status_code=404, detail=f"Study activity with id {activity_id} not found")
+
+        # Get sessions with their group, activity and review statistics as named rows
+        sessions_query = session_rows(db).filter(
+            StudySession.study_activity_id == activity_id,
+            Group.language_code == language_code
+        )
+
+        # Ungrouped base query (one row per session) for the total count
+        count_query = db.query(StudySession).join(
+            StudySession.group
+        ).filter(
+            StudySession.study_activity_id == activity_id,
+            Group.language_code == language_code
         )
-        session_items.append(session_detail)
-    
-    # Create paginated sessions response
-    paginated_sessions = PaginatedStudySessions(
-        total=total,
-        items=session_items,
-        page=page,
-        per_page=per_page
-    )
-    
-    # Add sessions to activity response
-    activity_response = StudyActivityWithSessions(
-        id=activity.id,
-        name=activity.name,
-        url=activity.url,
-        description=activity.description,
-        image_url=activity.image_url,
-        is_language_specific=activity.is_language_specific,
-        sessions=paginated_sessions
-    )
-    
-    return activity_response 
\ No newline at end of file
+
+        # Apply sorting and pagination; created_at is a column and supports cursors,
+        # the review aggregates can only be paged by offset
+        if sort_by == "created_at":
+            result_page = paginate(
+                sessions_query,
+                page=page,
+                per_page=per_page,
+                count_query=count_query,
+                include_total=include_total,
+                cursor=cursor,
+                sort_column=StudySession.created_at,
+                id_column=StudySession.id,
+                descending=order == "desc",
+                sort_by=sort_by,
+                row_key=lambda row: (row.created_at, row.id)
+            )
+        else:
+            if sort_by == "last_review_at":
+                sort_column = func.max(WordReviewItem.created_at)
+            else:  # reviews_count
+                sort_column = func.count(WordReviewItem.id)
+
+            if order == "desc":
+                sessions_query = sessions_query.order_by(desc(sort_column), desc(StudySession.id))
+            else:
+                sessions_query = sessions_query.order_by(sort_column, StudySession.id)
+            result_page = paginate(
+                sessions_query,
+                page=page,
+                per_page=per_page,
+                count_query=count_query,
+                include_total=include_total,
+                cursor=cursor
+            )
+
+        return {
+            "name": activity.name,
+            "url": activity.url,
+            "description": activity.description,
+            "image_url": activity.image_url,
+            "is_language_specific": activity.is_language_specific,
+            "id": activity_id,
+            "sessions": {
+                "total": result_page.total,
+                "items": [session_item(row) for row in result_page.items],
+                "page": page,
+                "per_page": per_page,
+                "next_cursor": result_page.next_cursor
+            }
+        }
+
+    return FastJSONResponse(await run_db(db, run))
@@ -1,13 +1,148 @@
-from fastapi import APIRouter, Depends
+from tempfile import SpooledTemporaryFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
+from starlette.datastructures import UploadFile
+from app.cache import invalidate, response_cache
 from app.dependencies import admin_only
-from app.main import get_db
-from app.seed import seed_all
+from app.database import DbSession, run_db
+from app.dependencies import get_db
+from app.seed import seed_all, seed_synthetic
+from app.utils.difficulty import rebuild_word_difficulty
+from app.utils.stats import (
+    rebuild_daily_activity, rebuild_group_word_counts, rebuild_progress_buckets, rebuild_review_schedules, rebuild_word_stats
+)
+from app.utils.vocab_import import VocabImportError, import_vocab
 
 router = APIRouter()
 
 @router.post("/admin/seed", dependencies=[Depends(admin_only)])
-def seed_database(db: Session = Depends(get_db)):
+async def seed_database(
+    synthetic: bool = Query(False, description="Replace the data with a large generated dataset instead"),
+    languages: int = Query(2, ge=1, le=50, description="Synthetic languages"),
+    words: int = Query(1000, ge=0, le=1_000_000, description="Synthetic words per language"),
+    sessions: int = Query(100, ge=0, le=1_000_000, description="Synthetic study sessions per language"),
+    reviews: int = Query(10000, ge=0, le=10_000_000, description="Synthetic reviews per language"),
+    db: DbSession = Depends(get_db)
+):
     """Protected endpoint for manual seeding"""
-    data = seed_all(db)
-    return {"message": "Database seeded successfully"} 
\ No newline at end of file
+    def run(db: Session):
+        if synthetic:
+            report = seed_synthetic(db, languages=languages, words=words, sessions=sessions, reviews=reviews)
+            return {"message": "Database seeded with synthetic data", **report}
+        data = seed_all(db)
+        return {"message": "Database seeded successfully"}
+
+    result = await run_db(db, run)
+    await invalidate()
+    return result
+
+@router.post("/admin/rebuild-word-stats", dependencies=[Depends(admin_only)])
+async def rebuild_word_statistics(db: DbSession = Depends(get_db)):
+    """Recompute the denormalized per-word review counters from the raw reviews"""
+    def run(db: Session):
+        words_updated = rebuild_word_stats(db)
+        return {"message": "Word statistics rebuilt successfully", "words_updated": words_updated}
+
+    result = await run_db(db, run)
+    await invalidate("words")
+    return result
+
+@router.post("/admin/rebuild-group-word-counts", dependencies=[Depends(admin_only)])
+async def rebuild_group_words_count(db: DbSession = Depends(get_db)):
+    """Recompute the denormalized per-group word counts from the word_groups links"""
+    def run(db: Session):
+        groups_updated = rebuild_group_word_counts(db)
+        return {"message": "Group word counts rebuilt successfully", "groups_updated": groups_updated}
+
+    result = await run_db(db, run)
+    await invalidate("groups")
+    return result
+
+@router.post("/admin/rebuild-daily-activity", dependencies=[Depends(admin_only)])
+async def rebuild_daily_activity_rollup(db: DbSession = Depends(get_db)):
+    """Recompute the daily_activity rollup from the raw sessions and reviews"""
+    def run(db: Session):
+        days_updated = rebuild_daily_activity(db)
+        return {"message": "Daily activity rebuilt successfully", "days_updated": days_updated}
+
+    result = await run_db(db, run)
+    await invalidate("daily_activity")
+    return result
+
+@router.post("/admin/rebuild-progress-buckets", dependencies=[Depends(admin_only)])
+async def rebuild_progress_bucket_sets(db: DbSession = Depends(get_db)):
+    """Recompute the per-day studied word and active group buckets of the progress window"""
+    def run(db: Session):
+        rows_written = rebuild_progress_buckets(db)
+        return {"message": "Progress buckets rebuilt successfully", "rows_written": rows_written}
+
+    return await run_db(db, run)
+
+@router.post("/admin/rebuild-review-schedules", dependencies=[Depends(admin_only)])
+async def rebuild_review_schedule_state(db: DbSession = Depends(get_db)):
+    """Recompute the spaced-repetition schedules by replaying the reviews"""
+    def run(db: Session):
+        schedules_updated = rebuild_review_schedules(db)
+        return {"message": "Review schedules rebuilt successfully", "schedules_updated": schedules_updated}
+
+    result = await run_db(db, run)
+    await invalidate("review_schedules")
+    return result
+
+@router.post("/admin/rebuild-word-difficulty", dependencies=[Depends(admin_only)])
+async def rebuild_word_difficulty_ranking(db: DbSession = Depends(get_db)):
+    """Recompute the /words/hardest ranking from the recent reviews now instead of at the next refresh"""
+    def run(db: Session):
+        words_ranked = rebuild_word_difficulty(db)
+        return {"message": "Word difficulty rebuilt successfully", "words_ranked": words_ranked}
+
+    return await run_db(db, run)
+
+# Bytes of a raw JSON upload kept in memory before it is spooled to disk (as multipart uploads are)
+IMPORT_SPOOL_SIZE = 1024 * 1024
+
+@router.post(
+    "/admin/import/vocab",
+    dependencies=[Depends(admin_only)],
+    openapi_extra={"requestBody": {"content": {
+        "application/json": {"schema": {"type": "object", "required": ["vocab_examples"]}},
+        "multipart/form-data": {"schema": {
+            "type": "object",
+            "properties": {"files": {"type": "array", "items": {"type": "string", "format": "binary"}}}
+        }},
+    }}}
+)
+async def import_vocabulary(request: Request, db: DbSession = Depends(get_db)):
+    """Import vocab-importer files: one file as a JSON body, or many as a multipart upload of `files`"""
+    form = None
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        files = [upload.file for upload in form.getlist("files") if isinstance(upload, UploadFile)]
+    else:
+        body = SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE)
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        files = [body]
+
+    try:
+        if not files:
+            raise HTTPException(status_code=400, detail="No files uploaded")
+        result = await run_db(db, import_vocab, files)
+    except VocabImportError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid vocabulary file: {e}")
+    finally:
+        if form is not None:
+            await form.close()
+        else:
+            body.close()
+
+    await invalidate("words", "groups", "word_groups")
+    return {"message": "Vocabulary imported successfully", **result}
+
+@router.get("/admin/cache/stats", dependencies=[Depends(admin_only)])
+async def get_cache_stats():
+    """Hit/miss counters of this process's response cache"""
+    if response_cache is None:
+        return {"backend": "off"}
+    return response_cache.get_stats()
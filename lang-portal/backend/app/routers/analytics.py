@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import date, datetime, timedelta
+from typing import Optional
+from app.database import DbSession
+from app.dependencies import get_db
+from app.responses import FastJSONResponse
+from app.schemas import ReviewAnalytics
+from app.utils.review_analytics import (
+    BUCKETS, DEFAULT_BUCKETS, MAX_BUCKETS, bucket_starts, floor_bucket, next_bucket, previous_bucket, review_analytics
+)
+
+router = APIRouter()
+
+@router.get("/analytics/reviews", response_model=ReviewAnalytics)
+async def get_review_analytics(
+    language_code: str = Query(..., description="ISO 639-1 code of the language"),
+    bucket: str = Query("day", pattern=f"^({'|'.join(BUCKETS)})$", description="Days, ISO weeks (from Monday) or months"),
+    from_: Optional[date] = Query(None, alias="from", description="First day, rounded down to its bucket (UTC)"),
+    to: Optional[date] = Query(None, description="Last day, rounded up to the end of its bucket (UTC); today by default"),
+    group_id: Optional[int] = Query(None, description="Only count the reviews of this group's sessions"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Reviews, correct answers, accuracy and distinct words reviewed per bucket, every bucket from from to to included.
+    Without from, the range is the last 30 days, 12 weeks or 12 months up to to.
+    """
+    today = datetime.utcnow().date()
+    to = to or today
+    try:
+        if from_ is None:
+            from_ = floor_bucket(bucket, to)
+            for _ in range(DEFAULT_BUCKETS[bucket] - 1):
+                from_ = previous_bucket(bucket, from_)
+        if from_ > to:
+            raise HTTPException(status_code=400, detail="from must not be after to")
+        starts = bucket_starts(bucket, from_, to, limit=MAX_BUCKETS + 1)
+        if len(starts) > MAX_BUCKETS:
+            raise HTTPException(status_code=400, detail=f"The range covers more than {MAX_BUCKETS} buckets")
+        until = next_bucket(bucket, starts[-1])
+    except OverflowError:
+        # The first or last bucket reaches past the dates Python (and the query bounds) can represent
+        raise HTTPException(status_code=400, detail=f"The range's buckets must lie between {date.min} and {date.max}")
+
+    buckets = await review_analytics(db, bucket, language_code, group_id, starts, today)
+
+    return FastJSONResponse({
+        "language_code": language_code,
+        "group_id": group_id,
+        "bucket": bucket,
+        "from": starts[0].isoformat(),
+        "to": (until - timedelta(days=1)).isoformat(),
+        "items": [
+            {
+                "start": start.isoformat(),
+                "reviews": stats.reviews,
+                "correct": stats.correct,
+                "accuracy": round(stats.correct * 100.0 / stats.reviews, 1) if stats.reviews else None,
+                "distinct_words": stats.distinct_words
+            }
+            for start, stats in buckets.items()
+        ]
+    })
@@ -1,170 +1,224 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, case
+from sqlalchemy import func, select, case, true
 from datetime import datetime, timedelta
 from typing import Optional
-from app.main import get_db
-from app.models import StudySession, WordReviewItem, Word, Group
-from app.schemas import LastStudySession, LastStudySessionStats, StudyProgress, QuickStats
+from app.database import DbSession, run_db
+from app.dependencies import get_db
+from app.models import (
+    PROGRESS_WINDOW_DAYS, DailyActiveGroup, DailyActivity, DailyStudiedWord, StudyActivity, StudySession, WordGroup,
+    WordReviewItem, Group
+)
+from app.utils.db_utils import day_number
+from app.schemas import (
+    DashboardSummary, GroupInSession, LastStudySession, LastStudySessionStats, StudyProgress, QuickStats
+)
 
 router = APIRouter()
 
-@router.get("/dashboard/last-session", response_model=Optional[LastStudySession])
-def get_last_study_session(
-    language_code: str,
-    db: Session = Depends(get_db)
-):
-    """Get information about the user's last study session for a specific language."""
-    # Get the last session with its review statistics
-    last_session = db.query(
-        StudySession,
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == True).label("correct_count"),
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count")
+def load_dashboard_summary(db: Session, language_code: str) -> DashboardSummary:
+    """Compute every dashboard figure for a language in a single query.
+
+    The review aggregates and last session share one lang_sessions CTE, progress
+    unions the per-day buckets of its window, the streak reads the daily_activity
+    rollup, and the whole summary is one round trip.
+    """
+    now = datetime.utcnow()
+    # Progress covers the last PROGRESS_WINDOW_DAYS UTC days, today included
+    start_day = now.date() - timedelta(days=PROGRESS_WINDOW_DAYS - 1)
+    yesterday = now.date() - timedelta(days=1)
+
+    lang_sessions = select(
+        StudySession.id,
+        StudySession.group_id,
+        StudySession.study_activity_id,
+        StudySession.created_at
+    ).join(
+        Group,
+        Group.id == StudySession.group_id
+    ).where(
+        Group.language_code == language_code
+    ).cte("lang_sessions")
+
+    # Success rate and number of reviewed sessions over all reviews of the language
+    review_totals = select(
+        func.count(WordReviewItem.id).label("reviews"),
+        func.sum(case((WordReviewItem.correct == True, 1), else_=0)).label("correct"),
+        func.count(func.distinct(WordReviewItem.study_session_id)).label("reviewed_sessions")
+    ).join(
+        lang_sessions,
+        lang_sessions.c.id == WordReviewItem.study_session_id
+    ).cte("review_totals")
+
+    # Words in the groups studied during the window: the union of the days' group sets
+    window_groups = select(
+        DailyActiveGroup.group_id
+    ).where(
+        DailyActiveGroup.language_code == language_code,
+        DailyActiveGroup.date >= start_day
+    )
+    total_words = select(
+        func.count(func.distinct(WordGroup.word_id))
+    ).where(
+        WordGroup.group_id.in_(window_groups)
+    ).scalar_subquery()
+
+    # Words reviewed during the window: the union of the days' word sets
+    words_studied = select(
+        func.count(func.distinct(DailyStudiedWord.word_id))
+    ).where(
+        DailyStudiedWord.language_code == language_code,
+        DailyStudiedWord.date >= start_day
+    ).scalar_subquery()
+
+    active_groups = select(
+        func.count(func.distinct(lang_sessions.c.group_id))
+    ).scalar_subquery()
+
+    # Study streak as gaps-and-islands over the daily_activity rollup (one row per study day):
+    # walking the days newest first, day_number(date) + row_number() stays constant while
+    # the days are consecutive, so the latest run is the rows sharing the first row's value
+    study_days = select(
+        DailyActivity.date.label("day")
+    ).where(
+        DailyActivity.language_code == language_code,
+        DailyActivity.sessions > 0
+    ).cte("study_days")
+    islands = select(
+        study_days.c.day,
+        (day_number(study_days.c.day) + func.row_number().over(order_by=study_days.c.day.desc())).label("island")
+    ).cte("islands")
+    latest_island = select(
+        islands.c.day,
+        islands.c.island
+    ).order_by(
+        islands.c.day.desc()
+    ).limit(1).cte("latest_island")
+    # The newest run only counts as a streak if it reaches today or yesterday
+    study_streak = select(
+        func.count()
+    ).select_from(
+        islands
     ).join(
-        StudySession.group
-    ).outerjoin(
-        WordReviewItem,
-        WordReviewItem.study_session_id == StudySession.id
-    ).filter(
-        StudySession.group.has(language_code=language_code)
-    ).group_by(
-        StudySession.id
+        latest_island,
+        latest_island.c.island == islands.c.island
+    ).where(
+        latest_island.c.day >= yesterday
+    ).scalar_subquery()
+
+    last_session = select(
+        lang_sessions
     ).order_by(
-        desc(StudySession.created_at)
-    ).first()
-    
-    if not last_session:
-        return None
-    
-    session, correct_count, wrong_count = last_session
-    
-    return LastStudySession(
-        activity_name=session.activity.name,
-        date=session.created_at.isoformat(),
-        stats=LastStudySessionStats(
-            correct_count=correct_count,
-            wrong_count=wrong_count
+        lang_sessions.c.created_at.desc(),
+        lang_sessions.c.id.desc()
+    ).limit(1).cte("last_session")
+    last_session_correct = select(
+        func.count(WordReviewItem.id)
+    ).where(
+        WordReviewItem.study_session_id == last_session.c.id,
+        WordReviewItem.correct == True
+    ).scalar_subquery()
+    last_session_wrong = select(
+        func.count(WordReviewItem.id)
+    ).where(
+        WordReviewItem.study_session_id == last_session.c.id,
+        WordReviewItem.correct == False
+    ).scalar_subquery()
+
+    # review_totals always yields exactly one row, so the summary row exists even without sessions
+    row = db.execute(
+        select(
+            review_totals.c.reviews,
+            review_totals.c.correct,
+            review_totals.c.reviewed_sessions,
+            total_words.label("total_words"),
+            words_studied.label("words_studied"),
+            active_groups.label("active_groups"),
+            study_streak.label("study_streak"),
+            last_session.c.id.label("last_session_id"),
+            last_session.c.created_at.label("last_session_date"),
+            last_session_correct.label("last_session_correct"),
+            last_session_wrong.label("last_session_wrong"),
+            Group.id.label("last_group_id"),
+            Group.name.label("last_group_name"),
+            StudyActivity.name.label("last_activity_name")
+        ).select_from(
+            review_totals
+        ).outerjoin(
+            last_session,
+            true()
+        ).outerjoin(
+            Group,
+            Group.id == last_session.c.group_id
+        ).outerjoin(
+            StudyActivity,
+            StudyActivity.id == last_session.c.study_activity_id
+        )
+    ).one()
+
+    last = None
+    if row.last_session_id is not None:
+        last = LastStudySession(
+            activity_name=row.last_activity_name,
+            date=row.last_session_date.isoformat(),
+            stats=LastStudySessionStats(
+                correct_count=row.last_session_correct,
+                wrong_count=row.last_session_wrong
+            ),
+            group=GroupInSession(id=row.last_group_id, name=row.last_group_name)
+        )
+
+    total = row.total_words or 0
+    studied = row.words_studied or 0
+    progress_percentage = (studied / total * 100) if total > 0 else 0.0
+    success_rate = (row.correct * 100.0 / row.reviews) if row.reviews else 0.0
+
+    return DashboardSummary(
+        last_session=last,
+        progress=StudyProgress(
+            total_words=total,
+            words_studied=studied,
+            progress_percentage=round(progress_percentage, 1)  # Round to 1 decimal place
         ),
-        group=session.group
+        quick_stats=QuickStats(
+            success_rate=round(success_rate, 1),
+            study_sessions=row.reviewed_sessions or 0,
+            active_groups=row.active_groups or 0,
+            study_streak=row.study_streak or 0
+        )
     )
 
+@router.get("/dashboard/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    language_code: str,
+    db: DbSession = Depends(get_db)
+):
+    """Get the last session, study progress and quick stats for a language in one request."""
+    return await run_db(db, load_dashboard_summary, language_code)
+
+@router.get("/dashboard/last-session", response_model=Optional[LastStudySession])
+async def get_last_study_session(
+    language_code: str,
+    db: DbSession = Depends(get_db)
+):
+    """Get information about the user's last study session for a specific language."""
+    summary = await run_db(db, load_dashboard_summary, language_code)
+    return summary.last_session
+
 @router.get("/dashboard/progress", response_model=StudyProgress)
-def get_study_progress(
+async def get_study_progress(
     language_code: str,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get the user's study progress over the last month."""
-    # Calculate last month's date range
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=30)  # Last month
-    
-    # Get total words count from groups used in study sessions
-    total_words = db.query(
-        func.count(Word.id.distinct())
-    ).join(
-        Word.groups
-    ).join(
-        StudySession,
-        StudySession.group_id == Group.id
-    ).filter(
-        Group.language_code == language_code,
-        StudySession.created_at >= start_date
-    ).scalar()
-    
-    # Get words studied count
-    words_studied = db.query(
-        func.count(Word.id.distinct())
-    ).join(
-        WordReviewItem,
-        WordReviewItem.word_id == Word.id
-    ).join(
-        StudySession,
-        StudySession.id == WordReviewItem.study_session_id
-    ).join(
-        Group,
-        Group.id == StudySession.group_id
-    ).filter(
-        Group.language_code == language_code,
-        WordReviewItem.created_at >= start_date
-    ).scalar()
-    
-    # Calculate progress percentage
-    total_words = total_words or 0
-    words_studied = words_studied or 0
-    progress_percentage = (words_studied / total_words * 100) if total_words > 0 else 0.0
-    
-    return StudyProgress(
-        total_words=total_words,
-        words_studied=words_studied,
-        progress_percentage=round(progress_percentage, 1)  # Round to 1 decimal place
-    )
+    summary = await run_db(db, load_dashboard_summary, language_code)
+    return summary.progress
 
 @router.get("/dashboard/quick-stats", response_model=QuickStats)
-def get_quick_stats(
+async def get_quick_stats(
     language_code: str,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get aggregated statistics about the user's study performance."""
-    # Get success rate and session count
-    stats = db.query(
-        (func.sum(case((WordReviewItem.correct == True, 1), else_=0)) * 100.0 / 
-         func.count(WordReviewItem.id)).label("success_rate"),
-        func.count(func.distinct(StudySession.id)).label("study_sessions")
-    ).join(
-        StudySession,
-        StudySession.id == WordReviewItem.study_session_id
-    ).join(
-        Group,
-        Group.id == StudySession.group_id
-    ).filter(
-        Group.language_code == language_code
-    ).first()
-    
-    # Get active groups count
-    active_groups = db.query(
-        func.count(func.distinct(Group.id))
-    ).join(
-        StudySession,
-        StudySession.group_id == Group.id
-    ).filter(
-        Group.language_code == language_code
-    ).scalar()
-    
-    # Calculate study streak
-    study_dates = db.query(
-        func.date(StudySession.created_at).label("date")
-    ).join(
-        Group,
-        Group.id == StudySession.group_id
-    ).filter(
-        Group.language_code == language_code
-    ).order_by(
-        desc("date")
-    ).distinct().all()
-    
-    # Convert to list of dates and ensure they are datetime.date objects
-    study_dates = [datetime.strptime(str(date[0]), "%Y-%m-%d").date() for date in study_dates]
-    
-    # Calculate streak
-    streak = 0
-    if study_dates:
-        current_date = datetime.utcnow().date()
-        for i, date in enumerate(study_dates):
-            if i == 0:
-                # First date must be today or yesterday
-                days_diff = (current_date - date).days
-                if days_diff > 1:
-                    break
-            if i > 0:
-                # Check gap between consecutive dates
-                days_diff = (study_dates[i-1] - date).days
-                if days_diff > 1:
-                    break
-            streak += 1
-    
-    return QuickStats(
-        success_rate=round(stats.success_rate or 0.0, 1),
-        study_sessions=stats.study_sessions or 0,
-        active_groups=active_groups or 0,
-        study_streak=streak
-    ) 
\ No newline at end of file
+    summary = await run_db(db, load_dashboard_summary, language_code)
+    return summary.quick_stats
@@ -0,0 +1,157 @@
+import csv
+import io
+import orjson
+from datetime import date, datetime, time, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Boolean, DateTime, func, select
+from typing import Callable, Dict, List, Optional, Sequence
+from app.database import DbSession, stream_db
+from app.dependencies import get_db
+from app.models import Group, StudySession, Word, WordReviewItem
+
+router = APIRouter()
+
+# Rows fetched from the cursor and written to the client per chunk
+EXPORT_BATCH_SIZE = 2000
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+CSV_BOOLEANS = {True: "true", False: "false"}
+
+def _ndjson_chunk(columns: List[str], rows: Sequence) -> bytes:
+    return b"".join(
+        orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+def _csv_converters(statement) -> Dict[int, Callable]:
+    """Converters, by column index, for the values that need formatting in CSV."""
+    converters = {}
+    for index, column in enumerate(statement.selected_columns):
+        if isinstance(column.type, Boolean):
+            converters[index] = CSV_BOOLEANS.get
+        elif isinstance(column.type, DateTime):
+            converters[index] = lambda value: None if value is None else value.isoformat()
+    return converters
+
+def _csv_chunk(rows: Sequence, converters: Optional[Dict[int, Callable]] = None) -> str:
+    if converters and rows:
+        # Convert column by column, which is cheaper than touching every value
+        columns = [
+            map(converters[index], values) if index in converters else values
+            for index, values in enumerate(zip(*rows))
+        ]
+        rows = zip(*columns)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+def _date_range(column, date_from: Optional[date], date_to: Optional[date]) -> list:
+    """Conditions keeping column within the whole UTC days date_from..date_to (both inclusive)."""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    conditions = []
+    if date_from:
+        conditions.append(column >= datetime.combine(date_from, time.min))
+    # The last representable day has no next day to bound it by, and needs no bound
+    if date_to and date_to < date.max:
+        conditions.append(column < datetime.combine(date_to + timedelta(days=1), time.min))
+    return conditions
+
+def _streaming_export(db: DbSession, statement, export_format: str, name: str) -> StreamingResponse:
+    """Stream statement's rows as NDJSON or CSV, one chunk per cursor batch."""
+    columns = list(statement.selected_columns.keys())
+    converters = _csv_converters(statement)
+
+    async def body():
+        if export_format == "csv":
+            yield _csv_chunk([columns])
+        async for rows in stream_db(db, statement, EXPORT_BATCH_SIZE):
+            yield _ndjson_chunk(columns, rows) if export_format == "ndjson" else _csv_chunk(rows, converters)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'}
+    )
+
+@router.get("/export/reviews")
+async def export_reviews(
+    language_code: str,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    date_from: Optional[date] = Query(None, description="First day (UTC) to include"),
+    date_to: Optional[date] = Query(None, description="Last day (UTC) to include"),
+    db: DbSession = Depends(get_db)
+):
+    """Stream the review history of a language, oldest first, as NDJSON or CSV."""
+    statement = select(
+        WordReviewItem.id,
+        WordReviewItem.created_at,
+        WordReviewItem.study_session_id,
+        StudySession.group_id,
+        StudySession.study_activity_id,
+        WordReviewItem.word_id,
+        Word.script,
+        WordReviewItem.correct
+    ).join(
+        StudySession,
+        StudySession.id == WordReviewItem.study_session_id
+    ).join(
+        Word,
+        Word.id == WordReviewItem.word_id
+    ).where(
+        # A correlated EXISTS rather than a join keeps reviews as the outer loop,
+        # scanned in id order, so rows go out without sorting the whole result
+        select(Group.id).where(
+            Group.id == StudySession.group_id,
+            Group.language_code == language_code
+        ).exists(),
+        *_date_range(WordReviewItem.created_at, date_from, date_to)
+    ).order_by(
+        WordReviewItem.id
+    )
+    return _streaming_export(db, statement, export_format, "reviews")
+
+@router.get("/export/words")
+async def export_words(
+    language_code: str,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    date_from: Optional[date] = Query(None, description="Only count reviews from this day (UTC) on"),
+    date_to: Optional[date] = Query(None, description="Only count reviews up to this day (UTC)"),
+    db: DbSession = Depends(get_db)
+):
+    """Stream the words of a language with their review statistics as NDJSON or CSV.
+
+    Without a date range the stored all-time counters are exported; with one, the
+    counters only cover reviews within the range.
+    """
+    if date_from is None and date_to is None:
+        correct_count, wrong_count = Word.correct_count, Word.wrong_count
+    else:
+        # Correlated counts rather than a grouped join, so words stream out one
+        # by one instead of after aggregating every review first
+        conditions = _date_range(WordReviewItem.created_at, date_from, date_to)
+
+        def review_count(correct: bool):
+            return select(func.count(WordReviewItem.id)).where(
+                WordReviewItem.word_id == Word.id,
+                WordReviewItem.correct == correct,
+                *conditions
+            ).scalar_subquery()
+
+        correct_count, wrong_count = review_count(True), review_count(False)
+
+    statement = select(
+        Word.id,
+        Word.script,
+        Word.transliteration,
+        Word.meaning,
+        correct_count.label("correct_count"),
+        wrong_count.label("wrong_count")
+    ).where(
+        Word.language_code == language_code
+    ).order_by(
+        Word.id
+    )
+    return _streaming_export(db, statement, export_format, "words")
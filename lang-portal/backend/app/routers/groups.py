@@ -1,154 +1,146 @@
 from fastapi import APIRouter, Query, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import Optional
-from app.main import get_db
-from app.models import Group, Word, WordGroup, WordReviewItem
-from sqlalchemy import func, and_, case, text, desc
+from app.cache import CachedRoute, cached
+from app.database import DbSession, run_db
+from app.dependencies import get_db
+from app.models import Group, Word, WordGroup
+from app.responses import FastJSONResponse
+from sqlalchemy import func
 from app.schemas import PaginatedGroups, GroupDetail
+from app.utils.pagination import MAX_PER_PAGE, paginate
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 @router.get("/groups", response_model=PaginatedGroups)
-def get_groups(
-    db: Session = Depends(get_db),
+@cached("groups")
+async def get_groups(
+    db: DbSession = Depends(get_db),
     language_code: str = Query(..., description="ISO 639-1 code of the language"),
     page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1),
-    sort_by: Optional[str] = None,
-    order: Optional[str] = "asc",
+    per_page: int = Query(10, ge=1, le=MAX_PER_PAGE),
+    sort_by: Optional[str] = Query(None, pattern="^(id|name|words_count)$"),
+    order: Optional[str] = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set to false to skip counting the total (e.g. for infinite scroll)"),
 ):
     """
     Returns a paginated list of groups for the specified language, including their word counts.
     """
-    # Base query for groups filtered by language
-    base_query = db.query(Group).filter(Group.language_code == language_code)
-    
-    # Get total count of groups for this language
-    total = base_query.count()
-
-    # Build query for groups with word counts
-    query = (
-        db.query(
-            Group, 
-            func.count(Word.id).label("words_count")
+    def run(db: Session):
+        # words_count is stored on the group, so every sort can be keyset-paginated
+        query = db.query(Group.id, Group.name, Group.words_count).filter(Group.language_code == language_code)
+        result_page = paginate(
+            query,
+            page=page,
+            per_page=per_page,
+            count_query=query,
+            include_total=include_total,
+            cursor=cursor,
+            sort_column=getattr(Group, sort_by) if sort_by else None,
+            id_column=Group.id,
+            descending=order == "desc",
+            sort_by=sort_by,
+            row_key=lambda row: (getattr(row, sort_by) if sort_by else None, row.id)
         )
-        .select_from(Group)
-        .filter(Group.language_code == language_code)
-        .outerjoin(WordGroup, WordGroup.group_id == Group.id)
-        .outerjoin(Word, and_(Word.id == WordGroup.word_id, Word.language_code == language_code))
-        .group_by(Group.id)
-    )
-
-    # Sorting logic
-    if sort_by:
-        if sort_by == "words_count":
-            column = func.count(Word.id)
-        else:
-            column = getattr(Group, sort_by)
-        if order == "desc":
-            column = column.desc()
-        query = query.order_by(column)
-
-    # Pagination
-    results = query.offset((page - 1) * per_page).limit(per_page).all()
 
-    # Build items list
-    items = []
-    for group, words_count in results:
-        group.words_count = words_count
-        items.append(group)
+        return {
+            "total": result_page.total,
+            "items": [
+                {"name": row.name, "id": row.id, "words_count": row.words_count}
+                for row in result_page.items
+            ],
+            "page": page,
+            "per_page": per_page,
+            "next_cursor": result_page.next_cursor
+        }
 
-    return {
-        "total": total,
-        "items": items,
-        "page": page,
-        "per_page": per_page
-    }
+    return FastJSONResponse(await run_db(db, run))
 
 @router.get("/groups/{group_id}", response_model=GroupDetail)
-def get_group(
+@cached("groups", "word_groups", "words")
+async def get_group(
     group_id: int,
     page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1),
-    sort_by: Optional[str] = Query(None, description="Field to sort words by"),
-    order: Optional[str] = Query("asc", description="Sort order (asc or desc)"),
-    db: Session = Depends(get_db)
+    per_page: int = Query(10, ge=1, le=MAX_PER_PAGE),
+    sort_by: Optional[str] = Query(
+        None,
+        pattern="^(id|script|transliteration|meaning|correct_count|wrong_count)$",
+        description="Field to sort words by"
+    ),
+    order: Optional[str] = Query("asc", pattern="^(asc|desc)$", description="Sort order (asc or desc)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    db: DbSession = Depends(get_db)
 ):
     """
     Retrieves detailed information about a specific group and its words.
     The language context is derived from the group itself.
     """
-    # First check if group exists
-    group = db.query(Group).filter(Group.id == group_id).first()
-    if not group:
-        raise HTTPException(status_code=404, detail=f"Group with id {group_id} not found")
+    def run(db: Session):
+        # First check if group exists
+        group = db.query(Group.name, Group.words_count, Group.language_code).filter(Group.id == group_id).first()
+        if not group:
+            raise HTTPException(status_code=404, detail=f"Group with id {group_id} not found")
 
-    # Get words count for this group's language
-    words_count = (
-        db.query(func.count(Word.id))
-        .join(WordGroup, WordGroup.word_id == Word.id)
-        .filter(
-            WordGroup.group_id == group_id,
-            Word.language_code == group.language_code
+        # Query words with their stats (counters are stored on the word)
+        query = (
+            db.query(Word.id, Word.script, Word.transliteration, Word.meaning, Word.correct_count, Word.wrong_count)
+            .join(WordGroup, WordGroup.word_id == Word.id)
+            .filter(
+                WordGroup.group_id == group_id,
+                Word.language_code == group.language_code
+            )
         )
-        .scalar()
-    )
 
-    # Query words with their stats
-    query = (
-        db.query(
-            Word,
-            func.count(case((WordReviewItem.correct == True, 1))).label("correct_count"),
-            func.count(case((WordReviewItem.correct == False, 1))).label("wrong_count")
-        )
-        .join(WordGroup, WordGroup.word_id == Word.id)
-        .filter(
-            WordGroup.group_id == group_id,
-            Word.language_code == group.language_code
-        )
-        .outerjoin(WordReviewItem, WordReviewItem.word_id == Word.id)
-        .group_by(Word.id)
-    )
-
-    # Apply sorting
-    if sort_by:
-        if sort_by in ["correct_count", "wrong_count"]:
-            column = text(sort_by)
-            if order == "desc":
-                query = query.order_by(desc(column))
-            else:
-                query = query.order_by(column)
+        # Apply sorting and pagination (NULL transliterations sort as "" to keep the order total)
+        if sort_by == "transliteration":
+            sort_column = func.coalesce(Word.transliteration, "")
         else:
-            column = getattr(Word, sort_by)
-            if order == "desc":
-                column = column.desc()
-            query = query.order_by(column)
+            sort_column = getattr(Word, sort_by) if sort_by else None
+
+        def row_key(row):
+            value = getattr(row, sort_by) if sort_by else None
+            if sort_by == "transliteration":
+                value = value or ""
+            return value, row.id
 
-    # Apply pagination
-    results = query.offset((page - 1) * per_page).limit(per_page).all()
+        result_page = paginate(
+            query,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            sort_column=sort_column,
+            id_column=Word.id,
+            descending=order == "desc",
+            sort_by=sort_by,
+            row_key=row_key
+        )
 
-    # Build items list
-    items = []
-    for word, correct_count, wrong_count in results:
-        word_dict = {
-            "id": word.id,
-            "script": word.script,
-            "transliteration": word.transliteration,
-            "meaning": word.meaning,
-            "stats": {
-                "correct_count": correct_count,
-                "wrong_count": wrong_count
+        # Build items list
+        items = [
+            {
+                "id": row.id,
+                "script": row.script,
+                "transliteration": row.transliteration,
+                "meaning": row.meaning,
+                "stats": {
+                    "correct_count": row.correct_count,
+                    "wrong_count": row.wrong_count
+                }
             }
-        }
-        items.append(word_dict)
+            for row in result_page.items
+        ]
 
-    return {
-        "id": group.id,
-        "name": group.name,
-        "words_count": words_count,
-        "words": {
-            "items": items,
-            "page": page,
-            "per_page": per_page
+        return {
+            "name": group.name,
+            "id": group_id,
+            "words_count": group.words_count,
+            "words": {
+                "items": items,
+                "page": page,
+                "per_page": per_page,
+                "next_cursor": result_page.next_cursor
+            }
         }
-    }
\ No newline at end of file
+
+    return FastJSONResponse(await run_db(db, run))
@@ -1,18 +1,24 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
-from app.main import get_db
+from app.cache import CachedRoute, cached
+from app.database import DbSession, run_db
+from app.dependencies import get_db
 from app.models import Language
 from app.schemas import Language as LanguageSchema
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 @router.get("/languages", response_model=List[LanguageSchema])
-def get_languages(
+@cached("languages")
+async def get_languages(
     active: bool | None = Query(None),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    query = db.query(Language)
-    if active is not None:
-        query = query.filter(Language.active == active)
-    return query.all() 
\ No newline at end of file
+    def run(db: Session):
+        query = db.query(Language)
+        if active is not None:
+            query = query.filter(Language.active == active)
+        return query.all() 
+
+    return await run_db(db, run)
\ No newline at end of file
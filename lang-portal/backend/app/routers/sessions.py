@@ -1,185 +1,334 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import List
-from app.main import get_db
-from app.models import StudySession as StudySessionModel, WordReviewItem as WordReviewModel, Group, Word
+from sqlalchemy import func, desc, insert
+from typing import Annotated, List, Optional
+from app.cache import invalidate
+from app.database import DbSession, run_db
+from app.dependencies import get_db
+from app.utils.pagination import MAX_PER_PAGE, paginate
+from app.models import (
+    StudySession as StudySessionModel, WordReviewItem as WordReviewModel, Group, ReviewSchedule, StudyActivity, Word,
+    WordGroup
+)
 from app.schemas import (
     StudySessionCreate, StudySession, StudySessionDetail,
-    PaginatedStudySessions, WordReviewCreate, WordReview
+    PaginatedStudySessions, WordReviewCreate, WordReview, DueWord
 )
+from app.responses import FastJSONResponse
+from app.utils.scheduler import apply_reviews
 
 router = APIRouter()
 
+# Upper bound on the number of reviews accepted by one batch request
+MAX_BATCH_REVIEWS = 500
+
+# Upper bound on the number of due words returned by /study-sessions/{id}/next
+MAX_NEXT_WORDS = 100
+
+def session_rows(db: Session):
+    """Query of sessions as named rows with their group, activity and review stats, one row per session."""
+    return db.query(
+        StudySessionModel.id,
+        StudySessionModel.created_at,
+        Group.id.label("group_id"),
+        Group.name.label("group_name"),
+        StudyActivity.id.label("activity_id"),
+        StudyActivity.name.label("activity_name"),
+        func.max(WordReviewModel.created_at).label("last_review_at"),
+        func.count(WordReviewModel.id).label("reviews_count")
+    ).join(
+        StudySessionModel.group
+    ).join(
+        StudySessionModel.activity
+    ).outerjoin(
+        WordReviewModel,
+        WordReviewModel.study_session_id == StudySessionModel.id
+    ).group_by(
+        StudySessionModel.id,
+        Group.id,
+        StudyActivity.id
+    )
+
+def session_item(row) -> dict:
+    """A row of session_rows in the shape of schemas.StudySessionDetail."""
+    return {
+        "id": row.id,
+        "group": {"id": row.group_id, "name": row.group_name},
+        "activity": {"id": row.activity_id, "name": row.activity_name},
+        "created_at": row.created_at,
+        "last_review_at": row.last_review_at,
+        "reviews_count": row.reviews_count
+    }
+
 @router.post("/study-sessions", response_model=StudySession)
-def create_study_session(
+async def create_study_session(
     session: StudySessionCreate,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Create a new study session."""
-    # Verify that the group exists
-    group = db.query(Group).filter(Group.id == session.group_id).first()
-    if not group:
-        raise HTTPException(status_code=404, detail=f"Group with id {session.group_id} not found")
-    
-    # Create the session
-    db_session = StudySessionModel(
-        group_id=session.group_id,
-        study_activity_id=session.study_activity_id
-    )
-    db.add(db_session)
-    db.commit()
-    db.refresh(db_session)
-    
-    # Convert to response format with ISO formatted datetime
-    return {
-        "id": db_session.id,
-        "group": db_session.group,
-        "activity": db_session.activity,
-        "created_at": db_session.created_at.isoformat()
-    }
+    def run(db: Session):
+        # Verify that the group exists
+        group = db.query(Group).filter(Group.id == session.group_id).first()
+        if not group:
+            raise HTTPException(status_code=404, detail=f"Group with id {session.group_id} not found")
+
+        # Create the session
+        db_session = StudySessionModel(
+            group_id=session.group_id,
+            study_activity_id=session.study_activity_id
+        )
+        db.add(db_session)
+        db.commit()
+        db.refresh(db_session)
+
+        # Convert to response format with ISO formatted datetime
+        return {
+            "id": db_session.id,
+            "group": db_session.group,
+            "activity": db_session.activity,
+            "created_at": db_session.created_at.isoformat()
+        }
+
+    created = await run_db(db, run)
+    await invalidate("study_sessions", "daily_activity")
+    return created
 
 @router.post("/study-sessions/{session_id}/reviews", response_model=WordReview)
-def create_word_review(
+async def create_word_review(
     session_id: int,
     review: WordReviewCreate,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Record a word review result for the given study session."""
-    # Verify that the session exists
-    session = db.query(StudySessionModel).filter(StudySessionModel.id == session_id).first()
-    if not session:
-        raise HTTPException(status_code=404, detail=f"Study session with id {session_id} not found")
-    
-    # Verify that the word exists and belongs to the session's group
-    word = db.query(Word).join(
-        Word.groups
-    ).filter(
-        Word.id == review.word_id,
-        Group.id == session.group_id
-    ).first()
-    if not word:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Word with id {review.word_id} not found or does not belong to the session's group"
+    def run(db: Session):
+        # Verify that the session exists
+        session = db.query(StudySessionModel).filter(StudySessionModel.id == session_id).first()
+        if not session:
+            raise HTTPException(status_code=404, detail=f"Study session with id {session_id} not found")
+
+        # Verify that the word exists and belongs to the session's group
+        word = db.query(Word).join(
+            Word.groups
+        ).filter(
+            Word.id == review.word_id,
+            Group.id == session.group_id
+        ).first()
+        if not word:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Word with id {review.word_id} not found or does not belong to the session's group"
+            )
+
+        # Create the review
+        db_review = WordReviewModel(
+            word_id=review.word_id,
+            study_session_id=session_id,
+            correct=review.correct
         )
-    
-    # Create the review
-    db_review = WordReviewModel(
-        word_id=review.word_id,
-        study_session_id=session_id,
-        correct=review.correct
-    )
-    db.add(db_review)
-    db.commit()
-    db.refresh(db_review)
-    
-    # Get all needed data while session is active
-    review_data = {
-        "id": db_review.id,
-        "word_id": db_review.word_id,
-        "study_session_id": db_review.study_session_id,
-        "correct": db_review.correct,
-        "created_at": db_review.created_at.isoformat()
-    }
-    
-    return review_data
+        db.add(db_review)
+        db.flush()
+
+        # Reschedule the word in the session's group, in the review's transaction
+        apply_reviews(db, session.group_id, [(db_review.word_id, db_review.correct, db_review.created_at)])
+        db.commit()
+        db.refresh(db_review)
+
+        # Get all needed data while session is active
+        review_data = {
+            "id": db_review.id,
+            "word_id": db_review.word_id,
+            "study_session_id": db_review.study_session_id,
+            "correct": db_review.correct,
+            "created_at": db_review.created_at.isoformat()
+        }
+
+        return review_data
+
+    created = await run_db(db, run)
+    # Reviews update the words' counters and the daily rollup through triggers
+    await invalidate("word_review_items", "words", "daily_activity", "review_schedules")
+    return created
+
+@router.post("/study-sessions/{session_id}/reviews:batch", response_model=List[WordReview])
+async def create_word_reviews_batch(
+    session_id: int,
+    reviews: Annotated[List[WordReviewCreate], Body(min_length=1, max_length=MAX_BATCH_REVIEWS)],
+    db: DbSession = Depends(get_db)
+):
+    """Record several word review results for the given study session in one transaction."""
+    def run(db: Session):
+        # Verify that the session exists
+        group_id = db.query(StudySessionModel.group_id).filter(StudySessionModel.id == session_id).scalar()
+        if group_id is None:
+            raise HTTPException(status_code=404, detail=f"Study session with id {session_id} not found")
+
+        # Verify that every word belongs to the session's group with a single IN query
+        word_ids = {review.word_id for review in reviews}
+        member_ids = {
+            word_id for (word_id,) in db.query(WordGroup.word_id).filter(
+                WordGroup.group_id == group_id,
+                WordGroup.word_id.in_(word_ids)
+            )
+        }
+        missing_ids = sorted(word_ids - member_ids)
+        if missing_ids:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Words with ids {missing_ids} not found or do not belong to the session's group"
+            )
+
+        # Bulk insert the reviews, reading generated ids and timestamps back with RETURNING
+        rows = db.execute(
+            insert(WordReviewModel).returning(
+                WordReviewModel.id,
+                WordReviewModel.word_id,
+                WordReviewModel.study_session_id,
+                WordReviewModel.correct,
+                WordReviewModel.created_at,
+                sort_by_parameter_order=True
+            ),
+            [
+                {"word_id": review.word_id, "study_session_id": session_id, "correct": review.correct}
+                for review in reviews
+            ]
+        ).all()
+        apply_reviews(db, group_id, [(row.word_id, row.correct, row.created_at) for row in rows])
+        db.commit()
+
+        return [
+            {
+                "id": row.id,
+                "word_id": row.word_id,
+                "study_session_id": row.study_session_id,
+                "correct": row.correct,
+                "created_at": row.created_at.isoformat()
+            }
+            for row in rows
+        ]
+
+    created = await run_db(db, run)
+    # Reviews update the words' counters and the daily rollup through triggers
+    await invalidate("word_review_items", "words", "daily_activity", "review_schedules")
+    return created
+
+@router.get("/study-sessions/{session_id}/next", response_model=List[DueWord])
+async def get_next_words(
+    session_id: int,
+    limit: int = Query(20, ge=1, le=MAX_NEXT_WORDS),
+    db: DbSession = Depends(get_db)
+):
+    """Get the next words due for review in the session's group, most overdue first."""
+    def run(db: Session):
+        group_id = db.query(StudySessionModel.group_id).filter(StudySessionModel.id == session_id).scalar()
+        if group_id is None:
+            raise HTTPException(status_code=404, detail=f"Study session with id {session_id} not found")
+
+        # Range scan of ix_review_schedules_group_id_due_at_word_id, already in due order
+        rows = db.query(
+            Word.id,
+            Word.script,
+            Word.transliteration,
+            Word.meaning,
+            ReviewSchedule.due_at,
+            ReviewSchedule.interval_days,
+            ReviewSchedule.ease,
+            ReviewSchedule.repetitions
+        ).join(
+            ReviewSchedule,
+            ReviewSchedule.word_id == Word.id
+        ).filter(
+            ReviewSchedule.group_id == group_id,
+            ReviewSchedule.due_at <= datetime.utcnow()
+        ).order_by(
+            ReviewSchedule.due_at,
+            ReviewSchedule.word_id
+        ).limit(limit).all()
+
+        return [row._asdict() for row in rows]
+
+    return FastJSONResponse(await run_db(db, run))
 
 @router.get("/study-sessions", response_model=PaginatedStudySessions)
-def get_study_sessions(
+async def get_study_sessions(
     language_code: str,
     page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1, le=100),
+    per_page: int = Query(10, ge=1, le=MAX_PER_PAGE),
     sort_by: str = Query("created_at", pattern="^(created_at|last_review_at|reviews_count)$"),
     order: str = Query("desc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set to false to skip counting the total (e.g. for infinite scroll)"),
+    db: DbSession = Depends(get_db)
 ):
     """Get a paginated list of study sessions for the specified language."""
-    # Build base query
-    sessions_query = db.query(
-        StudySessionModel,
-        func.max(WordReviewModel.created_at).label("last_review_at"),
-        func.count(WordReviewModel.id).label("reviews_count")
-    ).join(
-        StudySessionModel.group
-    ).outerjoin(
-        WordReviewModel,
-        WordReviewModel.study_session_id == StudySessionModel.id
-    ).filter(
-        StudySessionModel.group.has(language_code=language_code)
-    ).group_by(
-        StudySessionModel.id
-    )
-    
-    # Apply sorting
-    if sort_by == "created_at":
-        sort_column = StudySessionModel.created_at
-    elif sort_by == "last_review_at":
-        sort_column = func.max(WordReviewModel.created_at)
-    else:  # reviews_count
-        sort_column = func.count(WordReviewModel.id)
-    
-    if order == "desc":
-        sessions_query = sessions_query.order_by(desc(sort_column))
-    else:
-        sessions_query = sessions_query.order_by(sort_column)
-    
-    # Get total count
-    total = sessions_query.count()
-    
-    # Apply pagination
-    sessions = sessions_query.offset((page - 1) * per_page).limit(per_page).all()
-    
-    # Convert to response format
-    session_items = []
-    for session, last_review_at, reviews_count in sessions:
-        session_detail = StudySessionDetail(
-            id=session.id,
-            group=session.group,
-            activity=session.activity,
-            created_at=session.created_at.isoformat(),
-            last_review_at=last_review_at.isoformat() if last_review_at else None,
-            reviews_count=reviews_count
+    def run(db: Session):
+        # Build base query; group and activity names come from the same query
+        sessions_query = session_rows(db).filter(Group.language_code == language_code)
+
+        # Ungrouped base query (one row per session) for the total count
+        count_query = db.query(StudySessionModel).join(
+            StudySessionModel.group
+        ).filter(
+            Group.language_code == language_code
         )
-        session_items.append(session_detail)
-    
-    return PaginatedStudySessions(
-        total=total,
-        items=session_items,
-        page=page,
-        per_page=per_page
-    )
+
+        # Apply sorting and pagination; created_at is a column and supports cursors,
+        # the review aggregates can only be paged by offset
+        if sort_by == "created_at":
+            result_page = paginate(
+                sessions_query,
+                page=page,
+                per_page=per_page,
+                count_query=count_query,
+                include_total=include_total,
+                cursor=cursor,
+                sort_column=StudySessionModel.created_at,
+                id_column=StudySessionModel.id,
+                descending=order == "desc",
+                sort_by=sort_by,
+                row_key=lambda row: (row.created_at, row.id)
+            )
+        else:
+            if sort_by == "last_review_at":
+                sort_column = func.max(WordReviewModel.created_at)
+            else:  # reviews_count
+                sort_column = func.count(WordReviewModel.id)
+
+            if order == "desc":
+                sessions_query = sessions_query.order_by(desc(sort_column), desc(StudySessionModel.id))
+            else:
+                sessions_query = sessions_query.order_by(sort_column, StudySessionModel.id)
+            result_page = paginate(
+                sessions_query,
+                page=page,
+                per_page=per_page,
+                count_query=count_query,
+                include_total=include_total,
+                cursor=cursor
+            )
+
+        return {
+            "total": result_page.total,
+            "items": [session_item(row) for row in result_page.items],
+            "page": page,
+            "per_page": per_page,
+            "next_cursor": result_page.next_cursor
+        }
+
+    return FastJSONResponse(await run_db(db, run))
 
 @router.get("/study-sessions/{session_id}", response_model=StudySessionDetail)
-def get_study_session(
+async def get_study_session(
     session_id: int,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """Get detailed information about a specific study session."""
-    # Get session with review statistics
-    session_data = db.query(
-        StudySessionModel,
-        func.max(WordReviewModel.created_at).label("last_review_at"),
-        func.count(WordReviewModel.id).label("reviews_count")
-    ).outerjoin(
-        WordReviewModel,
-        WordReviewModel.study_session_id == StudySessionModel.id
-    ).filter(
-        StudySessionModel.id == session_id
-    ).group_by(
-        StudySessionModel.id
-    ).first()
-    
-    if not session_data:
-        raise HTTPException(status_code=404, detail=f"Study session with id {session_id} not found")
-    
-    session, last_review_at, reviews_count = session_data
-    
-    return StudySessionDetail(
-        id=session.id,
-        group=session.group,
-        activity=session.activity,
-        created_at=session.created_at.isoformat(),
-        last_review_at=last_review_at.isoformat() if last_review_at else None,
-        reviews_count=reviews_count
-    ) 
\ No newline at end of file
+    def run(db: Session):
+        # Get session with its group, activity and review statistics in one query
+        row = session_rows(db).filter(StudySessionModel.id == session_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Study session with id {session_id} not found")
+
+        return session_item(row)
+
+    return FastJSONResponse(await run_db(db, run))
\ No newline at end of file
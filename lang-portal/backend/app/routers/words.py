@@ -1,108 +1,225 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from typing import Optional
-from app.main import get_db
-from app.models import Word, WordReviewItem
-from app.schemas import PaginatedWords, WordDetail
-from sqlalchemy import func, case, text, desc
+from app.database import DbSession, run_db
+from app.dependencies import get_db
+from app.models import Word, WordDifficulty
+from app.responses import FastJSONResponse
+from app.schemas import HardestWords, PaginatedWords, WordDetail
+from app.utils.difficulty import MAX_HARDEST_WORDS, WINDOWS
+from app.utils.pagination import MAX_PER_PAGE, paginate
+from app.utils.search import TS_CONFIG, build_match_query, build_tsquery, words_fts, words_fts_rank, words_fts_ts_rank
+from sqlalchemy import func
 
 router = APIRouter()
 
+# Columns of a listed word; list routes select them instead of Word entities
+WORD_LIST_COLUMNS = (Word.id, Word.script, Word.transliteration, Word.meaning, Word.correct_count, Word.wrong_count)
+
+def _word_item(row) -> dict:
+    """A listed word with its review stats, in the field order of schemas.Word."""
+    return {
+        "script": row.script,
+        "transliteration": row.transliteration,
+        "meaning": row.meaning,
+        "id": row.id,
+        "stats": {
+            "correct_count": row.correct_count,
+            "wrong_count": row.wrong_count
+        }
+    }
+
 @router.get("/words", response_model=PaginatedWords)
-def get_words(
-    db: Session = Depends(get_db),
+async def get_words(
+    db: DbSession = Depends(get_db),
     page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1),
-    sort_by: Optional[str] = None,
-    order: Optional[str] = "asc",
+    per_page: int = Query(10, ge=1, le=MAX_PER_PAGE),
+    sort_by: Optional[str] = Query(None, pattern="^(id|script|transliteration|meaning|correct_count|wrong_count)$"),
+    order: Optional[str] = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set to false to skip counting the total (e.g. for infinite scroll)"),
     language_code: str = Query(..., description="ISO 639-1 code of the language"),
 ):
-    query = db.query(Word, 
-        func.count(case((WordReviewItem.correct == True, 1))).label("correct_count"),
-        func.count(case((WordReviewItem.correct == False, 1))).label("wrong_count")
-    )
-
-    # Filter by language (required)
-    query = query.filter(Word.language_code == language_code)
-    
-    # Add correct/wrong counts
-    query = query.outerjoin(WordReviewItem).group_by(Word.id)
-
-    # Apply sorting
-    if sort_by:
-        if sort_by in ["correct_count", "wrong_count"]:
-            column = text(sort_by)
-            if order == "desc":
-                column = desc(column)
+    def run(db: Session):
+        # Review counters are stored on the word itself, so no join on word_review_items is needed
+        query = db.query(*WORD_LIST_COLUMNS)
+
+        # Filter by language (required)
+        query = query.filter(Word.language_code == language_code)
+
+        # Apply sorting and pagination; words are ordered by (sort column, id) so any page
+        # can be continued from a cursor. Transliteration is optional, so NULLs sort as ""
+        # to keep the order total.
+        if sort_by == "transliteration":
+            sort_column = func.coalesce(Word.transliteration, "")
         else:
-            column = getattr(Word, sort_by)
-            if order == "desc":
-                column = column.desc()
-        query = query.order_by(column)
-
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    results = query.offset((page - 1) * per_page).limit(per_page).all()
-    
-    # Convert results to Word objects with stats
-    items = []
-    for word, correct, wrong in results:
-        word_dict = {
-            "id": word.id,
-            "script": word.script,
-            "transliteration": word.transliteration,
-            "meaning": word.meaning,
-            "stats": {
-                "correct_count": correct,
-                "wrong_count": wrong
-            }
+            sort_column = getattr(Word, sort_by) if sort_by else None
+
+        def row_key(row):
+            value = getattr(row, sort_by) if sort_by else None
+            if sort_by == "transliteration":
+                value = value or ""
+            return value, row.id
+
+        result_page = paginate(
+            query,
+            page=page,
+            per_page=per_page,
+            count_query=query,
+            include_total=include_total,
+            cursor=cursor,
+            sort_column=sort_column,
+            id_column=Word.id,
+            descending=order == "desc",
+            sort_by=sort_by,
+            row_key=row_key
+        )
+
+        return {
+            "total": result_page.total,
+            "items": [_word_item(row) for row in result_page.items],
+            "page": page,
+            "per_page": per_page,
+            "next_cursor": result_page.next_cursor
         }
-        items.append(word_dict)
-    
-    return {
-        "total": total,
-        "items": items,
-        "page": page,
-        "per_page": per_page
-    }
+
+    return FastJSONResponse(await run_db(db, run))
+
+@router.get("/words/search", response_model=PaginatedWords)
+async def search_words(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms, each matched as a word prefix"),
+    language_code: str = Query(..., description="ISO 639-1 code of the language"),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(10, ge=1, le=MAX_PER_PAGE),
+    include_total: bool = Query(True, description="Set to false to skip counting the total"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Searches the script, transliteration and meaning of a language's words, best matches first.
+    Every term must match the start of a word; case and diacritics are ignored.
+    """
+    def run(db: Session):
+        postgresql = db.get_bind().dialect.name == "postgresql"
+        match = build_tsquery(q) if postgresql else build_match_query(q, language_code)
+        if match is None:
+            # Only punctuation or whitespace: nothing can match
+            return {"total": 0, "items": [], "page": page, "per_page": per_page, "next_cursor": None}
+
+        query = db.query(*WORD_LIST_COLUMNS).join(words_fts, words_fts.c.rowid == Word.id)
+        if postgresql:
+            tsquery = func.to_tsquery(TS_CONFIG, match)
+            query = query.filter(words_fts.c.language_code == language_code, words_fts.c.document.op("@@")(tsquery))
+            rank = words_fts_ts_rank(tsquery).desc()
+        else:
+            query = query.filter(words_fts.c.words_fts.op("MATCH")(match))
+            rank = words_fts_rank
+        result_page = paginate(
+            query.order_by(rank, Word.id),
+            page=page,
+            per_page=per_page,
+            count_query=query,
+            include_total=include_total
+        )
+
+        return {
+            "total": result_page.total,
+            "items": [_word_item(row) for row in result_page.items],
+            "page": page,
+            "per_page": per_page,
+            "next_cursor": None
+        }
+
+    return FastJSONResponse(await run_db(db, run))
+
+@router.get("/words/hardest", response_model=HardestWords)
+async def get_hardest_words(
+    language_code: str = Query(..., description="ISO 639-1 code of the language"),
+    window_days: int = Query(30, description=f"Days of reviews the ranking is computed over: one of {', '.join(map(str, WINDOWS))}"),
+    limit: int = Query(10, ge=1, le=MAX_HARDEST_WORDS),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Lists the words most often answered wrong in the last window_days, recent mistakes weighing more.
+    The ranking is refreshed periodically (see app.utils.difficulty), so new reviews show up with a delay.
+    """
+    # Only these windows are materialized
+    if window_days not in WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window_days must be one of {', '.join(map(str, WINDOWS))}")
+
+    def run(db: Session):
+        # The ranking is materialized: this reads the first limit rows of its primary key
+        rows = db.query(
+            Word.id,
+            Word.script,
+            Word.transliteration,
+            Word.meaning,
+            WordDifficulty.rank,
+            WordDifficulty.error_rate,
+            WordDifficulty.reviews,
+            WordDifficulty.wrong,
+            WordDifficulty.refreshed_at
+        ).join(
+            Word,
+            Word.id == WordDifficulty.word_id
+        ).filter(
+            WordDifficulty.language_code == language_code,
+            WordDifficulty.window_days == window_days,
+            WordDifficulty.rank <= limit
+        ).order_by(
+            WordDifficulty.rank
+        ).all()
+
+        return {
+            "window_days": window_days,
+            "refreshed_at": rows[0].refreshed_at.isoformat() if rows else None,
+            "items": [
+                {
+                    "id": row.id,
+                    "script": row.script,
+                    "transliteration": row.transliteration,
+                    "meaning": row.meaning,
+                    "rank": row.rank,
+                    "error_rate": row.error_rate,
+                    "reviews": row.reviews,
+                    "wrong": row.wrong
+                }
+                for row in rows
+            ]
+        }
+
+    return FastJSONResponse(await run_db(db, run))
 
 @router.get("/words/{word_id}", response_model=WordDetail)
-def get_word(
+async def get_word(
     word_id: int,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """
     Retrieves detailed information about a specific word, including its groups and review statistics.
     """
-    # Query word with stats and groups
-    result = (
-        db.query(
-            Word,
-            func.count(case((WordReviewItem.correct == True, 1))).label("correct_count"),
-            func.count(case((WordReviewItem.correct == False, 1))).label("wrong_count")
+    def run(db: Session):
+        # Query word with stats and groups
+        word = (
+            db.query(Word)
+            .options(joinedload(Word.groups))  # Eager load groups
+            .filter(Word.id == word_id)
+            .first()
         )
-        .outerjoin(WordReviewItem)
-        .options(joinedload(Word.groups))  # Eager load groups
-        .filter(Word.id == word_id)
-        .group_by(Word.id)
-        .first()
-    )
-
-    if not result:
-        raise HTTPException(status_code=404, detail=f"Word with id {word_id} not found")
-
-    word, correct_count, wrong_count = result
-    # Format response according to spec
-    return {
-        "id": word.id,
-        "script": word.script,
-        "transliteration": word.transliteration,
-        "meaning": word.meaning,
-        "stats": {
-            "correct_count": correct_count,
-            "wrong_count": wrong_count
-        },
-        "groups": [{"id": g.id, "name": g.name} for g in word.groups]
-    } 
\ No newline at end of file
+
+        if not word:
+            raise HTTPException(status_code=404, detail=f"Word with id {word_id} not found")
+
+        # Format response according to spec
+        return {
+            "id": word.id,
+            "script": word.script,
+            "transliteration": word.transliteration,
+            "meaning": word.meaning,
+            "stats": {
+                "correct_count": word.correct_count,
+                "wrong_count": word.wrong_count
+            },
+            "groups": [{"id": g.id, "name": g.name} for g in word.groups]
+        } 
+
+    return await run_db(db, run)
\ No newline at end of file
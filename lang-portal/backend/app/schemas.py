@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
 # Word schemas
@@ -23,10 +23,11 @@ class Word(WordBase):
     model_config = ConfigDict(from_attributes=True)
 
 class PaginatedWords(BaseModel):
-    total: int
+    total: Optional[int]  # None when the client passed include_total=false
     items: List[Word]
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 class LanguageBase(BaseModel):
     code: str
@@ -45,15 +46,16 @@ class GroupCreate(GroupBase):
 
 class Group(GroupBase):
     id: int
-    words_count: int  # Computed field, not stored
+    words_count: int  # Stored on the group, kept current by triggers
 
     model_config = ConfigDict(from_attributes=True)
 
 class PaginatedGroups(BaseModel):
-    total: int
+    total: Optional[int]  # None when the client passed include_total=false
     items: List[Group]
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 class GroupInWord(BaseModel):
     id: int
@@ -81,6 +83,7 @@ class PaginatedGroupWords(BaseModel):
     items: List[WordInGroup]
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 class GroupDetail(GroupBase):
     id: int
@@ -137,10 +140,11 @@ class StudySessionDetail(StudySession):
     model_config = ConfigDict(from_attributes=True)
 
 class PaginatedStudySessions(BaseModel):
-    total: int
+    total: Optional[int]  # None when the client passed include_total=false
     items: List[StudySessionDetail]
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 # Study Activity with Sessions
 class StudyActivityWithSessions(StudyActivity):
@@ -162,6 +166,33 @@ class WordReview(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+# A word of a session's group that is due for review, with its spaced-repetition state
+class DueWord(BaseModel):
+    id: int
+    script: str
+    transliteration: Optional[str] = None
+    meaning: str
+    due_at: str
+    interval_days: int
+    ease: float
+    repetitions: int
+
+# A word of a language's hardest words, with its recency-weighted error rate over the window
+class HardWord(BaseModel):
+    id: int
+    script: str
+    transliteration: Optional[str] = None
+    meaning: str
+    rank: int
+    error_rate: float
+    reviews: int
+    wrong: int
+
+class HardestWords(BaseModel):
+    window_days: int
+    refreshed_at: Optional[str] = None
+    items: List[HardWord]
+
 # Dashboard schemas
 class LastStudySessionStats(BaseModel):
     correct_count: int
@@ -190,4 +221,25 @@ class QuickStats(BaseModel):
     active_groups: int
     study_streak: int
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class DashboardSummary(BaseModel):
+    last_session: Optional[LastStudySession]
+    progress: StudyProgress
+    quick_stats: QuickStats
+
+# Analytics schemas
+class ReviewBucket(BaseModel):
+    start: str
+    reviews: int
+    correct: int
+    accuracy: Optional[float] = None
+    distinct_words: int
+
+class ReviewAnalytics(BaseModel):
+    language_code: str
+    group_id: Optional[int] = None
+    bucket: str
+    from_: str = Field(alias="from")
+    to: str
+    items: List[ReviewBucket]
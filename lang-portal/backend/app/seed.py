@@ -1,215 +1,225 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models import Language, Word, Group, StudyActivity, WordGroup, StudySession, WordReviewItem, ActivityLanguageSupport
-from app.utils.db_utils import reset_database
+from app.utils.db_utils import reset_database, sync_id_sequences, triggers_disabled
+from app.utils.stats import rebuild_daily_activity, rebuild_progress_buckets, rebuild_word_stats
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable
 import random
+import time
+
+# Rows per executemany call in bulk mode
+BULK_BATCH_SIZE = 10000
+
+# Language codes used by the synthetic generator before falling back to generated ones
+SYNTHETIC_LANGUAGE_CODES = ["ja", "fr", "ar", "es", "zh", "ko", "ru", "de"]
 
 def seed_languages(db: Session):
     languages = [
-        Language(
+        dict(
             code="ja", 
             name="Japanese",
             promo_text="Explore the rich culture and language of Japan, from its ancient traditions to modern innovations."
         ),
-        Language(
+        dict(
             code="fr", 
             name="French",
             promo_text="Delve into the elegant language of France, known for its influence in art, cuisine, and diplomacy."
         ),
-        Language(
+        dict(
             code="ar", 
             name="Arabic",
             promo_text="Immerse yourself in the rich and diverse language of the Arab world, spoken by millions across continents."
         ),
-        Language(
+        dict(
             code="es", 
             name="Spanish",
             promo_text="Join the vibrant world of Spanish, a language of passion and history spoken by over 460 million people worldwide."
         ),
         # Inactive languages
-        Language(
+        dict(
             code="zh", 
             name="Chinese", 
             active=False,
             promo_text="Master the most spoken language in the world, with its unique characters and tonal system."
         ),
-        Language(
+        dict(
             code="ko", 
             name="Korean", 
             active=False,
             promo_text="Learn the language of K-pop and Korean dramas, with its logical writing system and rich cultural heritage."
         ),
-        Language(
+        dict(
             code="ru", 
             name="Russian", 
             active=False,
             promo_text="Discover the language of Tolstoy and Dostoevsky, spoken across the largest country in the world."
         ),
-        Language(
+        dict(
             code="de", 
             name="German", 
             active=False,
             promo_text="Learn the language of philosophers and scientists, known for its precision and compound words."
         ),
     ]
-    db.add_all(languages)
-    db.commit()
-    return languages
+    bulk_insert(db, Language, ({"active": True, **language} for language in languages))
+    return db.query(Language).all()
 
 def seed_words(db: Session):
     words = [
         # Japanese words
         # Core Verbs (kept essential ones)
-        Word(script="食べる", transliteration="taberu", meaning="to eat", language_code="ja"),
-        Word(script="飲む", transliteration="nomu", meaning="to drink", language_code="ja"),
-        Word(script="話す", transliteration="hanasu", meaning="to speak", language_code="ja"),
+        dict(script="食べる", transliteration="taberu", meaning="to eat", language_code="ja"),
+        dict(script="飲む", transliteration="nomu", meaning="to drink", language_code="ja"),
+        dict(script="話す", transliteration="hanasu", meaning="to speak", language_code="ja"),
         
         # Nouns - Objects
-        Word(script="本", transliteration="hon", meaning="book", language_code="ja"),
-        Word(script="電話", transliteration="denwa", meaning="telephone", language_code="ja"),
-        Word(script="鞄", transliteration="kaban", meaning="bag", language_code="ja"),
+        dict(script="本", transliteration="hon", meaning="book", language_code="ja"),
+        dict(script="電話", transliteration="denwa", meaning="telephone", language_code="ja"),
+        dict(script="鞄", transliteration="kaban", meaning="bag", language_code="ja"),
         
         # Nouns - Places
-        Word(script="学校", transliteration="gakkou", meaning="school", language_code="ja"),
-        Word(script="駅", transliteration="eki", meaning="station", language_code="ja"),
-        Word(script="公園", transliteration="kouen", meaning="park", language_code="ja"),
+        dict(script="学校", transliteration="gakkou", meaning="school", language_code="ja"),
+        dict(script="駅", transliteration="eki", meaning="station", language_code="ja"),
+        dict(script="公園", transliteration="kouen", meaning="park", language_code="ja"),
         
         # Adjectives
-        Word(script="大きい", transliteration="ookii", meaning="big", language_code="ja"),
-        Word(script="小さい", transliteration="chiisai", meaning="small", language_code="ja"),
-        Word(script="赤い", transliteration="akai", meaning="red", language_code="ja"),
-        Word(script="青い", transliteration="aoi", meaning="blue", language_code="ja"),
+        dict(script="大きい", transliteration="ookii", meaning="big", language_code="ja"),
+        dict(script="小さい", transliteration="chiisai", meaning="small", language_code="ja"),
+        dict(script="赤い", transliteration="akai", meaning="red", language_code="ja"),
+        dict(script="青い", transliteration="aoi", meaning="blue", language_code="ja"),
         
         # Numbers & Time
-        Word(script="一", transliteration="ichi", meaning="one", language_code="ja"),
-        Word(script="二", transliteration="ni", meaning="two", language_code="ja"),
-        Word(script="今日", transliteration="kyou", meaning="today", language_code="ja"),
-        Word(script="明日", transliteration="ashita", meaning="tomorrow", language_code="ja"),
+        dict(script="一", transliteration="ichi", meaning="one", language_code="ja"),
+        dict(script="二", transliteration="ni", meaning="two", language_code="ja"),
+        dict(script="今日", transliteration="kyou", meaning="today", language_code="ja"),
+        dict(script="明日", transliteration="ashita", meaning="tomorrow", language_code="ja"),
 
         # French words
         # Core Verbs (kept essential ones)
-        Word(script="manger", meaning="to eat", language_code="fr"),
-        Word(script="boire", meaning="to drink", language_code="fr"),
-        Word(script="parler", meaning="to speak", language_code="fr"),
+        dict(script="manger", meaning="to eat", language_code="fr"),
+        dict(script="boire", meaning="to drink", language_code="fr"),
+        dict(script="parler", meaning="to speak", language_code="fr"),
         
         # Nouns - Objects
-        Word(script="livre", meaning="book", language_code="fr"),
-        Word(script="téléphone", meaning="telephone", language_code="fr"),
-        Word(script="sac", meaning="bag", language_code="fr"),
+        dict(script="livre", meaning="book", language_code="fr"),
+        dict(script="téléphone", meaning="telephone", language_code="fr"),
+        dict(script="sac", meaning="bag", language_code="fr"),
         
         # Nouns - Places
-        Word(script="école", meaning="school", language_code="fr"),
-        Word(script="gare", meaning="station", language_code="fr"),
-        Word(script="parc", meaning="park", language_code="fr"),
+        dict(script="école", meaning="school", language_code="fr"),
+        dict(script="gare", meaning="station", language_code="fr"),
+        dict(script="parc", meaning="park", language_code="fr"),
         
         # Adjectives
-        Word(script="grand", meaning="big", language_code="fr"),
-        Word(script="petit", meaning="small", language_code="fr"),
-        Word(script="rouge", meaning="red", language_code="fr"),
-        Word(script="bleu", meaning="blue", language_code="fr"),
+        dict(script="grand", meaning="big", language_code="fr"),
+        dict(script="petit", meaning="small", language_code="fr"),
+        dict(script="rouge", meaning="red", language_code="fr"),
+        dict(script="bleu", meaning="blue", language_code="fr"),
         
         # Numbers & Time
-        Word(script="un", meaning="one", language_code="fr"),
-        Word(script="deux", meaning="two", language_code="fr"),
-        Word(script="aujourd'hui", meaning="today", language_code="fr"),
-        Word(script="demain", meaning="tomorrow", language_code="fr"),
+        dict(script="un", meaning="one", language_code="fr"),
+        dict(script="deux", meaning="two", language_code="fr"),
+        dict(script="aujourd'hui", meaning="today", language_code="fr"),
+        dict(script="demain", meaning="tomorrow", language_code="fr"),
 
         # Arabic words
         # Core Verbs (kept essential ones)
-        Word(script="يأكل", transliteration="ya'kul", meaning="to eat", language_code="ar"),
-        Word(script="يشرب", transliteration="yashrab", meaning="to drink", language_code="ar"),
-        Word(script="يتكلم", transliteration="yatakallam", meaning="to speak", language_code="ar"),
+        dict(script="يأكل", transliteration="ya'kul", meaning="to eat", language_code="ar"),
+        dict(script="يشرب", transliteration="yashrab", meaning="to drink", language_code="ar"),
+        dict(script="يتكلم", transliteration="yatakallam", meaning="to speak", language_code="ar"),
         
         # Nouns - Objects
-        Word(script="كتاب", transliteration="kitaab", meaning="book", language_code="ar"),
-        Word(script="هاتف", transliteration="haatif", meaning="telephone", language_code="ar"),
-        Word(script="حقيبة", transliteration="haqiba", meaning="bag", language_code="ar"),
+        dict(script="كتاب", transliteration="kitaab", meaning="book", language_code="ar"),
+        dict(script="هاتف", transliteration="haatif", meaning="telephone", language_code="ar"),
+        dict(script="حقيبة", transliteration="haqiba", meaning="bag", language_code="ar"),
         
         # Nouns - Places
-        Word(script="مدرسة", transliteration="madrasa", meaning="school", language_code="ar"),
-        Word(script="محطة", transliteration="mahatta", meaning="station", language_code="ar"),
-        Word(script="حديقة", transliteration="hadiqa", meaning="park", language_code="ar"),
+        dict(script="مدرسة", transliteration="madrasa", meaning="school", language_code="ar"),
+        dict(script="محطة", transliteration="mahatta", meaning="station", language_code="ar"),
+        dict(script="حديقة", transliteration="hadiqa", meaning="park", language_code="ar"),
         
         # Adjectives
-        Word(script="كبير", transliteration="kabir", meaning="big", language_code="ar"),
-        Word(script="صغير", transliteration="saghir", meaning="small", language_code="ar"),
-        Word(script="أحمر", transliteration="ahmar", meaning="red", language_code="ar"),
-        Word(script="أزرق", transliteration="azraq", meaning="blue", language_code="ar"),
+        dict(script="كبير", transliteration="kabir", meaning="big", language_code="ar"),
+        dict(script="صغير", transliteration="saghir", meaning="small", language_code="ar"),
+        dict(script="أحمر", transliteration="ahmar", meaning="red", language_code="ar"),
+        dict(script="أزرق", transliteration="azraq", meaning="blue", language_code="ar"),
         
         # Numbers & Time
-        Word(script="واحد", transliteration="wahid", meaning="one", language_code="ar"),
-        Word(script="اثنان", transliteration="ithnan", meaning="two", language_code="ar"),
-        Word(script="اليوم", transliteration="al-yawm", meaning="today", language_code="ar"),
-        Word(script="غدا", transliteration="ghadan", meaning="tomorrow", language_code="ar"),
+        dict(script="واحد", transliteration="wahid", meaning="one", language_code="ar"),
+        dict(script="اثنان", transliteration="ithnan", meaning="two", language_code="ar"),
+        dict(script="اليوم", transliteration="al-yawm", meaning="today", language_code="ar"),
+        dict(script="غدا", transliteration="ghadan", meaning="tomorrow", language_code="ar"),
 
         # Spanish words
         # Core Verbs (kept essential ones)
-        Word(script="comer", meaning="to eat", language_code="es"),
-        Word(script="beber", meaning="to drink", language_code="es"),
-        Word(script="hablar", meaning="to speak", language_code="es"),
+        dict(script="comer", meaning="to eat", language_code="es"),
+        dict(script="beber", meaning="to drink", language_code="es"),
+        dict(script="hablar", meaning="to speak", language_code="es"),
         
         # Nouns - Objects
-        Word(script="libro", meaning="book", language_code="es"),
-        Word(script="teléfono", meaning="telephone", language_code="es"),
-        Word(script="bolso", meaning="bag", language_code="es"),
+        dict(script="libro", meaning="book", language_code="es"),
+        dict(script="teléfono", meaning="telephone", language_code="es"),
+        dict(script="bolso", meaning="bag", language_code="es"),
         
         # Nouns - Places
-        Word(script="escuela", meaning="school", language_code="es"),
-        Word(script="estación", meaning="station", language_code="es"),
-        Word(script="parque", meaning="park", language_code="es"),
+        dict(script="escuela", meaning="school", language_code="es"),
+        dict(script="estación", meaning="station", language_code="es"),
+        dict(script="parque", meaning="park", language_code="es"),
         
         # Adjectives
-        Word(script="grande", meaning="big", language_code="es"),
-        Word(script="pequeño", meaning="small", language_code="es"),
-        Word(script="rojo", meaning="red", language_code="es"),
-        Word(script="azul", meaning="blue", language_code="es"),
+        dict(script="grande", meaning="big", language_code="es"),
+        dict(script="pequeño", meaning="small", language_code="es"),
+        dict(script="rojo", meaning="red", language_code="es"),
+        dict(script="azul", meaning="blue", language_code="es"),
         
         # Numbers & Time
-        Word(script="uno", meaning="one", language_code="es"),
-        Word(script="dos", meaning="two", language_code="es"),
-        Word(script="hoy", meaning="today", language_code="es"),
-        Word(script="mañana", meaning="tomorrow", language_code="es"),
+        dict(script="uno", meaning="one", language_code="es"),
+        dict(script="dos", meaning="two", language_code="es"),
+        dict(script="hoy", meaning="today", language_code="es"),
+        dict(script="mañana", meaning="tomorrow", language_code="es"),
         
         # Common Phrases (kept essential ones)
-        Word(script="おはよう", transliteration="ohayou", meaning="good morning", language_code="ja"),
-        Word(script="bonjour", meaning="good morning/hello", language_code="fr"),
-        Word(script="صباح الخير", transliteration="sabah al-khayr", meaning="good morning", language_code="ar"),
-        Word(script="buenos días", meaning="good morning", language_code="es"),
+        dict(script="おはよう", transliteration="ohayou", meaning="good morning", language_code="ja"),
+        dict(script="bonjour", meaning="good morning/hello", language_code="fr"),
+        dict(script="صباح الخير", transliteration="sabah al-khayr", meaning="good morning", language_code="ar"),
+        dict(script="buenos días", meaning="good morning", language_code="es"),
     ]
-    db.add_all(words)
-    db.commit()
-    return words
+    bulk_insert(db, Word, ({"transliteration": None, **word} for word in words))
+    return db.query(Word).order_by(Word.id).all()
 
 def seed_activities(db: Session):
     activities = [
-        StudyActivity(
+        dict(
             name="Flashcards",
             url="/study/flashcards",
             description="Practice vocabulary with interactive flashcards. Test your memory and track your progress.",
             image_url="/static/images/activities/flashcards.svg",
             is_language_specific=False  # Universal activity
         ),
-        StudyActivity(
+        dict(
             name="Typing Practice",
             url="/study/typing",
             description="Improve your typing skills in your target language. Practice with real sentences and words.",
             image_url="/static/images/activities/typing.svg",
             is_language_specific=True  # Language-specific (needs special character support)
         ),
-        StudyActivity(
+        dict(
             name="Multiple Choice",
             url="/study/quiz",
             description="Test your knowledge with multiple choice questions. A fun way to reinforce your learning.",
             image_url="/static/images/activities/quiz.svg",
             is_language_specific=False  # Universal activity
         ),
-        StudyActivity(
+        dict(
             name="Character Writing",
             url="/study/writing",
             description="Practice writing characters and get instant feedback on your strokes.",
             image_url="/static/images/activities/writing.svg",
             is_language_specific=True  # Only for languages with special writing systems
         ),
-        StudyActivity(
+        dict(
             name="Pronunciation",
             url="/study/pronunciation",
             description="Practice pronunciation with voice recognition technology.",
@@ -217,9 +227,8 @@ def seed_activities(db: Session):
             is_language_specific=True  # Language-specific audio features
         )
     ]
-    db.add_all(activities)
-    db.commit()
-    return activities
+    bulk_insert(db, StudyActivity, activities)
+    return db.query(StudyActivity).order_by(StudyActivity.id).all()
 
 def seed_activity_language_support(db: Session, activities: list, languages: list):
     """Set up which activities support which languages"""
@@ -231,7 +240,7 @@ def seed_activity_language_support(db: Session, activities: list, languages: lis
             if activity.name == "Typing Practice":
                 for lang in languages:
                     if lang.code in ["ja", "zh", "ko", "ar"]:
-                        supports.append(ActivityLanguageSupport(
+                        supports.append(dict(
                             activity_id=activity.id,
                             language_code=lang.code
                         ))
@@ -240,7 +249,7 @@ def seed_activity_language_support(db: Session, activities: list, languages: lis
             elif activity.name == "Character Writing":
                 for lang in languages:
                     if lang.code in ["ja", "zh"]:
-                        supports.append(ActivityLanguageSupport(
+                        supports.append(dict(
                             activity_id=activity.id,
                             language_code=lang.code
                         ))
@@ -249,14 +258,13 @@ def seed_activity_language_support(db: Session, activities: list, languages: lis
             elif activity.name == "Pronunciation":
                 for lang in languages:
                     if lang.active:
-                        supports.append(ActivityLanguageSupport(
+                        supports.append(dict(
                             activity_id=activity.id,
                             language_code=lang.code
                         ))
     
-    db.add_all(supports)
-    db.commit()
-    return supports
+    bulk_insert(db, ActivityLanguageSupport, supports)
+    return db.query(ActivityLanguageSupport).all()
 
 def seed_groups(db: Session, languages: list):
     """Create groups for each language"""
@@ -277,14 +285,13 @@ def seed_groups(db: Session, languages: list):
     for lang in languages:
         if lang.active:  # Only create groups for active languages
             for template in group_templates:
-                groups.append(Group(
+                groups.append(dict(
                     name=f"{template} ({lang.name})",
                     language_code=lang.code
                 ))
     
-    db.add_all(groups)
-    db.commit()
-    return groups
+    bulk_insert(db, Group, groups)
+    return db.query(Group).order_by(Group.id).all()
 
 def seed_word_groups(db: Session, words: list, groups: list):
     """Assign words to their appropriate language-specific groups"""
@@ -308,6 +315,7 @@ def seed_word_groups(db: Session, words: list, groups: list):
         groups_map[lang_code][template] = group
     
     # Assign words to groups based on their characteristics
+    links = []
     for lang_code, lang_words in words_by_lang.items():
         if lang_code not in groups_map:
             continue  # Skip inactive languages
@@ -345,10 +353,10 @@ def seed_word_groups(db: Session, words: list, groups: list):
             if any(term in word.meaning.lower() for term in ["eat", "drink", "water", "coffee", "bread", "tea", "rice", "meal", "food", "beverage"]):
                 word_groups.add(lang_groups["Food & Drink"])
             
-            # Add all groups to the word
-            word.groups.extend(word_groups)
+            # Link the word to all its groups
+            links.extend({"word_id": word.id, "group_id": group.id} for group in word_groups)
     
-    db.commit()
+    bulk_insert(db, WordGroup, links)
 
 def seed_test_activity_data(db: Session, words: list, groups: list, activities: list):
     """Create specific test scenarios for word reviews.
@@ -382,12 +390,12 @@ def seed_test_activity_data(db: Session, words: list, groups: list, activities:
     ja_common_phrases = get_group("Common Phrases", "ja")
     
     # Create sessions
-    sessions["ja_core"] = StudySession(
+    sessions["ja_core"] = dict(
         group_id=ja_core_verbs.id,
         study_activity_id=flashcards_activity.id,
         created_at=datetime.now() - timedelta(days=1)
     )
-    sessions["ja_phrases"] = StudySession(
+    sessions["ja_phrases"] = dict(
         group_id=ja_common_phrases.id,
         study_activity_id=flashcards_activity.id,
         created_at=datetime.now() - timedelta(days=2)
@@ -395,21 +403,22 @@ def seed_test_activity_data(db: Session, words: list, groups: list, activities:
     
     # French test scenarios
     fr_core_verbs = get_group("Core Verbs", "fr")
-    sessions["fr_core"] = StudySession(
+    sessions["fr_core"] = dict(
         group_id=fr_core_verbs.id,
         study_activity_id=flashcards_activity.id,
         created_at=datetime.now() - timedelta(days=1)
     )
     
-    db.add_all(sessions.values())
-    db.flush()
+    # The sessions get their ids in insertion order
+    bulk_insert(db, StudySession, sessions.values())
+    sessions = dict(zip(sessions, db.query(StudySession).order_by(StudySession.id).all()))
     
     # Helper function to create reviews
     def create_reviews(word_id: int, session_id: int, correct_count: int, wrong_count: int):
         reviews = []
         # Add correct reviews
         for _ in range(correct_count):
-            reviews.append(WordReviewItem(
+            reviews.append(dict(
                 word_id=word_id,
                 study_session_id=session_id,
                 correct=True,
@@ -417,7 +426,7 @@ def seed_test_activity_data(db: Session, words: list, groups: list, activities:
             ))
         # Add wrong reviews
         for _ in range(wrong_count):
-            reviews.append(WordReviewItem(
+            reviews.append(dict(
                 word_id=word_id,
                 study_session_id=session_id,
                 correct=False,
@@ -450,11 +459,146 @@ def seed_test_activity_data(db: Session, words: list, groups: list, activities:
     reviews.extend(create_reviews(boire.id, sessions["fr_core"].id, 4, 4))   # Medium success
     reviews.extend(create_reviews(parler.id, sessions["fr_core"].id, 1, 5))  # Low success
     
-    db.add_all(reviews)
-    db.commit()
+    bulk_insert(db, WordReviewItem, reviews)
     
     return list(sessions.values())
 
+def bulk_insert(db: Session, model, rows: Iterable[dict], batch_size: int = BULK_BATCH_SIZE) -> int:
+    """Insert rows into model's table with Core executemany in batches, in a single transaction.
+
+    rows may be a generator, so only one batch is held in memory at a time.
+    Returns the number of rows inserted.
+    """
+    count = 0
+    rows = iter(rows)
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            db.connection().execute(insert(model.__table__), batch)
+            count += len(batch)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return count
+
+def seed_synthetic(
+    db: Session,
+    languages: int = 2,
+    words: int = 1000,
+    sessions: int = 100,
+    reviews: int = 10000,
+    groups: int = 10,
+    days: int = 90,
+    seed: int = 42,
+    batch_size: int = BULK_BATCH_SIZE
+) -> Dict:
+    """Replace the database contents with a large synthetic dataset for load testing.
+
+    Every one of the languages gets words words spread over groups groups, plus
+    sessions study sessions and reviews reviews over the last days days; each review
+    is for a word of its session's group. Rows are generated lazily and written
+    with bulk_insert, so memory stays flat whatever the size.
+
+    Returns the rows written per table, the elapsed time and the overall rows/sec.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    groups = max(1, min(groups, words)) if words else 0
+    codes = SYNTHETIC_LANGUAGE_CODES[:languages] + [
+        f"x{i}" for i in range(len(SYNTHETIC_LANGUAGE_CODES), languages)
+    ]
+
+    reset_database(db.get_bind())
+    start = time.perf_counter()
+    activities = seed_activities(db)
+    universal_activity_ids = [a.id for a in activities if not a.is_language_specific]
+    specific_activity_ids = [a.id for a in activities if a.is_language_specific]
+
+    # Ids are assigned up front so related rows can reference them without reading anything back
+    def word_id(lang_index: int, i: int) -> int:
+        return lang_index * words + i + 1
+
+    def group_id(lang_index: int, g: int) -> int:
+        return lang_index * groups + g + 1
+
+    def session_id(lang_index: int, k: int) -> int:
+        return lang_index * sessions + k + 1
+
+    # Word i belongs to group i % groups; session k studies group k % groups.
+    # Every language shares the same session timeline.
+    session_dates = [now - timedelta(minutes=rng.randint(0, days * 24 * 60)) for _ in range(sessions)]
+
+    def review_rows():
+        for lang_index in range(len(codes)):
+            for _ in range(reviews if sessions and words else 0):
+                k = rng.randrange(sessions)
+                g = k % groups
+                i = g + groups * rng.randrange((words - g + groups - 1) // groups)
+                yield {
+                    "word_id": word_id(lang_index, i),
+                    "study_session_id": session_id(lang_index, k),
+                    "correct": rng.random() < 0.7,
+                    "created_at": session_dates[k] + timedelta(seconds=rng.randint(0, 1800))
+                }
+
+    rows = {"study_activities": len(activities)}
+    rows["languages"] = bulk_insert(db, Language, (
+        {"code": code, "name": f"Synthetic {code}", "active": True} for code in codes
+    ), batch_size)
+    rows["words"] = bulk_insert(db, Word, (
+        {
+            "id": word_id(lang_index, i),
+            "script": f"{code}-word-{i}",
+            "transliteration": f"{code}-translit-{i}",
+            "meaning": f"meaning {i}",
+            "language_code": code
+        }
+        for lang_index, code in enumerate(codes) for i in range(words)
+    ), batch_size)
+    rows["groups"] = bulk_insert(db, Group, (
+        {"id": group_id(lang_index, g), "name": f"Group {g + 1} ({code})", "language_code": code}
+        for lang_index, code in enumerate(codes) for g in range(groups)
+    ), batch_size)
+    rows["word_groups"] = bulk_insert(db, WordGroup, (
+        {"word_id": word_id(lang_index, i), "group_id": group_id(lang_index, i % groups)}
+        for lang_index in range(len(codes)) for i in range(words)
+    ), batch_size)
+    # Sessions and reviews are loaded without the triggers of their rollups on PostgreSQL
+    with triggers_disabled(db, ["study_sessions", "word_review_items"]) as rebuild:
+        rows["study_sessions"] = bulk_insert(db, StudySession, (
+            {
+                "id": session_id(lang_index, k),
+                "group_id": group_id(lang_index, k % groups),
+                "study_activity_id": universal_activity_ids[k % len(universal_activity_ids)],
+                "created_at": session_dates[k]
+            }
+            for lang_index in range(len(codes)) for k in range(sessions if groups else 0)
+        ), batch_size)
+        rows["word_review_items"] = bulk_insert(db, WordReviewItem, review_rows(), batch_size)
+    if rebuild:
+        rebuild_word_stats(db)
+        rebuild_daily_activity(db)
+        rebuild_progress_buckets(db)
+    # Rows added later, e.g. by the API, get ids after the synthetic ones
+    sync_id_sequences(db.connection(), ["words", "groups", "study_sessions"])
+    db.commit()
+
+    rows["activity_language_support"] = bulk_insert(db, ActivityLanguageSupport, (
+        {"activity_id": activity_id, "language_code": code}
+        for activity_id in specific_activity_ids for code in codes
+    ), batch_size)
+
+    elapsed = time.perf_counter() - start
+    total = sum(rows.values())
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(total / elapsed) if elapsed > 0 else total
+    }
+
 def seed_all(db: Session, include_test_data: bool = False, test_error: bool = False):
     """Seed the database with initial data.
     
@@ -497,7 +641,7 @@ def seed_all(db: Session, include_test_data: bool = False, test_error: bool = Fa
 
 if __name__ == "__main__":
     import argparse
-    from app.database import SessionLocal
+    from app.database import get_db_url, setup_db
 
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Seed the database with initial data')
@@ -505,15 +649,33 @@ if __name__ == "__main__":
                        help='Include test study sessions and review data')
     parser.add_argument('--test-error', action='store_true',
                        help='Trigger an error for testing error handling')
+    parser.add_argument('--synthetic', action='store_true',
+                       help='Replace the data with a large generated dataset (bulk insert)')
+    parser.add_argument('--languages', type=int, default=2, help='Synthetic languages')
+    parser.add_argument('--words', type=int, default=1000, help='Synthetic words per language')
+    parser.add_argument('--sessions', type=int, default=100, help='Synthetic study sessions per language')
+    parser.add_argument('--reviews', type=int, default=10000, help='Synthetic reviews per language')
+    parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE, help='Rows per executemany batch')
     
     args = parser.parse_args()
     
     # Create database session
+    _, SessionLocal = setup_db(get_db_url())
     db = SessionLocal()
     
     try:
         print("Starting database seeding...")
-        seed_all(db, include_test_data=args.include_test_data, test_error=args.test_error)
+        if args.synthetic:
+            report = seed_synthetic(
+                db, languages=args.languages, words=args.words, sessions=args.sessions,
+                reviews=args.reviews, batch_size=args.batch_size
+            )
+            for table, count in report["rows"].items():
+                print(f"  {table}: {count} rows")
+            print(f"Inserted {sum(report['rows'].values())} rows in {report['seconds']}s "
+                  f"({report['rows_per_second']} rows/sec)")
+        else:
+            seed_all(db, include_test_data=args.include_test_data, test_error=args.test_error)
         print("Database seeding completed successfully!")
         if args.include_test_data:
             print("Test data (study sessions and reviews) was included.")
@@ -1,7 +1,136 @@
-from sqlalchemy import text
+"""Database helpers, including the SQL that differs between SQLite and PostgreSQL.
+
+Queries use the constructs below instead of SQLite's julianday() or
+CURRENT_TIMESTAMP directly; each one compiles to the equivalent SQL of the
+engine's dialect.
+"""
+from contextlib import contextmanager
+from sqlalchemy import Date, DateTime, Float, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
 from app.database import Base
 
 def reset_database(engine):
     """Drop all tables and recreate them. Use only in development!"""
     Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+
+def dialect_insert(connection):
+    """The insert() of the connection's dialect, whose statements support ON CONFLICT upserts."""
+    return postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+
+def sync_id_sequences(connection, tables):
+    """Move the id sequences of tables past their largest id, after rows were inserted with explicit ids.
+
+    PostgreSQL only; SQLite picks the next rowid from the table itself.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    for table in tables:
+        connection.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+        )
+
+@contextmanager
+def triggers_disabled(db, tables):
+    """Run the block with the app's triggers on tables switched off, on PostgreSQL.
+
+    PostgreSQL keeps every version of a row updated within one transaction, so the
+    counter triggers slow a bulk load down quadratically; the derived tables are
+    rebuilt after it instead. Yields whether the triggers were switched off: on
+    SQLite they stay on.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        yield False
+        return
+    for table in tables:
+        db.execute(text(f"ALTER TABLE {table} DISABLE TRIGGER USER"))
+    try:
+        yield True
+    finally:
+        for table in tables:
+            db.execute(text(f"ALTER TABLE {table} ENABLE TRIGGER USER"))
+        db.commit()
+
+class utcnow(FunctionElement):
+    """The current UTC time as a naive timestamp, e.g. as a server default."""
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+class utc_day(FunctionElement):
+    """The day of a timestamp."""
+    type = Date()
+    inherit_cache = True
+
+@compiles(utc_day)
+def _utc_day_default(element, compiler, **kw):
+    return f"date({compiler.process(element.clauses, **kw)})"
+
+@compiles(utc_day, "postgresql")
+def _utc_day_postgresql(element, compiler, **kw):
+    return f"CAST({compiler.process(element.clauses, **kw)} AS DATE)"
+
+class day_number(FunctionElement):
+    """A day as a number that grows by one per day, for arithmetic over consecutive days."""
+    type = Float()
+    inherit_cache = True
+
+@compiles(day_number)
+def _day_number_default(element, compiler, **kw):
+    return f"julianday({compiler.process(element.clauses, **kw)})"
+
+@compiles(day_number, "postgresql")
+def _day_number_postgresql(element, compiler, **kw):
+    return f"({compiler.process(element.clauses, **kw)} - DATE '1970-01-01')"
+
+class days_between(FunctionElement):
+    """Fractional days from the second timestamp to the first."""
+    type = Float()
+    inherit_cache = True
+
+@compiles(days_between)
+def _days_between_default(element, compiler, **kw):
+    later, earlier = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"(julianday({later}) - julianday({earlier}))"
+
+@compiles(days_between, "postgresql")
+def _days_between_postgresql(element, compiler, **kw):
+    later, earlier = (compiler.process(clause, **kw) for clause in element.clauses)
+    # EXTRACT returns numeric, whose arithmetic is much slower than double precision
+    return f"(CAST(EXTRACT(EPOCH FROM ({later} - {earlier})) AS DOUBLE PRECISION) / 86400.0)"
+
+class bucket_start(FunctionElement):
+    """The day on which the day, ISO week (from Monday) or month of a timestamp starts."""
+    type = Date()
+    inherit_cache = True
+    _traverse_internals = FunctionElement._traverse_internals + [("unit", InternalTraversal.dp_string)]
+
+    UNITS = ("day", "week", "month")
+
+    def __init__(self, unit: str, expr):
+        if unit not in self.UNITS:
+            raise ValueError(f"unit must be one of {', '.join(self.UNITS)}")
+        self.unit = unit
+        super().__init__(expr)
+
+@compiles(bucket_start)
+def _bucket_start_default(element, compiler, **kw):
+    expr = compiler.process(element.clauses, **kw)
+    # 'weekday 0' moves forward to the next Sunday (or stays on one), six days later than its Monday
+    modifiers = {"day": "", "week": ", 'weekday 0', '-6 days'", "month": ", 'start of month'"}
+    return f"date({expr}{modifiers[element.unit]})"
+
+@compiles(bucket_start, "postgresql")
+def _bucket_start_postgresql(element, compiler, **kw):
+    return f"CAST(date_trunc('{element.unit}', {compiler.process(element.clauses, **kw)}) AS DATE)"
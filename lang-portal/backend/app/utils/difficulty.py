@@ -0,0 +1,137 @@
+"""Ranking of each language's hardest words by their recent reviews.
+
+Every review in a window counts with a weight that halves every HALF_LIFE_DAYS
+days, so a word missed yesterday outranks one missed a month ago. A word's
+error rate is its weighted share of wrong answers, smoothed towards 1/2 by one
+imaginary wrong and one imaginary correct answer so that a single miss does
+not outrank a word missed nine times out of ten.
+
+The ranking reads every recent review, so it is materialized in the
+word_difficulty table (the MAX_HARDEST_WORDS first words of each language and
+window) and refreshed every settings.WORD_DIFFICULTY_REFRESH_INTERVAL seconds;
+/words/hardest only reads it.
+"""
+import asyncio
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import DateTime, Float, bindparam, case, delete, func, insert, literal, select
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from app.models import Word, WordDifficulty, WordReviewItem
+from app.utils.db_utils import days_between
+
+# Days after which a review counts half as much as one made now
+HALF_LIFE_DAYS = 7
+# Review windows a ranking is kept for, in days
+WINDOWS = (7, 30, 90)
+# Words ranked per language and window
+MAX_HARDEST_WORDS = 100
+
+def word_difficulty_ranking(window_days: int, now: datetime):
+    """SELECT of (language_code, window_days, rank, word_id, error_rate, reviews, wrong, refreshed_at)
+    for the hardest words reviewed wrong at least once in the window_days before now."""
+    now_param = bindparam("now", now, type_=DateTime)
+    age_days = days_between(now_param, WordReviewItem.created_at)
+    weight = func.exp(-math.log(2) / HALF_LIFE_DAYS * age_days, type_=Float)
+    wrong = func.sum(case((WordReviewItem.correct == False, 1), else_=0))
+    wrong_weight = func.sum(case((WordReviewItem.correct == False, weight), else_=0))
+    total_weight = func.sum(weight)
+    # Only the window's reviews are read, in created_at order from the covering index
+    per_word = select(
+        Word.language_code.label("language_code"),
+        WordReviewItem.word_id.label("word_id"),
+        ((wrong_weight + 1) / (total_weight + 2)).label("error_rate"),
+        func.count().label("reviews"),
+        wrong.label("wrong")
+    ).join(
+        Word,
+        Word.id == WordReviewItem.word_id
+    ).where(
+        WordReviewItem.created_at >= bindparam("since", now - timedelta(days=window_days), type_=DateTime)
+    ).group_by(
+        Word.language_code,
+        WordReviewItem.word_id
+    ).having(
+        wrong > 0
+    ).subquery()
+    ranked = select(
+        per_word,
+        func.row_number().over(
+            partition_by=per_word.c.language_code,
+            order_by=(per_word.c.error_rate.desc(), per_word.c.wrong.desc(), per_word.c.word_id)
+        ).label("rank")
+    ).subquery()
+    return select(
+        ranked.c.language_code,
+        literal(window_days).label("window_days"),
+        ranked.c.rank,
+        ranked.c.word_id,
+        ranked.c.error_rate,
+        ranked.c.reviews,
+        ranked.c.wrong,
+        now_param.label("refreshed_at")
+    ).where(
+        ranked.c.rank <= MAX_HARDEST_WORDS
+    )
+
+def rank_word_difficulty(db: Session, now: datetime) -> List[Dict]:
+    """The ranked word_difficulty rows of every language and window, read without writing anything."""
+    return [
+        dict(row._mapping)
+        for window_days in WINDOWS
+        for row in db.execute(word_difficulty_ranking(window_days, now))
+    ]
+
+def replace_word_difficulty(db: Session, rows: List[Dict]) -> int:
+    """Swap the word_difficulty table's rows for rows in one short write transaction.
+
+    Returns the number of rows written.
+    """
+    db.execute(delete(WordDifficulty))
+    if rows:
+        db.execute(insert(WordDifficulty), rows)
+    db.commit()
+    return len(rows)
+
+def rebuild_word_difficulty(db: Session, now: Optional[datetime] = None) -> int:
+    """Replace the word_difficulty ranking of every language and window.
+
+    The rankings are computed with plain reads first; the write transaction
+    only deletes the old rows and inserts the new ones (a few hundred per
+    language), so it holds SQLite's write lock for as short a time as possible.
+    Returns the number of ranked rows written.
+    """
+    now = now or datetime.utcnow()
+    return replace_word_difficulty(db, rank_word_difficulty(db, now))
+
+def refresh_word_difficulty(
+    SessionLocal: sessionmaker, max_age: int, ReadSessionLocal: Optional[sessionmaker] = None
+) -> bool:
+    """Rebuild the ranking unless another worker did within the last max_age seconds.
+
+    The freshness check and the ranking run on a ReadSessionLocal session, so
+    a worker's single writer connection is only taken to swap the rows in.
+    Returns whether it was rebuilt.
+    """
+    now = datetime.utcnow()
+    with (ReadSessionLocal or SessionLocal)() as db:
+        refreshed_at = db.scalar(select(func.max(WordDifficulty.refreshed_at)))
+        if refreshed_at is not None and refreshed_at > now - timedelta(seconds=max_age):
+            return False
+        rows = rank_word_difficulty(db, now)
+    with SessionLocal() as db:
+        replace_word_difficulty(db, rows)
+    return True
+
+async def word_difficulty_refresh_loop(
+    SessionLocal: sessionmaker, interval: int, ReadSessionLocal: Optional[sessionmaker] = None
+):
+    """Refresh the ranking now and then every interval seconds until cancelled."""
+    while True:
+        try:
+            await run_in_threadpool(refresh_word_difficulty, SessionLocal, interval, ReadSessionLocal)
+        except Exception as e:
+            # A busy database only delays the refresh until the next run
+            print(f"Word difficulty refresh failed: {e}")
+        await asyncio.sleep(interval)
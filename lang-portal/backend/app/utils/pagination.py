@@ -0,0 +1,121 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Query
+
+# Server-side cap on per_page for every paginated route
+MAX_PER_PAGE = 100
+
+class Page(NamedTuple):
+    items: List[Any]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+def count_rows(query: Query) -> int:
+    """Count the rows of an ungrouped base query as a plain SELECT count(*).
+
+    Query.count() wraps the query in a subquery; for list routes that would
+    run the whole joined/grouped/sorted aggregation a second time just to
+    count it. Callers pass the base query (one row per result item, no
+    aggregate joins) and this replaces its columns with count(*).
+    """
+    return query.with_entities(func.count()).order_by(None).scalar()
+
+def encode_cursor(sort_value: Any, row_id: int, sort_by: Optional[str] = None, order: str = "asc") -> str:
+    """Encode the sort key and id of the last row on a page into an opaque cursor.
+
+    The cursor also records the sort it was produced for, so that it cannot
+    continue a listing sorted differently.
+    """
+    payload = {"v": sort_value, "id": row_id, "s": sort_by, "o": order}
+    if isinstance(sort_value, datetime):
+        payload.update(v=sort_value.isoformat(), t="datetime")
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor: str, sort_by: Optional[str] = None, order: str = "asc") -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor for the same sort back into (sort_value, id)."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = payload["v"]
+        # Sort values are scalars; anything else cannot be bound against the sort column
+        if isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))):
+            raise ValueError("Invalid cursor value")
+        if payload.get("t") == "datetime":
+            value = datetime.fromisoformat(value)
+        row_id = int(payload["id"])
+        cursor_sort = (payload.get("s"), payload.get("o", "asc"))
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != (sort_by, order):
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different sort_by or order")
+    return value, row_id
+
+def paginate(
+    query: Query,
+    *,
+    page: int,
+    per_page: int,
+    count_query: Optional[Query] = None,
+    include_total: bool = True,
+    cursor: Optional[str] = None,
+    sort_column=None,
+    id_column=None,
+    descending: bool = False,
+    sort_by: Optional[str] = None,
+    row_key: Optional[Callable[[Any], Tuple[Any, int]]] = None,
+) -> Page:
+    """Fetch one page of an ordered query and return it as a Page.
+
+    The total is counted from count_query, the cheap ungrouped base query
+    (see count_rows), and skipped entirely when include_total is False,
+    e.g. for infinite-scroll clients.
+
+    When sort_column/id_column/row_key are given the query is ordered by
+    (sort_column, id_column) and a cursor turns the page into a range scan
+    starting right after the encoded row instead of an OFFSET.
+    A next_cursor is returned whenever more rows follow, whichever mode was used;
+    it records sort_by and the order, and is rejected for any other sort.
+    Queries that cannot be keyset-paginated (e.g. sorted by an aggregate) pass
+    no id_column; they keep OFFSET paging and reject cursors.
+    """
+    keyset = id_column is not None and row_key is not None
+    order = "desc" if descending else "asc"
+
+    if cursor is not None and not keyset:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor pagination is not supported for this sort order"
+        )
+
+    if keyset:
+        keys = (sort_column, id_column) if sort_column is not None else (id_column,)
+        if cursor is not None:
+            value, last_id = decode_cursor(cursor, sort_by, order)
+            bound = (value, last_id) if sort_column is not None else (last_id,)
+            if descending:
+                query = query.filter(tuple_(*keys) < bound)
+            else:
+                query = query.filter(tuple_(*keys) > bound)
+        query = query.order_by(*[key.desc() if descending else key for key in keys])
+
+    if cursor is None:
+        query = query.offset((page - 1) * per_page)
+
+    # Fetch one extra row to learn whether another page follows
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = encode_cursor(*row_key(rows[-1]), sort_by, order) if has_more and keyset else None
+
+    total = None
+    if include_total and count_query is not None:
+        if page == 1 and cursor is None and not has_more:
+            # Everything fit on the first page, so the total is already known
+            total = len(rows)
+        else:
+            total = count_rows(count_query)
+    return Page(rows, total, next_cursor)
@@ -0,0 +1,147 @@
+"""Review counts, accuracy and distinct words per day, week or month, for /analytics/reviews.
+
+A language's reviews in a date range are grouped by bucket_start(created_at)
+in one query over the created_at index. Reviews are stamped with their creation
+time, so a bucket that has ended never changes again: its figures are cached
+with the response cache (see app.cache) and later requests only query the
+buckets that are still open or not cached yet.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+import orjson
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from app.cache import response_cache
+from app.core.config import settings
+from app.database import DbSession, run_db
+from app.models import Group, StudySession, WordReviewItem
+from app.utils.db_utils import bucket_start
+
+BUCKETS = bucket_start.UNITS
+# Buckets covered when the request has no from date, up to and including the one of to
+DEFAULT_BUCKETS = {"day": 30, "week": 12, "month": 12}
+# Buckets one request may cover, e.g. ten years of days
+MAX_BUCKETS = 3660
+
+@dataclass
+class BucketStats:
+    reviews: int = 0
+    correct: int = 0
+    distinct_words: int = 0
+
+def floor_bucket(bucket: str, day: date) -> date:
+    """The first day of the bucket containing day, as bucket_start() computes it in SQL."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+def next_bucket(bucket: str, start: date) -> date:
+    """The first day of the bucket after the one starting on start."""
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+def previous_bucket(bucket: str, start: date) -> date:
+    """The first day of the bucket before the one starting on start."""
+    if bucket == "week":
+        return start - timedelta(days=7)
+    if bucket == "month":
+        return (start - timedelta(days=1)).replace(day=1)
+    return start - timedelta(days=1)
+
+def bucket_starts(bucket: str, first_day: date, last_day: date, limit: Optional[int] = None) -> List[date]:
+    """The first days of the buckets covering first_day to last_day, both included (the first limit ones)."""
+    starts = []
+    start = floor_bucket(bucket, first_day)
+    while start <= last_day and len(starts) != limit:
+        starts.append(start)
+        start = next_bucket(bucket, start)
+    return starts
+
+def review_bucket_stats(bucket: str, language_code: str, group_id: Optional[int], since: date, until: date):
+    """SELECT of (bucket, reviews, correct, distinct_words) per bucket with reviews from since until before until."""
+    bucket_column = bucket_start(bucket, WordReviewItem.created_at)
+    statement = select(
+        bucket_column.label("bucket"),
+        func.count().label("reviews"),
+        func.sum(case((WordReviewItem.correct == True, 1), else_=0)).label("correct"),
+        func.count(func.distinct(WordReviewItem.word_id)).label("distinct_words")
+    ).join(
+        StudySession,
+        StudySession.id == WordReviewItem.study_session_id
+    ).join(
+        Group,
+        Group.id == StudySession.group_id
+    ).where(
+        Group.language_code == language_code,
+        # Bounds on the column itself, so the range is read from its index
+        WordReviewItem.created_at >= datetime.combine(since, time.min),
+        WordReviewItem.created_at < datetime.combine(until, time.min)
+    ).group_by(
+        bucket_column
+    )
+    if group_id is not None:
+        statement = statement.where(StudySession.group_id == group_id)
+    return statement
+
+def load_review_buckets(
+    db: Session, bucket: str, language_code: str, group_id: Optional[int], since: date, until: date
+) -> Dict[date, BucketStats]:
+    """The stats of the buckets from since until before until that have reviews."""
+    rows = db.execute(review_bucket_stats(bucket, language_code, group_id, since, until))
+    return {
+        row.bucket: BucketStats(row.reviews, row.correct, row.distinct_words)
+        for row in rows
+    }
+
+def cache_name(bucket: str, language_code: str, group_id: Optional[int]) -> str:
+    """Name of the response cache value holding the ended buckets of a series."""
+    return f"analytics:reviews:{language_code}:{'*' if group_id is None else group_id}:{bucket}"
+
+def encode_buckets(buckets: Dict[date, BucketStats]) -> bytes:
+    return orjson.dumps({
+        start.isoformat(): [stats.reviews, stats.correct, stats.distinct_words]
+        for start, stats in buckets.items()
+    })
+
+def decode_buckets(value: bytes) -> Dict[date, BucketStats]:
+    return {
+        date.fromisoformat(start): BucketStats(*figures)
+        for start, figures in orjson.loads(value).items()
+    }
+
+async def review_analytics(
+    db: DbSession, bucket: str, language_code: str, group_id: Optional[int], starts: List[date], today: date
+) -> Dict[date, BucketStats]:
+    """The stats of every bucket in starts (consecutive first days), reading only open and uncached buckets.
+
+    The buckets starting before today's have ended. Once queried they are kept
+    in the response cache, so a series requested up to today costs one query
+    over the current bucket's reviews.
+    """
+    open_from = floor_bucket(bucket, today)
+    until = next_bucket(bucket, starts[-1])
+    ended = {} if response_cache is None else decode_buckets(
+        await response_cache.get_value(cache_name(bucket, language_code, group_id)) or b"{}"
+    )
+    missing = [start for start in starts if start < open_from and start not in ended]
+    since = missing[0] if missing else max(starts[0], open_from)
+
+    queried = {}
+    if since < until:
+        queried = await run_db(db, load_review_buckets, bucket, language_code, group_id, since, until)
+    if missing and response_cache is not None:
+        # Every ended bucket of the queried range is final now, including those without reviews
+        start = since
+        while start < min(open_from, until):
+            ended[start] = queried.get(start, BucketStats())
+            start = next_bucket(bucket, start)
+        await response_cache.set_value(
+            cache_name(bucket, language_code, group_id), encode_buckets(ended), settings.ANALYTICS_CACHE_TTL
+        )
+    return {start: ended.get(start) or queried.get(start, BucketStats()) for start in starts}
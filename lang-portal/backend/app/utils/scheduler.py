@@ -0,0 +1,97 @@
+"""SM-2 spaced-repetition scheduling of the words in a group.
+
+Reviews are pass/fail, so they are graded as SM-2 quality 5 (correct) or 2
+(wrong). A correct answer is due again after 1 day, then 6 days, then the
+previous interval times the ease; a wrong answer restarts the word at 1 day.
+The ease starts at 2.5, moves by +0.10 or -0.32 per review and never drops
+below 1.3.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, NamedTuple, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import ReviewSchedule
+from app.utils.db_utils import dialect_insert
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+
+# SM-2 quality of a correct and of a wrong answer
+CORRECT_QUALITY = 5
+WRONG_QUALITY = 2
+
+class Schedule(NamedTuple):
+    due_at: datetime
+    interval_days: int
+    ease: float
+    repetitions: int
+
+def next_schedule(schedule: Schedule, correct: bool, reviewed_at: datetime) -> Schedule:
+    """The schedule of a word after a review at reviewed_at."""
+    quality = CORRECT_QUALITY if correct else WRONG_QUALITY
+    if correct:
+        repetitions = schedule.repetitions + 1
+        if repetitions == 1:
+            interval_days = 1
+        elif repetitions == 2:
+            interval_days = 6
+        else:
+            interval_days = round(schedule.interval_days * schedule.ease)
+    else:
+        repetitions = 0
+        interval_days = 1
+    ease = schedule.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    return Schedule(
+        due_at=reviewed_at + timedelta(days=interval_days),
+        interval_days=interval_days,
+        ease=round(max(MIN_EASE, ease), 2),
+        repetitions=repetitions
+    )
+
+def apply_reviews(db: Session, group_id: int, reviews: Iterable[Tuple[int, bool, datetime]]) -> Dict[int, Schedule]:
+    """Advance the schedules of a group's words by (word_id, correct, reviewed_at) reviews, in order.
+
+    Reads the affected schedules with one query and writes them back with one
+    executemany upsert, inside the caller's transaction.
+    Returns the new schedule of every reviewed word.
+    """
+    connection = db.connection()
+    reviews = list(reviews)
+    word_ids = sorted({word_id for word_id, _, _ in reviews})
+    schedules = {
+        row.word_id: Schedule(row.due_at, row.interval_days, row.ease, row.repetitions)
+        for row in connection.execute(
+            select(
+                ReviewSchedule.word_id,
+                ReviewSchedule.due_at,
+                ReviewSchedule.interval_days,
+                ReviewSchedule.ease,
+                ReviewSchedule.repetitions
+            ).where(ReviewSchedule.group_id == group_id, ReviewSchedule.word_id.in_(word_ids))
+        )
+    }
+    for word_id, correct, reviewed_at in reviews:
+        schedules[word_id] = next_schedule(schedules.get(word_id) or new_schedule(reviewed_at), correct, reviewed_at)
+
+    schedules = {word_id: schedules[word_id] for word_id in word_ids}
+    write_schedules(db, ((group_id, word_id, schedule) for word_id, schedule in schedules.items()))
+    return schedules
+
+def new_schedule(due_at: datetime) -> Schedule:
+    """The schedule of a word that was never reviewed."""
+    return Schedule(due_at, 0, INITIAL_EASE, 0)
+
+def write_schedules(db: Session, schedules: Iterable[Tuple[int, int, Schedule]]):
+    """Upsert (group_id, word_id, schedule) rows with one executemany statement."""
+    rows = [{"group_id": group_id, "word_id": word_id, **schedule._asdict()} for group_id, word_id, schedule in schedules]
+    if not rows:
+        return
+    connection = db.connection()
+    statement = dialect_insert(connection)(ReviewSchedule)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ReviewSchedule.group_id, ReviewSchedule.word_id],
+            set_={column: statement.excluded[column] for column in Schedule._fields}
+        ),
+        rows
+    )
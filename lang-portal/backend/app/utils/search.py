@@ -0,0 +1,124 @@
+"""Text folding and query building for the words_fts full-text index.
+
+The FTS5 tokenizer (unicode61 with remove_diacritics 2) already folds case and
+Latin diacritics, so "ecole" finds "École" and "manana" finds "mañana". It
+treats Arabic harakat as separators instead, which would split vocalized
+words into fragments; those are folded away before indexing and querying:
+
+- harakat, superscript alef and tatweel are removed
+- hamza and madda forms of alef become a bare alef, alef maqsura becomes ya
+  and ta marbuta becomes ha
+
+On PostgreSQL the index is a tsvector per word built with the 'simple' text
+search configuration, which folds case but keeps diacritics; Latin letters
+with diacritics are folded to their base letter along with the Arabic folds
+(fold_diacritics), and queries are tsquery prefix searches (build_tsquery).
+"""
+import re
+import unicodedata
+from typing import Dict, Optional
+from sqlalchemy import column, func, literal_column, table
+
+# Arabic characters removed (None) or replaced before indexing and searching
+ARABIC_FOLDS: Dict[str, Optional[str]] = {
+    **{chr(code): None for code in range(0x064B, 0x0656)},  # Harakat, shadda, sukun, maddah and hamza marks
+    "\u0670": None,  # Superscript alef
+    "\u0640": None,  # Tatweel
+    "\u0622": "\u0627",  # Alef with madda
+    "\u0623": "\u0627",  # Alef with hamza above
+    "\u0625": "\u0627",  # Alef with hamza below
+    "\u0671": "\u0627",  # Alef wasla
+    "\u0649": "\u064A",  # Alef maqsura -> ya
+    "\u0629": "\u0647",  # Ta marbuta -> ha
+}
+
+_FOLD_TABLE = str.maketrans(ARABIC_FOLDS)
+
+# Latin letters with diacritics and their base letter, e.g. "é" -> "e" and "Ñ" -> "N"
+LATIN_FOLDS: Dict[str, str] = {
+    char: decomposed[0]
+    for char, decomposed in ((chr(code), unicodedata.normalize("NFD", chr(code))) for code in range(0xC0, 0x250))
+    if len(decomposed) > 1 and decomposed[0].isascii() and all(unicodedata.combining(mark) for mark in decomposed[1:])
+}
+
+_DIACRITICS_FOLD_TABLE = str.maketrans({**LATIN_FOLDS, **ARABIC_FOLDS})
+
+# Matches text containing a character in the range of ARABIC_FOLDS
+_FOLD_GLOB = f"*[{min(ARABIC_FOLDS)}-{max(ARABIC_FOLDS)}]*"
+
+# The FTS5 table kept in sync with words by triggers (see app.models); not part of
+# the metadata, so it is only created by those DDL hooks and the migration
+words_fts = table("words_fts", column("rowid"), column("words_fts"), column("language_code"), column("document"))
+
+# bm25 column weights: script and transliteration matches rank above meaning matches
+words_fts_rank = func.bm25(literal_column("words_fts"), 2.0, 2.0, 1.0, 0.0)
+
+# PostgreSQL's text search configuration of words_fts: no stemming or stop words, like unicode61
+TS_CONFIG = literal_column("'simple'")
+
+# ts_rank weights of the D, C, B (meaning) and A (script, transliteration) labels, as in bm25 above
+TS_RANK_WEIGHTS = literal_column("'{0, 0, 0.5, 1.0}'")
+
+def words_fts_ts_rank(tsquery):
+    """Rank of a words_fts document on PostgreSQL; higher is better, unlike bm25."""
+    return func.ts_rank(TS_RANK_WEIGHTS, words_fts.c.document, tsquery)
+
+# Runs of characters the tokenizer would keep together in one token
+_TOKEN = re.compile(r"\w+")
+
+def fold_text(text: str) -> str:
+    """Fold text the way it is indexed in words_fts."""
+    return text.translate(_FOLD_TABLE)
+
+def fold_sql(expression: str) -> str:
+    """SQL applying fold_text to expression, for the words_fts triggers.
+
+    Plain nested replace() calls, so every client writing to words keeps the
+    index right without registering a function. SQLite's parser overflows at
+    about 25 nested calls per expression in a trigger, which bounds ARABIC_FOLDS.
+    Text without any folded character skips the replace() chain.
+    """
+    folded = expression
+    for char, replacement in ARABIC_FOLDS.items():
+        target = f"char({ord(replacement)})" if replacement else "''"
+        folded = f"replace({folded}, char({ord(char)}), {target})"
+    return f"CASE WHEN {expression} GLOB '{_FOLD_GLOB}' THEN {folded} ELSE {expression} END"
+
+def fold_diacritics(text: str) -> str:
+    """Fold text the way it is indexed in words_fts on PostgreSQL."""
+    return text.translate(_DIACRITICS_FOLD_TABLE)
+
+def fold_diacritics_sql(expression: str) -> str:
+    """PostgreSQL SQL applying fold_diacritics to expression, for the words_fts triggers.
+
+    A single translate(): characters without a replacement come last, so they are removed.
+    """
+    replaced = {char: replacement for char, replacement in {**LATIN_FOLDS, **ARABIC_FOLDS}.items() if replacement}
+    removed = [char for char, replacement in ARABIC_FOLDS.items() if not replacement]
+    source = "".join(replaced) + "".join(removed)
+    return f"translate({expression}, '{source}', '{''.join(replaced.values())}')"
+
+def build_tsquery(q: str) -> Optional[str]:
+    """to_tsquery text finding words matching every term of q as a prefix, for PostgreSQL.
+
+    The language is filtered on words_fts.language_code instead. Terms only hold
+    word characters, so tsquery operators typed by users are dropped like punctuation.
+    Returns None when q has no searchable terms.
+    """
+    terms = _TOKEN.findall(fold_diacritics(q))
+    if not terms:
+        return None
+    return " & ".join(f"'{term}':*" for term in terms)
+
+def build_match_query(q: str, language_code: str) -> Optional[str]:
+    """FTS5 MATCH expression finding words of a language matching every term of q as a prefix.
+
+    Terms are quoted, so FTS5 operators typed by users are searched as text.
+    Returns None when q has no searchable terms.
+    """
+    terms = _TOKEN.findall(fold_text(q))
+    if not terms:
+        return None
+    prefixes = " AND ".join(f'"{term}"*' for term in terms)
+    language = language_code.replace('"', '""')
+    return f'{{script transliteration meaning}} : ({prefixes}) AND language_code : "{language}"'
@@ -0,0 +1,236 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, func, update, delete, insert, case, literal, union_all
+from sqlalchemy.orm import Session
+from app.models import (
+    PROGRESS_WINDOW_DAYS, DailyActiveGroup, DailyActivity, DailyStudiedWord, Group, ReviewSchedule, StudySession, Word,
+    WordGroup, WordReviewItem
+)
+from app.utils.db_utils import utc_day
+from app.utils.scheduler import new_schedule, next_schedule, write_schedules
+
+# Rows fetched and written per batch when rebuilding the review schedules
+REPLAY_BATCH_SIZE = 5000
+
+def rebuild_word_stats(db: Session) -> int:
+    """Recompute every word's review counters from the raw word_review_items rows.
+
+    The counters are normally maintained by triggers; this is the repair path after
+    bulk loads that bypassed them or manual edits to the review table.
+    Returns the number of words updated.
+    """
+    correct = (
+        select(func.count(WordReviewItem.id))
+        .where(WordReviewItem.word_id == Word.id, WordReviewItem.correct == True)
+        .scalar_subquery()
+    )
+    wrong = (
+        select(func.count(WordReviewItem.id))
+        .where(WordReviewItem.word_id == Word.id, WordReviewItem.correct == False)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Word).values(correct_count=correct, wrong_count=wrong),
+        execution_options={"synchronize_session": False}
+    )
+    db.commit()
+    return result.rowcount
+
+def rebuild_group_word_counts(db: Session) -> int:
+    """Recompute every group's words_count from the word_groups links.
+
+    Like the word counters, words_count is maintained by triggers; this is the repair
+    path after deleting words or moving groups between languages.
+    Returns the number of groups updated.
+    """
+    words_count = (
+        select(func.count(WordGroup.word_id))
+        .join(Word, Word.id == WordGroup.word_id)
+        .where(WordGroup.group_id == Group.id, Word.language_code == Group.language_code)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Group).values(words_count=words_count),
+        execution_options={"synchronize_session": False}
+    )
+    db.commit()
+    return result.rowcount
+
+def rebuild_daily_activity(db: Session) -> int:
+    """Recompute the daily_activity rollup from the raw sessions and reviews.
+
+    Like the word counters, the rollup is maintained by triggers; this rebuilds it
+    after bulk loads or edits that moved sessions between languages.
+    Returns the number of (language, day) rows written.
+    """
+    sessions = select(
+        Group.language_code.label("language_code"),
+        utc_day(StudySession.created_at).label("day"),
+        literal(1).label("sessions"),
+        literal(0).label("reviews"),
+        literal(0).label("correct")
+    ).join(
+        Group,
+        Group.id == StudySession.group_id
+    ).where(
+        StudySession.created_at.is_not(None)
+    )
+    reviews = select(
+        Group.language_code,
+        utc_day(WordReviewItem.created_at),
+        literal(0),
+        literal(1),
+        case((WordReviewItem.correct == True, 1), else_=0)
+    ).join(
+        StudySession,
+        StudySession.id == WordReviewItem.study_session_id
+    ).join(
+        Group,
+        Group.id == StudySession.group_id
+    ).where(
+        WordReviewItem.created_at.is_not(None)
+    )
+    activity = union_all(sessions, reviews).subquery()
+    rollup = select(
+        activity.c.language_code,
+        activity.c.day,
+        func.sum(activity.c.sessions),
+        func.sum(activity.c.reviews),
+        func.sum(activity.c.correct)
+    ).group_by(
+        activity.c.language_code,
+        activity.c.day
+    )
+
+    db.execute(delete(DailyActivity))
+    result = db.execute(
+        insert(DailyActivity).from_select(
+            ["language_code", "date", "sessions", "reviews", "correct"],
+            rollup
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+def rebuild_progress_buckets(db: Session, today: Optional[date] = None) -> int:
+    """Recompute the daily_studied_words and daily_active_groups buckets of the progress window.
+
+    Like the daily_activity rollup, the buckets are maintained by triggers; this rebuilds
+    the last PROGRESS_WINDOW_DAYS days of them (today included) from the raw rows.
+    Returns the number of bucket rows written.
+    """
+    today = today or datetime.utcnow().date()
+    start_day = today - timedelta(days=PROGRESS_WINDOW_DAYS)
+    review_day = utc_day(WordReviewItem.created_at)
+    studied_words = select(
+        Group.language_code,
+        review_day,
+        WordReviewItem.word_id,
+        func.count()
+    ).join(
+        StudySession,
+        StudySession.id == WordReviewItem.study_session_id
+    ).join(
+        Group,
+        Group.id == StudySession.group_id
+    ).where(
+        review_day >= start_day
+    ).group_by(
+        Group.language_code,
+        review_day,
+        WordReviewItem.word_id
+    )
+    session_day = utc_day(StudySession.created_at)
+    active_groups = select(
+        Group.language_code,
+        session_day,
+        StudySession.group_id,
+        func.count()
+    ).join(
+        Group,
+        Group.id == StudySession.group_id
+    ).where(
+        session_day >= start_day
+    ).group_by(
+        Group.language_code,
+        session_day,
+        StudySession.group_id
+    )
+
+    db.execute(delete(DailyStudiedWord))
+    db.execute(delete(DailyActiveGroup))
+    words_result = db.execute(
+        insert(DailyStudiedWord).from_select(["language_code", "date", "word_id", "reviews"], studied_words)
+    )
+    groups_result = db.execute(
+        insert(DailyActiveGroup).from_select(["language_code", "date", "group_id", "sessions"], active_groups)
+    )
+    db.commit()
+    return words_result.rowcount + groups_result.rowcount
+
+def rebuild_review_schedules(db: Session) -> int:
+    """Recompute every word's spaced-repetition schedule by replaying the reviews in order.
+
+    Schedules are normally advanced by the review routes; this is the repair path
+    after bulk loads of reviews. Words never reviewed become due immediately.
+    Returns the number of schedules written.
+    """
+    db.execute(delete(ReviewSchedule))
+    result = db.execute(
+        insert(ReviewSchedule).from_select(["group_id", "word_id"], select(WordGroup.group_id, WordGroup.word_id))
+    )
+    reviews = select(
+        StudySession.group_id,
+        WordReviewItem.word_id,
+        WordReviewItem.correct,
+        WordReviewItem.created_at
+    ).join(
+        StudySession,
+        StudySession.id == WordReviewItem.study_session_id
+    ).join(
+        WordGroup,
+        (WordGroup.group_id == StudySession.group_id) & (WordGroup.word_id == WordReviewItem.word_id)
+    ).where(
+        WordReviewItem.created_at.is_not(None)
+    ).order_by(
+        WordReviewItem.created_at,
+        WordReviewItem.id
+    )
+    # Replay in memory (one entry per reviewed word of a group), then write the schedules once
+    schedules = {}
+    for group_id, word_id, correct, created_at in db.execute(reviews.execution_options(yield_per=REPLAY_BATCH_SIZE)):
+        key = (group_id, word_id)
+        schedules[key] = next_schedule(schedules.get(key) or new_schedule(created_at), correct, created_at)
+    keys = list(schedules)
+    for start in range(0, len(keys), REPLAY_BATCH_SIZE):
+        write_schedules(db, ((*key, schedules[key]) for key in keys[start:start + REPLAY_BATCH_SIZE]))
+    db.commit()
+    return result.rowcount
+
+if __name__ == "__main__":
+    from app.database import get_db_url, setup_db
+    from app.utils.difficulty import rebuild_word_difficulty
+
+    _, SessionLocal = setup_db(get_db_url())
+    db = SessionLocal()
+    try:
+        print("Rebuilding word review counters...")
+        count = rebuild_word_stats(db)
+        print(f"Rebuilt review counters for {count} words")
+        print("Rebuilding group word counts...")
+        count = rebuild_group_word_counts(db)
+        print(f"Rebuilt word counts for {count} groups")
+        print("Rebuilding daily activity rollup...")
+        count = rebuild_daily_activity(db)
+        print(f"Rebuilt daily activity for {count} language days")
+        print("Rebuilding progress buckets...")
+        count = rebuild_progress_buckets(db)
+        print(f"Rebuilt {count} progress bucket rows")
+        print("Rebuilding review schedules...")
+        count = rebuild_review_schedules(db)
+        print(f"Rebuilt {count} review schedules")
+        print("Rebuilding word difficulty ranking...")
+        count = rebuild_word_difficulty(db)
+        print(f"Ranked {count} words")
+    finally:
+        db.close()
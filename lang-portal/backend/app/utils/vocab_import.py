@@ -0,0 +1,284 @@
+"""Import vocab-importer output into the words, groups and word_groups tables.
+
+vocab-importer writes files in the `vocab_examples` schema of its
+utils/validators.py:
+
+    {"vocab_examples": [
+        {"language": "ja", "group": "Adjectives", "generated_at": "...",
+         "vocab": [{"script": "...", "transliteration": "...", "meaning": "...", ...}]}
+    ]}
+
+Files are parsed one group at a time and words are upserted in batches keyed
+on (language_code, script), so neither the file nor the import is held in
+memory as a whole.
+"""
+import codecs
+import json
+import time
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Group, Language, Word, WordGroup
+from app.utils.db_utils import dialect_insert
+
+# Words per upsert statement
+IMPORT_BATCH_SIZE = 1000
+
+# Bytes read from a file at a time while parsing
+READ_SIZE = 64 * 1024
+
+class VocabImportError(ValueError):
+    """The file is not a valid vocab_examples file; nothing is imported."""
+
+def iter_vocab_groups(file: BinaryIO, read_size: int = READ_SIZE) -> Iterator[Dict]:
+    """Yield the groups of a vocab_examples file one at a time while reading it in chunks.
+
+    Only the group being decoded is buffered, whatever the size of the file.
+    """
+    decoder = json.JSONDecoder()
+    # Keeps the bytes of a character split across two reads
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill(size: int) -> bool:
+        nonlocal buffer, pos, eof
+        while not eof:
+            data = file.read(size)
+            try:
+                chunk = utf8.decode(data, final=not data)
+            except UnicodeDecodeError:
+                raise VocabImportError("File is not valid UTF-8")
+            eof = not data
+            if chunk:
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                return True
+        return False
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill(read_size):
+                raise VocabImportError("Unexpected end of file")
+
+    def expect(char: str):
+        nonlocal pos
+        if peek() != char:
+            raise VocabImportError(f"Invalid JSON: expected '{char}'")
+        pos += 1
+
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                result, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Incomplete value: read more, growing reads so large values parse in linear time
+                if fill(max(read_size, len(buffer))):
+                    continue
+                raise VocabImportError(f"Invalid JSON: {e.msg}")
+            # A number ending at the end of the buffer may continue in the next read
+            if end == len(buffer) and fill(read_size):
+                continue
+            pos = end
+            return result
+
+    found = False
+    expect("{")
+    if peek() == "}":
+        raise VocabImportError("Missing vocab_examples")
+    while True:
+        key = value()
+        expect(":")
+        if key == "vocab_examples":
+            found = True
+            expect("[")
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    group = value()
+                    if not isinstance(group, dict):
+                        raise VocabImportError("vocab_examples must be a list of groups")
+                    yield group
+                    if peek() == "]":
+                        pos += 1
+                        break
+                    expect(",")
+        else:
+            value()
+        if peek() == "}":
+            break
+        expect(",")
+    if not found:
+        raise VocabImportError("Missing vocab_examples")
+
+def _word_row(language_code: str, entry) -> Optional[Dict]:
+    """The words row of a vocab entry, or None if the entry lacks a script or meaning."""
+    if not isinstance(entry, dict):
+        return None
+    script, meaning = entry.get("script"), entry.get("meaning")
+    if not isinstance(script, str) or not script.strip() or not isinstance(meaning, str) or not meaning.strip():
+        return None
+    transliteration = entry.get("transliteration")
+    return {
+        "language_code": language_code,
+        "script": script.strip(),
+        "transliteration": transliteration if isinstance(transliteration, str) and transliteration else None,
+        "meaning": meaning.strip()
+    }
+
+class _Importer:
+    """State of one import: resolved groups, pending words and the running counts."""
+
+    def __init__(self, db: Session, batch_size: int):
+        self.connection = db.connection()
+        # Upserts are written with the dialect's insert(), which has on_conflict_do_update
+        self.insert = dialect_insert(self.connection)
+        self.batch_size = batch_size
+        self.languages = set(db.scalars(select(Language.code)))
+        self.groups: Dict[Tuple[str, str], int] = {}
+        self.pending: List[Tuple[int, Dict]] = []
+        self.counts = {"groups_created": 0, "inserted": 0, "updated": 0, "skipped": 0, "links_created": 0}
+
+    def group_id(self, language_code: str, name: str) -> int:
+        key = (language_code, name)
+        if key not in self.groups:
+            group_id = self.connection.execute(
+                select(Group.id).where(Group.language_code == language_code, Group.name == name).order_by(Group.id).limit(1)
+            ).scalar()
+            if group_id is None:
+                group_id = self.connection.execute(
+                    self.insert(Group).values(language_code=language_code, name=name).returning(Group.id)
+                ).scalar_one()
+                self.counts["groups_created"] += 1
+            self.groups[key] = group_id
+        return self.groups[key]
+
+    def add_group(self, group: Dict):
+        language_code, name, vocab = group.get("language"), group.get("group"), group.get("vocab")
+        if not isinstance(name, str) or not name.strip() or not isinstance(vocab, list):
+            raise VocabImportError("Every group needs a group name and a vocab list")
+        if not isinstance(language_code, str):
+            raise VocabImportError("Every group needs a language code")
+        if language_code not in self.languages:
+            raise VocabImportError(f"Unknown language code: {language_code}")
+        group_id = self.group_id(language_code, name.strip())
+        for entry in vocab:
+            row = _word_row(language_code, entry)
+            if row is None:
+                self.counts["skipped"] += 1
+                continue
+            self.pending.append((group_id, row))
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Upsert the pending words and link them to their groups, a few statements per batch."""
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        ids: Dict[Tuple[str, str], int] = {}
+        current: Dict[Tuple[str, str], Tuple[Optional[str], str]] = {}
+        for language_code in {row["language_code"] for _, row in pending}:
+            scripts = {row["script"] for _, row in pending if row["language_code"] == language_code}
+            for word_id, script, transliteration, meaning in self.connection.execute(
+                select(Word.id, Word.script, Word.transliteration, Word.meaning).where(
+                    Word.language_code == language_code,
+                    Word.script.in_(sorted(scripts))
+                )
+            ):
+                ids[(language_code, script)] = word_id
+                current[(language_code, script)] = (transliteration, meaning)
+
+        # Classify in file order, so a word repeated in the import counts once per change
+        changed: Dict[Tuple[str, str], Dict] = {}
+        for _, row in pending:
+            key = (row["language_code"], row["script"])
+            values = (row["transliteration"], row["meaning"])
+            if key not in current:
+                self.counts["inserted"] += 1
+            elif current[key] != values:
+                self.counts["updated"] += 1
+            else:
+                self.counts["skipped"] += 1
+                continue
+            current[key] = values
+            changed[key] = row
+
+        if changed:
+            statement = self.insert(Word)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Word.language_code, Word.script],
+                set_={"transliteration": statement.excluded.transliteration, "meaning": statement.excluded.meaning}
+            ).returning(Word.id, Word.language_code, Word.script)
+            # executemany of one cached statement, sent as multi-row batches by SQLAlchemy
+            for word_id, language_code, script in self.connection.execute(statement, list(changed.values())):
+                ids[(language_code, script)] = word_id
+
+        links = {(ids[(row["language_code"], row["script"])], group_id) for group_id, row in pending}
+        result = self.connection.execute(
+            self.insert(WordGroup).on_conflict_do_nothing(),
+            [{"word_id": word_id, "group_id": group_id} for word_id, group_id in links]
+        )
+        self.counts["links_created"] += result.rowcount
+
+def import_vocab(db: Session, files: Iterable[BinaryIO], batch_size: int = IMPORT_BATCH_SIZE) -> Dict:
+    """Import vocab_examples files in a single transaction.
+
+    Words are upserted on (language_code, script): new words are inserted, words
+    whose transliteration or meaning changed are updated, and unchanged or
+    incomplete entries are skipped. Groups are matched by language and name and
+    created when missing. Raises VocabImportError, after rolling back, if any
+    file is malformed or names an unknown language.
+    Returns the counts and throughput of the import.
+    """
+    start = time.perf_counter()
+    files_imported = 0
+    try:
+        importer = _Importer(db, batch_size)
+        for file in files:
+            for group in iter_vocab_groups(file):
+                importer.add_group(group)
+            files_imported += 1
+        importer.flush()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    seconds = time.perf_counter() - start
+    rows = importer.counts["inserted"] + importer.counts["updated"] + importer.counts["skipped"]
+    return {
+        "files": files_imported,
+        **importer.counts,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else rows
+    }
+
+if __name__ == "__main__":
+    import argparse
+    from app.database import get_db_url, setup_db
+
+    parser = argparse.ArgumentParser(description="Import vocab-importer JSON files")
+    parser.add_argument("files", nargs="+", help="{language}_{category}.json files")
+    args = parser.parse_args()
+
+    _, SessionLocal = setup_db(get_db_url())
+    db = SessionLocal()
+    handles = [open(path, "rb") for path in args.files]
+    try:
+        report = import_vocab(db, handles)
+        print(json.dumps(report, indent=2))
+    except VocabImportError as e:
+        raise SystemExit(f"Import failed, nothing was imported: {e}")
+    finally:
+        for handle in handles:
+            handle.close()
+        db.close()
@@ -0,0 +1,119 @@
+"""Requests/sec and p99 latency of the sync and async database modes under concurrent load.
+
+Each mode is served by its own uvicorn process on the same synthetic database
+and hit by a fixed number of concurrent clients:
+
+    python -m benchmarks.bench_async_mode --concurrency 64 --requests 2000
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from benchmarks.common import create_benchmark_db, summarize
+import httpx
+
+ROUTES = [
+    "/words?language_code=ja&page=5",
+    "/dashboard/quick-stats?language_code=ja",
+]
+
+def serve(db_path: str, mode: str, port: int):
+    """Run the app with routes bound to db_path in the given mode."""
+    import uvicorn
+    from app.database import setup_async_db, setup_db
+    from app.main import app, get_db
+
+    db_url = f"sqlite:///{db_path}"
+    if mode == "async":
+        _, session_factory = setup_async_db(db_url)
+
+        async def override_get_db():
+            async with session_factory() as db:
+                yield db
+    else:
+        _, session_factory = setup_db(db_url)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+async def wait_until_ready(base_url: str, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                await client.get("/health")
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+async def load(base_url: str, route: str, concurrency: int, requests: int):
+    """Issue requests GETs with concurrency clients in flight; return (req/s, latencies)."""
+    latencies = []
+    remaining = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get(route)
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return requests / elapsed, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database mode")
+    parser.add_argument("--db", default="/tmp/lang_portal_bench.db")
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--reviews", type=int, default=200000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serve", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.db, args.serve, args.port)
+        return
+
+    engine, _ = create_benchmark_db(
+        args.db, words=args.words, sessions=args.sessions, reviews=args.reviews
+    )
+    engine.dispose()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"{'mode':6} {'route':42} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode in ("sync", "async"):
+        server = subprocess.Popen([
+            sys.executable, "-m", "benchmarks.bench_async_mode",
+            "--serve", mode, "--db", args.db, "--port", str(args.port)
+        ])
+        try:
+            asyncio.run(wait_until_ready(base_url))
+            for route in ROUTES:
+                # Warm up connections and the SQLite page cache before measuring
+                asyncio.run(load(base_url, route, args.concurrency, args.concurrency))
+                rps, latencies = asyncio.run(load(base_url, route, args.concurrency, args.requests))
+                _, p50, p99 = summarize(latencies)
+                print(f"{mode:6} {route:42} {rps:>8.1f} {p50:>9.2f} {p99:>9.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Rows/sec and server memory of the streaming export routes.
+
+The app is served by a uvicorn process on a synthetic database and every
+export is read to the end by a streaming client, as a local consumer would.
+The server's peak RSS (VmHWM, Linux only) is reported after each export, so
+running with different --reviews shows whether memory stays flat:
+
+    python -m benchmarks.bench_export --reviews 1000000
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from benchmarks.bench_async_mode import wait_until_ready
+from benchmarks.common import create_benchmark_db
+import httpx
+
+ROUTES = [
+    "/export/reviews?language_code=ja&format=ndjson",
+    "/export/reviews?language_code=ja&format=csv",
+    "/export/words?language_code=ja&format=ndjson",
+    "/export/words?language_code=ja&format=csv&date_from=2000-01-01",
+]
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+async def export(base_url: str, route: str):
+    """Read one export to the end; return (rows, bytes, seconds)."""
+    rows = size = 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        start = time.perf_counter()
+        async with client.stream("GET", route) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                rows += chunk.count(b"\n")
+                size += len(chunk)
+        elapsed = time.perf_counter() - start
+    if "format=csv" in route:
+        rows -= 1  # header
+    return rows, size, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming export routes")
+    parser.add_argument("--db", default="/tmp/lang_portal_bench.db")
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--reviews", type=int, default=500000)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    engine, _ = create_benchmark_db(
+        args.db, words=args.words, sessions=args.sessions, reviews=args.reviews
+    )
+    engine.dispose()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.bench_async_mode",
+        "--serve", args.mode, "--db", args.db, "--port", str(args.port)
+    ])
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        print(f"server peak RSS before exports: {peak_rss_mb(server.pid):.1f} MB")
+        print(f"{'route':66} {'rows':>9} {'MB':>7} {'seconds':>8} {'rows/s':>9} {'peak RSS MB':>12}")
+        for route in ROUTES:
+            rows, size, elapsed = asyncio.run(export(base_url, route))
+            print(f"{route:66} {rows:>9} {size / 1e6:>7.1f} {elapsed:>8.2f} "
+                  f"{rows / elapsed:>9.0f} {peak_rss_mb(server.pid):>12.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
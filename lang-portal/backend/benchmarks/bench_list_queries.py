@@ -0,0 +1,71 @@
+"""Statements and latency per request for the paginated list routes.
+
+Compares include_total=true (cheap ungrouped count) with include_total=false,
+and shows what the old Query.count() over the grouped list query costs on the
+same data:
+
+    python -m benchmarks.bench_list_queries --reviews 500000
+"""
+import argparse
+from benchmarks.common import create_benchmark_db, statement_counter, time_calls, summarize
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from app.main import app, get_db
+from app.models import Group, StudySession, WordReviewItem
+
+ROUTES = [
+    "/words?language_code=ja&page=5",
+    "/groups?language_code=ja&page=2",
+    "/groups?language_code=ja&sort_by=words_count&order=desc",
+    "/study-sessions?language_code=ja&page=5",
+    "/study-activities/1?language_code=ja&page=5",
+]
+
+def legacy_grouped_count(db):
+    """The pre-helper total: Query.count() over the joined, grouped session query."""
+    return db.query(
+        StudySession,
+        func.max(WordReviewItem.created_at),
+        func.count(WordReviewItem.id)
+    ).join(StudySession.group).outerjoin(
+        WordReviewItem, WordReviewItem.study_session_id == StudySession.id
+    ).filter(Group.language_code == "ja").group_by(StudySession.id).count()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list route queries")
+    parser.add_argument("--db", default="/tmp/lang_portal_bench.db")
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--reviews", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine, session_factory = create_benchmark_db(
+        args.db, words=args.words, sessions=args.sessions, reviews=args.reviews
+    )
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    print(f"{'route':62} {'statements':>10} {'mean ms':>9} {'p99 ms':>9}")
+    with TestClient(app) as client:
+        for route in ROUTES:
+            for include_total in ("true", "false"):
+                url = f"{route}&include_total={include_total}"
+                with statement_counter(engine) as counter:
+                    latencies = time_calls(lambda: client.get(url), args.repeat)
+                mean, _, p99 = summarize(latencies)
+                print(f"{url:62} {counter['statements'] / args.repeat:>10.1f} {mean:>9.2f} {p99:>9.2f}")
+    app.dependency_overrides.clear()
+
+    with session_factory() as db:
+        mean, _, p99 = summarize(time_calls(lambda: legacy_grouped_count(db), args.repeat))
+    print(f"{'legacy grouped Query.count() for /study-sessions':62} {1:>10.1f} {mean:>9.2f} {p99:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Latency of /words/search (FTS5) against a LIKE '%q%' scan over the same columns.
+
+Fills a database with accented pseudo-words in French and Spanish, then runs
+each query both ways, first page plus total as the route does:
+
+    python -m benchmarks.bench_search --words 200000
+"""
+import argparse
+import os
+import random
+import time
+from benchmarks.common import summarize, time_calls
+from fastapi.testclient import TestClient
+from sqlalchemy import func, or_
+from app.database import Base, setup_db
+from app.main import app, get_db
+from app.models import Language, Word
+from app.seed import bulk_insert
+from app.utils.search import build_match_query, words_fts, words_fts_rank
+
+SYLLABLES = {
+    "fr": ["é", "è", "ê", "ç", "ou", "an", "on", "ai", "eau", "ille", "ré", "mè", "là", "ter", "gnon", "pâ", "bri", "lu"],
+    "es": ["ñ", "á", "í", "ó", "ú", "ll", "rr", "ca", "ma", "ña", "dó", "gü", "che", "to", "ra", "sé", "la", "mi"],
+}
+CONSONANTS = "bcdfglmnprstv"
+MEANINGS = ["house", "river", "bread", "morning", "school", "garden", "window", "market", "letter", "mountain",
+            "silver", "teacher", "summer", "winter", "kitchen", "friend", "forest", "island", "street", "evening"]
+
+def pseudo_words(language_code: str, count: int, rng: random.Random):
+    """Yield count distinct words rows of accented pseudo-words for one language."""
+    syllables = SYLLABLES[language_code]
+    for i in range(count):
+        parts = [rng.choice(CONSONANTS) + rng.choice(syllables) for _ in range(rng.randint(2, 4))]
+        script = "".join(parts)
+        yield {
+            "language_code": language_code,
+            # The suffix keeps (language_code, script) unique
+            "script": f"{script}{i:x}",
+            "transliteration": None,
+            "meaning": f"{rng.choice(MEANINGS)} {rng.choice(MEANINGS)} of {rng.choice(MEANINGS)}",
+        }
+
+def fold_accents(text: str) -> str:
+    """Strip the accents used by the generator, as a user typing without them would."""
+    return text.translate(str.maketrans("éèêçâàáíóúñü", "eeecaaaiounu"))
+
+def fts_search(db, q: str, language_code: str, per_page: int):
+    query = (
+        db.query(Word)
+        .join(words_fts, words_fts.c.rowid == Word.id)
+        .filter(words_fts.c.words_fts.op("MATCH")(build_match_query(q, language_code)))
+    )
+    return query.order_by(words_fts_rank, Word.id).limit(per_page).all(), query.with_entities(func.count()).scalar()
+
+def like_search(db, q: str, language_code: str, per_page: int):
+    pattern = f"%{q}%"
+    query = db.query(Word).filter(
+        Word.language_code == language_code,
+        or_(Word.script.like(pattern), Word.transliteration.like(pattern), Word.meaning.like(pattern))
+    )
+    return query.order_by(Word.id).limit(per_page).all(), query.with_entities(func.count()).scalar()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 word search against LIKE")
+    parser.add_argument("--db", default="/tmp/lang_portal_bench_search.db")
+    parser.add_argument("--words", type=int, default=100000, help="Words per language")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    engine, session_factory = setup_db(f"sqlite:///{args.db}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(args.seed)
+    with session_factory() as db:
+        db.add_all([Language(code="fr", name="French"), Language(code="es", name="Spanish")])
+        db.commit()
+        start = time.perf_counter()
+        for code in SYLLABLES:
+            bulk_insert(db, Word, pseudo_words(code, args.words, rng))
+        seconds = time.perf_counter() - start
+    print(f"inserted {2 * args.words} words with the FTS triggers in {seconds:.1f}s "
+          f"({2 * args.words / seconds:,.0f} rows/s)")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    # Selective queries (unaccented prefixes of existing scripts) and broad ones (common meaning words)
+    with session_factory() as db:
+        scripts = [script for (script,) in db.query(Word.script).filter(Word.language_code == "fr").limit(5000)]
+    query_sets = {
+        "script prefix": [fold_accents(rng.choice(scripts)[:rng.randint(4, 6)]) for _ in range(args.queries)],
+        "meaning word": [rng.choice(MEANINGS)[:rng.randint(4, 6)] for _ in range(args.queries)],
+    }
+
+    print(f"{'queries':14} {'method':20} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'matches/query':>14}")
+    with session_factory() as db:
+        for label, queries in query_sets.items():
+            for name, search in (("FTS5 MATCH + bm25", fts_search), ("LIKE '%q%' scan", like_search)):
+                latencies, matches = [], 0
+                for q in queries:
+                    latencies += time_calls(lambda: search(db, q, "fr", 10), args.repeat)
+                    matches += search(db, q, "fr", 10)[1]
+                mean, p50, p99 = summarize(latencies)
+                print(f"{label:14} {name:20} {mean:>9.2f} {p50:>9.2f} {p99:>9.2f} {matches / len(queries):>14.0f}")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        latencies = []
+        for q in query_sets["script prefix"]:
+            latencies += time_calls(lambda: client.get("/words/search", params={"q": q, "language_code": "fr"}), args.repeat)
+    app.dependency_overrides.clear()
+    mean, p50, p99 = summarize(latencies)
+    print(f"{'script prefix':14} {'GET /words/search':20} {mean:>9.2f} {p50:>9.2f} {p99:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Serialization time per 1,000 listed items: response_model validation against FastJSONResponse.
+
+Loads pages of words and study sessions from a synthetic database once, then
+times only the step from query rows to response bytes, both ways:
+
+- response_model: ORM rows turned into dicts or schema objects, validated and
+  serialized by FastAPI against the route's response_model, rendered by JSONResponse
+- FastJSONResponse: named rows turned into plain dicts, rendered by orjson
+
+    python -m benchmarks.bench_serialization --items 1000
+"""
+import argparse
+import asyncio
+from benchmarks.common import create_benchmark_db, summarize, time_calls
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import func
+from app.models import Group, StudySession, Word, WordReviewItem
+from app.responses import FastJSONResponse
+from app.routers.sessions import session_item, session_rows
+from app.routers.words import WORD_LIST_COLUMNS, _word_item
+from app.schemas import PaginatedStudySessions, PaginatedWords, StudySessionDetail
+
+def page(items):
+    return {"total": len(items), "items": items, "page": 1, "per_page": len(items), "next_cursor": None}
+
+def render_with_response_model(field, content):
+    """What FastAPI does with a route's return value when it is not a Response."""
+    serialized = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(serialized).body
+
+def words_with_response_model(field, words):
+    items = [
+        {
+            "id": word.id,
+            "script": word.script,
+            "transliteration": word.transliteration,
+            "meaning": word.meaning,
+            "stats": {"correct_count": word.correct_count, "wrong_count": word.wrong_count}
+        }
+        for word in words
+    ]
+    return render_with_response_model(field, page(items))
+
+def sessions_with_response_model(field, rows):
+    items = [
+        StudySessionDetail(
+            id=session.id,
+            group=session.group,
+            activity=session.activity,
+            created_at=session.created_at.isoformat(),
+            last_review_at=last_review_at.isoformat() if last_review_at else None,
+            reviews_count=reviews_count
+        )
+        for session, last_review_at, reviews_count in rows
+    ]
+    return render_with_response_model(field, PaginatedStudySessions(**page(items)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--db", default="/tmp/lang_portal_bench_serialization.db")
+    parser.add_argument("--items", type=int, default=1000, help="Items per serialized page")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    _, session_factory = create_benchmark_db(
+        args.db, words=max(args.items, 5000), sessions=max(args.items, 2000), reviews=100000
+    )
+    with session_factory() as db:
+        words = db.query(Word).filter(Word.language_code == "ja").order_by(Word.id).limit(args.items).all()
+        word_rows = db.query(*WORD_LIST_COLUMNS).filter(Word.language_code == "ja").order_by(Word.id).limit(args.items).all()
+        sessions = db.query(
+            StudySession,
+            func.max(WordReviewItem.created_at),
+            func.count(WordReviewItem.id)
+        ).join(StudySession.group).outerjoin(
+            WordReviewItem, WordReviewItem.study_session_id == StudySession.id
+        ).filter(Group.language_code == "ja").group_by(StudySession.id).order_by(StudySession.id).limit(args.items).all()
+        # Touch the relationships so lazy loads are not timed
+        for session, _, _ in sessions:
+            session.group, session.activity
+        session_page = session_rows(db).filter(Group.language_code == "ja").order_by(StudySession.id).limit(args.items).all()
+
+        words_field = create_response_field(name="words", type_=PaginatedWords, mode="serialization")
+        sessions_field = create_response_field(name="sessions", type_=PaginatedStudySessions, mode="serialization")
+        cases = [
+            ("words", "response_model", lambda: words_with_response_model(words_field, words)),
+            ("words", "FastJSONResponse", lambda: FastJSONResponse(page([_word_item(row) for row in word_rows])).body),
+            ("study sessions", "response_model", lambda: sessions_with_response_model(sessions_field, sessions)),
+            ("study sessions", "FastJSONResponse", lambda: FastJSONResponse(page([session_item(row) for row in session_page])).body),
+        ]
+
+        print(f"{'items':16} {'path':18} {'ms/1000 items':>14} {'p99 ms/1000':>12} {'bytes':>9}")
+        for label, path, render in cases:
+            body = render()
+            mean, _, p99 = summarize(time_calls(render, args.repeat))
+            scale = 1000 / args.items
+            print(f"{label:16} {path:18} {mean * scale:>14.2f} {p99 * scale:>12.2f} {len(body):>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Read/write throughput under concurrency with and without the SQLite connection profile.
+
+Writer threads record reviews one committed transaction at a time (the
+/study-sessions/{id}/reviews write path) while reader threads page through
+words and aggregate session statistics. Each profile runs against its own
+copy of the same synthetic database:
+
+    python -m benchmarks.bench_sqlite_profile --writers 4 --readers 8 --seconds 10
+"""
+import argparse
+import random
+import shutil
+import threading
+import time
+from benchmarks.common import create_benchmark_db, summarize
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from app.core.config import settings
+from app.database import setup_db
+from app.models import Group, StudySession, Word, WordReviewItem
+
+PROFILES = {
+    # SQLite's defaults: rollback journal, fsync on every commit, small page cache
+    "default": {"journal_mode": "DELETE", "synchronous": "FULL"},
+    "tuned": settings.sqlite_pragmas,
+}
+
+def write_review(db, rng, words, sessions):
+    db.add(WordReviewItem(
+        word_id=rng.randint(1, words),
+        study_session_id=rng.randint(1, sessions),
+        correct=rng.random() < 0.7
+    ))
+    db.commit()
+
+def read_lists(db, rng, words, sessions):
+    db.query(Word).filter(Word.language_code == "ja").order_by(Word.id).offset(
+        rng.randint(0, max(words - 10, 0))
+    ).limit(10).all()
+    db.query(
+        func.count(WordReviewItem.id), func.count(func.distinct(StudySession.id))
+    ).join(
+        StudySession, StudySession.id == WordReviewItem.study_session_id
+    ).join(
+        Group, Group.id == StudySession.group_id
+    ).filter(Group.language_code == "ja").first()
+    db.rollback()
+
+def run_profile(db_path, pragmas, args):
+    engine, session_factory = setup_db(f"sqlite:///{db_path}", pragmas=pragmas)
+    stop = threading.Event()
+    results = {"write": [], "read": []}
+    errors = {"write": 0, "read": 0}
+    lock = threading.Lock()
+
+    def worker(kind, fn, seed):
+        rng = random.Random(seed)
+        latencies = []
+        failed = 0
+        with session_factory() as db:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    fn(db, rng, args.words, args.sessions)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                except OperationalError:  # "database is locked"
+                    db.rollback()
+                    failed += 1
+        with lock:
+            results[kind].extend(latencies)
+            errors[kind] += failed
+
+    threads = [threading.Thread(target=worker, args=("write", write_review, i)) for i in range(args.writers)]
+    threads += [threading.Thread(target=worker, args=("read", read_lists, 1000 + i)) for i in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return results, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite connection profile")
+    parser.add_argument("--db", default="/tmp/lang_portal_bench.db")
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--reviews", type=int, default=200000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    engine, _ = create_benchmark_db(
+        args.db, words=args.words, sessions=args.sessions, reviews=args.reviews
+    )
+    engine.dispose()
+
+    print(f"{'profile':8} {'op':6} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'locked':>7}")
+    for name, pragmas in PROFILES.items():
+        copy_path = f"{args.db}.{name}"
+        shutil.copyfile(args.db, copy_path)
+        results, errors = run_profile(copy_path, pragmas, args)
+        for kind in ("write", "read"):
+            latencies = results[kind] or [0.0]
+            _, p50, p99 = summarize(latencies)
+            print(f"{name:8} {kind:6} {len(results[kind]) / args.seconds:>9.1f} "
+                  f"{p50:>9.2f} {p99:>9.2f} {errors[kind]:>7}")
+
+if __name__ == "__main__":
+    main()
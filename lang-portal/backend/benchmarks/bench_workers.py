@@ -0,0 +1,88 @@
+"""Requests/sec and latency of /words as the number of worker processes grows.
+
+Serves the app from 1 to N worker processes on the same synthetic database,
+each with its own read-only pool, and hits it with a fixed number of
+concurrent clients. Workers are started with gunicorn and gunicorn.conf.py
+when it is installed, otherwise with uvicorn --workers:
+
+    python -m benchmarks.bench_workers --workers 1 2 4 8 --concurrency 64 --requests 4000
+
+Throughput can only scale up to the number of CPU cores. --db also takes a
+PostgreSQL URL, whose contents are replaced; every worker then has a pool of
+--pool-size connections plus --max-overflow under load, so workers times their
+sum must stay below the server's max_connections:
+
+    python -m benchmarks.bench_workers --db postgresql://postgres@localhost/lang_portal_bench \
+        --workers 1 2 4 8 --pool-size 10 --max-overflow 5
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+from benchmarks.bench_async_mode import load, wait_until_ready
+from benchmarks.common import benchmark_db_url, create_benchmark_db, summarize
+
+ROUTES = [
+    "/words?language_code=ja&page=5",
+    "/words?language_code=ja&sort_by=correct_count&order=desc&per_page=50",
+]
+
+def start_server(workers: int, port: int, db_path: str, server: str, pool_size: int, max_overflow: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": benchmark_db_url(db_path),
+        "DB_POOL_SIZE": str(pool_size),
+        "DB_MAX_OVERFLOW": str(max_overflow),
+        "ENVIRONMENT": "production",
+        "TESTING": "false",
+        # Measure the queries, not the per-worker response caches
+        "RESPONSE_CACHE_BACKEND": "off",
+        "WEB_CONCURRENCY": str(workers),
+        "BIND": f"127.0.0.1:{port}",
+    }
+    if server == "gunicorn":
+        command = ["gunicorn", "app.main:app", "--config", "gunicorn.conf.py", "--log-level", "warning"]
+    else:
+        command = ["uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+                   "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(command, env=env)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /words throughput from 1 to N workers")
+    parser.add_argument("--db", default="/tmp/lang_portal_bench_workers.db", help="SQLite file path or database URL")
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--reviews", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8766)
+    # Connection pool of each worker on a server database (DB_POOL_SIZE, DB_MAX_OVERFLOW)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--max-overflow", type=int, default=5)
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn"],
+                        default="gunicorn" if shutil.which("gunicorn") else "uvicorn")
+    args = parser.parse_args()
+
+    engine, _ = create_benchmark_db(args.db, words=args.words, reviews=args.reviews)
+    engine.dispose()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"server: {args.server}, cores: {os.cpu_count()}, database: {benchmark_db_url(args.db).split(':')[0]}")
+    print(f"{'workers':>7} {'route':70} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for workers in args.workers:
+        server = start_server(workers, args.port, args.db, args.server, args.pool_size, args.max_overflow)
+        try:
+            asyncio.run(wait_until_ready(base_url, timeout=60))
+            for route in ROUTES:
+                # Warm up every worker's connections and the SQLite page cache before measuring
+                asyncio.run(load(base_url, route, args.concurrency, args.concurrency * workers))
+                rps, latencies = asyncio.run(load(base_url, route, args.concurrency, args.requests))
+                _, p50, p99 = summarize(latencies)
+                print(f"{workers:>7} {route:70} {rps:>8.1f} {p50:>9.2f} {p99:>9.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
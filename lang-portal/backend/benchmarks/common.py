@@ -0,0 +1,69 @@
+"""Shared helpers for the benchmark scripts in this package.
+
+Benchmarks run against a throwaway SQLite file filled with synthetic data, e.g.:
+
+    python -m benchmarks.bench_list_queries --words 20000 --reviews 500000
+
+create_benchmark_db also takes a database URL instead of a path, e.g. of a
+PostgreSQL database whose contents may be replaced.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+# The app reads its settings at import time
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:5173")
+os.environ.setdefault("TESTING", "true")
+# Measure the queries themselves, not hits of the response cache
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "off")
+
+from sqlalchemy import event
+from app.database import setup_db
+from app.seed import seed_synthetic
+
+def benchmark_db_url(path: str) -> str:
+    """The URL of a benchmark database given as a SQLite file path or as a URL."""
+    return path if "://" in path else f"sqlite:///{path}"
+
+def create_benchmark_db(path: str, words: int = 5000, groups: int = 50, sessions: int = 2000,
+                        reviews: int = 100000, seed: int = 42):
+    """Fill a fresh database at path (a SQLite file or a database URL) with synthetic data for one language ("ja")."""
+    if "://" not in path and os.path.exists(path):
+        os.remove(path)
+    engine, session_factory = setup_db(benchmark_db_url(path))
+    with session_factory() as db:
+        seed_synthetic(db, languages=1, words=words, groups=groups, sessions=sessions, reviews=reviews, seed=seed)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return engine, session_factory
+
+@contextmanager
+def statement_counter(engine):
+    """Count statements executed on engine while the block runs."""
+    counter = {"statements": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def time_calls(fn, repeat: int):
+    """Call fn repeat times and return the latencies in milliseconds."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def summarize(latencies):
+    """Return (mean, p50, p99) of a list of latencies."""
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return statistics.mean(ordered), statistics.median(ordered), p99
@@ -0,0 +1,28 @@
+"""Multi-process deployment: gunicorn managing uvicorn workers.
+
+    pip install gunicorn
+    gunicorn app.main:app
+
+Each worker runs the app's lifespan on its own: the first one to take the
+startup lock creates and seeds the database, then every worker opens its own
+read-only pool for GET requests and a single writer connection. Workers share
+nothing but the database file, so use RESPONSE_CACHE_BACKEND=redis (or off)
+to let writes in one worker invalidate the responses cached by the others.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# SQLite serializes writers, so more workers than cores only adds lock contention
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Seconds a worker may spend on a request (e.g. a large import) before being restarted
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+
+def on_starting(server):
+    if workers > 1 and os.getenv("RESPONSE_CACHE_BACKEND", "memory") == "memory":
+        server.log.warning(
+            "RESPONSE_CACHE_BACKEND=memory keeps one cache per worker; writes only invalidate the "
+            "worker handling them. Use RESPONSE_CACHE_BACKEND=redis or off with several workers."
+        )
@@ -1,10 +1,23 @@
 import pytest
 import os
+from contextlib import contextmanager
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.database import Base, get_test_db_url, setup_db
+from app.cache import response_cache
 from app.main import app, get_db
+from app.models import Group, Language, StudyActivity, StudySession, Word, WordGroup, WordReviewItem
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the tests marked sqlite_only or postgresql_only on the other database."""
+    backend = make_url(get_test_db_url()).get_backend_name()
+    for item in items:
+        for marker, required in (("sqlite_only", "sqlite"), ("postgresql_only", "postgresql")):
+            if item.get_closest_marker(marker) and backend != required:
+                item.add_marker(pytest.mark.skip(reason=f"runs on {required} only"))
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -34,9 +47,77 @@ def client(db_session):
 
     with TestClient(app) as c:
         app.dependency_overrides[get_db] = override_get_db
+        # Every test starts with a fresh database, so nothing cached may carry over
+        if response_cache is not None:
+            c.portal.call(response_cache.clear)
         yield c
         app.dependency_overrides.clear()
 
+@pytest.fixture(scope="function")
+def query_counter(db_session):
+    """Count the SQL statements run on the test connection inside a with block.
+
+        with query_counter() as statements:
+            client.get("/words?language_code=ja")
+        assert len(statements) == 2
+    """
+    connection = db_session.connection()
+
+    @contextmanager
+    def count():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(connection, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+    return count
+
+@pytest.fixture(scope="function")
+def languages(db_session):
+    """The languages that test rows refer to; PostgreSQL enforces the foreign keys SQLite leaves unchecked."""
+    db_session.add_all([
+        Language(code="ja", name="Japanese"),
+        Language(code="fr", name="French"),
+        Language(code="es", name="Spanish"),
+        Language(code="ar", name="Arabic"),
+    ])
+    db_session.commit()
+
+# Size of the study_history fixture
+HISTORY_GROUPS = 6
+HISTORY_SESSIONS = 24
+
+@pytest.fixture(scope="function")
+def study_history(db_session):
+    """Sessions spread over distinct groups and activities, more than fit on one page."""
+    db_session.add(Language(code="ja", name="Japanese"))
+    groups = [Group(name=f"Group {g}", language_code="ja") for g in range(HISTORY_GROUPS)]
+    activities = [
+        StudyActivity(name=f"Activity {a}", url=f"/a{a}", description="", image_url="", is_language_specific=False)
+        for a in range(3)
+    ]
+    words = [Word(script=f"word{i}", meaning=f"meaning{i}", language_code="ja") for i in range(HISTORY_SESSIONS)]
+    db_session.add_all([*groups, *activities, *words])
+    db_session.commit()
+    db_session.add_all([WordGroup(word_id=word.id, group_id=groups[i % HISTORY_GROUPS].id) for i, word in enumerate(words)])
+    sessions = [
+        StudySession(group_id=groups[k % HISTORY_GROUPS].id, study_activity_id=activities[0 if k % 2 else 1 + k % 2].id)
+        for k in range(HISTORY_SESSIONS)
+    ]
+    db_session.add_all(sessions)
+    db_session.commit()
+    db_session.add_all([
+        WordReviewItem(word_id=words[k].id, study_session_id=session.id, correct=k % 3 == 0)
+        for k, session in enumerate(sessions)
+    ])
+    db_session.commit()
+    return {"group_id": groups[0].id, "activity_id": activities[0].id, "session_id": sessions[0].id}
 
 @pytest.fixture(scope="function")
 def development_env(monkeypatch):
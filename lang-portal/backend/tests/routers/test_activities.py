@@ -1,4 +1,4 @@
-from app.models import StudyActivity, ActivityLanguageSupport, StudySession, WordReviewItem, Group, Language
+from app.models import StudyActivity, ActivityLanguageSupport, StudySession, Word, WordReviewItem, Group, Language
 from datetime import datetime, timedelta
 
 def test_get_study_activities(client, db_session):
@@ -71,7 +71,8 @@ def test_get_study_activity_details(client, db_session):
     db_session.commit()
     
     group = Group(name="Core Verbs", language_code="ja")
-    db_session.add(group)
+    word = Word(script="食べる", meaning="to eat", language_code="ja")
+    db_session.add_all([group, word])
     db_session.commit()
     
     # Create sessions with reviews
@@ -89,7 +90,7 @@ def test_get_study_activity_details(client, db_session):
         # Add some reviews
         for _ in range(i + 1):  # Different number of reviews per session
             review = WordReviewItem(
-                word_id=1,  # Dummy word ID
+                word_id=word.id,
                 study_session_id=session.id,
                 correct=True,
                 created_at=datetime.now() - timedelta(hours=i)
@@ -154,7 +155,8 @@ def test_get_study_activity_details_with_sorting(client, db_session):
     db_session.commit()
     
     group = Group(name="Core Verbs", language_code="ja")
-    db_session.add(group)
+    word = Word(script="食べる", meaning="to eat", language_code="ja")
+    db_session.add_all([group, word])
     db_session.commit()
     
     # Create sessions with reviews at different times
@@ -174,7 +176,7 @@ def test_get_study_activity_details_with_sorting(client, db_session):
         # Add reviews with different last review times
         review_time = base_time - timedelta(hours=i*2)  # Different review times
         review = WordReviewItem(
-            word_id=1,  # Dummy word ID
+            word_id=word.id,
             study_session_id=session.id,
             correct=True,
             created_at=review_time
@@ -182,6 +184,9 @@ def test_get_study_activity_details_with_sorting(client, db_session):
         db_session.add(review)
         db_session.commit()
     
+    # The request closes the session, so read the ids first
+    session_ids = [session.id for session in sessions]
+    
     # Test sorting by last_review_at in descending order
     response = client.get(
         f"/study-activities/{activity.id}?language_code=ja&sort_by=last_review_at&order=desc"
@@ -191,9 +196,9 @@ def test_get_study_activity_details_with_sorting(client, db_session):
     items = data["sessions"]["items"]
     
     # Most recent review should be first
-    assert items[0]["id"] == sessions[0].id
-    assert items[1]["id"] == sessions[1].id
-    assert items[2]["id"] == sessions[2].id
+    assert items[0]["id"] == session_ids[0]
+    assert items[1]["id"] == session_ids[1]
+    assert items[2]["id"] == session_ids[2]
     
     # Test sorting by last_review_at in ascending order
     response = client.get(
@@ -204,6 +209,6 @@ def test_get_study_activity_details_with_sorting(client, db_session):
     items = data["sessions"]["items"]
     
     # Oldest review should be first
-    assert items[0]["id"] == sessions[2].id
-    assert items[1]["id"] == sessions[1].id
-    assert items[2]["id"] == sessions[0].id 
\ No newline at end of file
+    assert items[0]["id"] == session_ids[2]
+    assert items[1]["id"] == session_ids[1]
+    assert items[2]["id"] == session_ids[0] 
\ No newline at end of file
@@ -1,4 +1,7 @@
-from app.models import Language
+import json
+from datetime import date
+from app.models import Language, Word, Group, StudySession, WordReviewItem, DailyActivity, ReviewSchedule, WordDifficulty
+from app.models import DailyActiveGroup, DailyStudiedWord
 
 def test_seed_database(client, db_session):
     """Test the admin seed endpoint."""
@@ -9,4 +12,257 @@ def test_seed_database(client, db_session):
     
     # Verify that the database was seeded
     languages = db_session.query(Language).all()
-    assert len(languages) > 0 
\ No newline at end of file
+    assert len(languages) > 0 
+
+def test_rebuild_word_stats(client, db_session):
+    """Test that the rebuild endpoint recomputes counters from the raw reviews."""
+    client.post("/admin/seed")
+    taberu = db_session.query(Word).filter(Word.script == "食べる").first()
+    session = StudySession(group_id=1, study_activity_id=1)
+    db_session.add(session)
+    db_session.commit()
+    db_session.add_all([
+        WordReviewItem(word_id=taberu.id, study_session_id=session.id, correct=True),
+        WordReviewItem(word_id=taberu.id, study_session_id=session.id, correct=False),
+    ])
+    db_session.commit()
+
+    # Simulate counters drifting away from the review table
+    taberu.correct_count = 42
+    taberu.wrong_count = 42
+    db_session.commit()
+
+    response = client.post("/admin/rebuild-word-stats")
+    assert response.status_code == 200
+    assert response.json()["words_updated"] == db_session.query(Word).count()
+
+    taberu = db_session.query(Word).filter(Word.script == "食べる").first()
+    assert taberu.correct_count == 1
+    assert taberu.wrong_count == 1
+
+def test_rebuild_group_word_counts(client, db_session):
+    """Test that the rebuild endpoint recomputes group word counts from the links."""
+    client.post("/admin/seed")
+    expected = {group.id: group.words_count for group in db_session.query(Group)}
+    assert sum(expected.values()) > 0
+
+    # Simulate the counts drifting away from word_groups
+    db_session.query(Group).update({Group.words_count: 42})
+    db_session.commit()
+
+    response = client.post("/admin/rebuild-group-word-counts")
+    assert response.status_code == 200
+    assert response.json()["groups_updated"] == len(expected)
+    assert {group.id: group.words_count for group in db_session.query(Group)} == expected
+
+def test_rebuild_review_schedules(client, db_session):
+    """Test that the rebuild endpoint replays the reviews into the schedules."""
+    client.post("/admin/seed")
+    session = StudySession(group_id=1, study_activity_id=1)
+    db_session.add(session)
+    db_session.commit()
+    word_id = db_session.query(ReviewSchedule.word_id).filter(ReviewSchedule.group_id == 1).first()[0]
+    # Reviews loaded directly bypass the scheduler
+    db_session.add_all([
+        WordReviewItem(word_id=word_id, study_session_id=session.id, correct=True),
+        WordReviewItem(word_id=word_id, study_session_id=session.id, correct=True),
+    ])
+    db_session.commit()
+    schedules_count = db_session.query(ReviewSchedule).count()
+    assert db_session.query(ReviewSchedule).filter(ReviewSchedule.repetitions > 0).count() == 0
+
+    response = client.post("/admin/rebuild-review-schedules")
+    assert response.status_code == 200
+    assert response.json()["schedules_updated"] == schedules_count
+
+    schedule = db_session.query(ReviewSchedule).filter_by(group_id=1, word_id=word_id).one()
+    assert (schedule.interval_days, schedule.ease, schedule.repetitions) == (6, 2.7, 2)
+    assert db_session.query(ReviewSchedule).filter(ReviewSchedule.repetitions > 0).count() == 1
+
+def test_rebuild_word_difficulty(client, db_session):
+    """Test that the rebuild endpoint ranks the recently missed words."""
+    client.post("/admin/seed")
+    taberu_id = db_session.query(Word.id).filter(Word.script == "食べる").scalar()
+    session = StudySession(group_id=1, study_activity_id=1)
+    db_session.add(session)
+    db_session.commit()
+    db_session.add_all([
+        WordReviewItem(word_id=taberu_id, study_session_id=session.id, correct=False),
+        WordReviewItem(word_id=taberu_id, study_session_id=session.id, correct=True),
+    ])
+    db_session.commit()
+
+    response = client.post("/admin/rebuild-word-difficulty")
+    assert response.status_code == 200
+    # Ranked once for each review window
+    assert response.json()["words_ranked"] == 3
+    ranked = db_session.query(WordDifficulty).filter(WordDifficulty.window_days == 30).one()
+    assert (ranked.language_code, ranked.rank, ranked.word_id, ranked.reviews, ranked.wrong) == ("ja", 1, taberu_id, 2, 1)
+
+def test_rebuild_progress_buckets(client, db_session):
+    """Test that the rebuild endpoint recomputes the progress buckets from sessions and reviews."""
+    client.post("/admin/seed")
+    taberu_id = db_session.query(Word.id).filter(Word.script == "食べる").scalar()
+    session = StudySession(group_id=1, study_activity_id=1)
+    db_session.add(session)
+    db_session.commit()
+    db_session.add(WordReviewItem(word_id=taberu_id, study_session_id=session.id, correct=True))
+    db_session.commit()
+    progress = client.get("/dashboard/progress?language_code=ja").json()
+    assert progress["words_studied"] == 1
+
+    # Simulate buckets lost to a bulk edit that bypassed the triggers
+    db_session.query(DailyStudiedWord).delete()
+    db_session.query(DailyActiveGroup).delete()
+    db_session.commit()
+    assert client.get("/dashboard/progress?language_code=ja").json()["words_studied"] == 0
+
+    response = client.post("/admin/rebuild-progress-buckets")
+    assert response.status_code == 200
+    assert response.json()["rows_written"] == 2
+    assert client.get("/dashboard/progress?language_code=ja").json() == progress
+
+def test_rebuild_daily_activity(client, db_session):
+    """Test that the rebuild endpoint recomputes the rollup from sessions and reviews."""
+    client.post("/admin/seed")
+    taberu = db_session.query(Word).filter(Word.script == "食べる").first()
+    session = StudySession(group_id=1, study_activity_id=1)
+    db_session.add(session)
+    db_session.commit()
+    db_session.add(WordReviewItem(word_id=taberu.id, study_session_id=session.id, correct=True))
+    db_session.commit()
+    expected = [
+        (row.language_code, row.date, row.sessions, row.reviews, row.correct)
+        for row in db_session.query(DailyActivity).order_by(DailyActivity.language_code, DailyActivity.date)
+    ]
+
+    # Simulate the rollup drifting away from the raw rows
+    db_session.query(DailyActivity).update({DailyActivity.sessions: 42})
+    db_session.add(DailyActivity(language_code="ja", date=date(2000, 1, 1), sessions=1))
+    db_session.commit()
+
+    response = client.post("/admin/rebuild-daily-activity")
+    assert response.status_code == 200
+    assert len(expected) == 1
+    assert response.json()["days_updated"] == len(expected)
+
+    rebuilt = [
+        (row.language_code, row.date, row.sessions, row.reviews, row.correct)
+        for row in db_session.query(DailyActivity).order_by(DailyActivity.language_code, DailyActivity.date)
+    ]
+    assert rebuilt == expected
+
+def test_seed_database_synthetic(client, db_session):
+    """Test the synthetic mode of the admin seed endpoint."""
+    response = client.post("/admin/seed?synthetic=true&languages=2&words=30&sessions=10&reviews=100")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["message"] == "Database seeded with synthetic data"
+    assert data["rows"]["words"] == 60
+    assert data["rows"]["word_review_items"] == 200
+    assert data["rows_per_second"] > 0
+
+    assert db_session.query(WordReviewItem).count() == 200
+    assert client.get("/words?language_code=ja").json()["total"] == 30
+
+def vocab_file(language="es", group="Food", vocab=None):
+    """A vocab-importer file in the vocab_examples schema."""
+    if vocab is None:
+        vocab = [
+            {"script": "pan", "transliteration": "pan", "meaning": "bread"},
+            {"script": "queso", "transliteration": "queso", "meaning": "cheese"},
+        ]
+    entries = [
+        {
+            "pronunciation_aid": [{"unit": entry["script"], "readings": [entry["script"]]}],
+            "part_of_speech": "noun",
+            "usage_examples": [{"script": entry["script"], "meaning": entry["meaning"]}],
+            "notes": "Generated",
+            **entry
+        }
+        for entry in vocab
+    ]
+    return {"vocab_examples": [
+        {"language": language, "group": group, "generated_at": "2025-02-18T12:00:00Z", "vocab": entries}
+    ]}
+
+def test_import_vocab(client, db_session):
+    """Test importing a vocab-importer file sent as the JSON body."""
+    client.post("/admin/seed")
+    words_before = db_session.query(Word).count()
+
+    response = client.post("/admin/import/vocab", json=vocab_file())
+    assert response.status_code == 200
+    data = response.json()
+    assert data["message"] == "Vocabulary imported successfully"
+    assert (data["files"], data["groups_created"], data["inserted"], data["updated"], data["skipped"]) == (1, 1, 2, 0, 0)
+    assert data["links_created"] == 2
+    assert data["rows_per_second"] > 0
+
+    assert db_session.query(Word).count() == words_before + 2
+    group = db_session.query(Group).filter(Group.name == "Food", Group.language_code == "es").one()
+    assert sorted(word.script for word in group.words) == ["pan", "queso"]
+
+def test_import_vocab_upserts(client, db_session):
+    """Test that re-importing updates changed words, skips unchanged ones and reuses groups."""
+    client.post("/admin/seed")
+    client.post("/admin/import/vocab", json=vocab_file())
+
+    response = client.post("/admin/import/vocab", json=vocab_file(vocab=[
+        {"script": "queso", "transliteration": "queso", "meaning": "cheese"},
+        {"script": "pan", "transliteration": "pan", "meaning": "bread, loaf"},
+        {"script": "agua", "transliteration": "agua", "meaning": "water"},
+        {"script": "", "transliteration": "", "meaning": "missing script"},
+    ]))
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["groups_created"], data["inserted"], data["updated"], data["skipped"]) == (0, 1, 1, 2)
+    assert data["links_created"] == 1
+
+    pan = db_session.query(Word).filter(Word.language_code == "es", Word.script == "pan").one()
+    assert pan.meaning == "bread, loaf"
+    assert db_session.query(Group).filter(Group.name == "Food").count() == 1
+
+def test_import_vocab_multipart(client, db_session):
+    """Test importing several files in one multipart upload."""
+    client.post("/admin/seed")
+    files = [
+        ("files", ("es_food.json", json.dumps(vocab_file()).encode(), "application/json")),
+        ("files", ("ja_food.json", json.dumps(vocab_file(language="ja", vocab=[
+            {"script": "パン", "transliteration": "pan", "meaning": "bread"},
+            {"script": "食べる", "transliteration": "taberu", "meaning": "to eat"},
+        ])).encode(), "application/json")),
+    ]
+    response = client.post("/admin/import/vocab", files=files)
+    assert response.status_code == 200
+    data = response.json()
+    # 食べる is already seeded with the same values
+    assert (data["files"], data["groups_created"], data["inserted"], data["updated"], data["skipped"]) == (2, 2, 3, 0, 1)
+
+    taberu = db_session.query(Word).filter(Word.language_code == "ja", Word.script == "食べる").one()
+    assert "Food" in [group.name for group in taberu.groups]
+
+def test_import_vocab_invalid_file(client, db_session):
+    """Test that an invalid file is rejected and nothing of the import is kept."""
+    db_session.add_all([
+        Language(code="es", name="Spanish"),
+        Word(script="comer", meaning="to eat", language_code="es"),
+    ])
+    db_session.commit()
+    words_before = db_session.query(Word).count()
+    body = vocab_file()
+    body["vocab_examples"].append(vocab_file(language="xx")["vocab_examples"][0])
+
+    response = client.post("/admin/import/vocab", json=body)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid vocabulary file: Unknown language code: xx"
+    assert db_session.query(Word).count() == words_before
+    assert db_session.query(Group).filter(Group.name == "Food").count() == 0
+
+    response = client.post("/admin/import/vocab", content=b'{"vocab": []}')
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid vocabulary file: Missing vocab_examples"
+
+    response = client.post("/admin/import/vocab", files=[("other", ("a.txt", b"x", "text/plain"))])
+    assert response.status_code == 400
+    assert response.json()["detail"] == "No files uploaded"
@@ -0,0 +1,184 @@
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from app.cache import invalidate
+from app.models import Group, StudyActivity, StudySession, Word, WordReviewItem
+from app.utils.review_analytics import MAX_BUCKETS, bucket_starts, floor_bucket, review_bucket_stats
+
+@pytest.fixture
+def history(db_session, languages):
+    """Two ja groups and an es group, a session in each, and a few words per language."""
+    activity = StudyActivity(name="Flashcards", url="/flashcards", description="", image_url="", is_language_specific=False)
+    groups = [Group(name="Verbs", language_code="ja"), Group(name="Nouns", language_code="ja"), Group(name="Basics", language_code="es")]
+    words = [Word(script=f"{code}{i}", meaning=f"meaning {i}", language_code=code) for code in ("ja", "es") for i in range(5)]
+    db_session.add_all([activity, *groups, *words])
+    db_session.commit()
+    sessions = [StudySession(group_id=group.id, study_activity_id=activity.id) for group in groups]
+    db_session.add_all(sessions)
+    db_session.commit()
+    # Ids only: the client closes the session after each request
+    return {
+        "session_ids": {group.id: session.id for group, session in zip(groups, sessions)},
+        "group_ids": [group.id for group in groups],
+        "word_ids": {code: [word.id for word in words if word.language_code == code] for code in ("ja", "es")},
+    }
+
+def add_review(db_session, history, group_id, word_id, correct, created_at):
+    db_session.add(WordReviewItem(
+        word_id=word_id,
+        study_session_id=history["session_ids"][group_id],
+        correct=correct,
+        created_at=created_at
+    ))
+
+def expected_items(reviews, bucket, first_day, last_day):
+    """The buckets computed in Python from (word_id, correct, created_at) reviews."""
+    items = []
+    for start in bucket_starts(bucket, first_day, last_day):
+        in_bucket = [review for review in reviews if floor_bucket(bucket, review[2].date()) == start]
+        correct = sum(1 for review in in_bucket if review[1])
+        items.append({
+            "start": start.isoformat(),
+            "reviews": len(in_bucket),
+            "correct": correct,
+            "accuracy": round(correct * 100.0 / len(in_bucket), 1) if in_bucket else None,
+            "distinct_words": len({review[0] for review in in_bucket}),
+        })
+    return items
+
+def test_review_buckets(client, db_session, history):
+    ja_verbs, ja_nouns, es_basics = history["group_ids"]
+    ja, es = history["word_ids"]["ja"], history["word_ids"]["es"]
+    # Sunday 2 June 2024 ends a week, Monday 3 June starts the next one
+    add_review(db_session, history, ja_verbs, ja[0], True, datetime(2024, 6, 2, 23, 59))
+    add_review(db_session, history, ja_verbs, ja[0], False, datetime(2024, 6, 3, 0, 0))
+    add_review(db_session, history, ja_nouns, ja[1], True, datetime(2024, 6, 3, 12, 0))
+    add_review(db_session, history, ja_verbs, ja[2], True, datetime(2024, 6, 5, 8, 0))
+    add_review(db_session, history, es_basics, es[0], False, datetime(2024, 6, 3, 9, 0))
+    db_session.commit()
+
+    response = client.get("/analytics/reviews?language_code=ja&bucket=week&from=2024-05-30&to=2024-06-12")
+    assert response.status_code == 200
+    assert response.json() == {
+        "language_code": "ja",
+        "group_id": None,
+        "bucket": "week",
+        "from": "2024-05-27",
+        "to": "2024-06-16",
+        "items": [
+            {"start": "2024-05-27", "reviews": 1, "correct": 1, "accuracy": 100.0, "distinct_words": 1},
+            {"start": "2024-06-03", "reviews": 3, "correct": 2, "accuracy": 66.7, "distinct_words": 3},
+            {"start": "2024-06-10", "reviews": 0, "correct": 0, "accuracy": None, "distinct_words": 0},
+        ],
+    }
+
+    response = client.get(f"/analytics/reviews?language_code=ja&from=2024-06-02&to=2024-06-04&group_id={ja_verbs}")
+    assert [(item["start"], item["reviews"]) for item in response.json()["items"]] == [
+        ("2024-06-02", 1), ("2024-06-03", 1), ("2024-06-04", 0)
+    ]
+
+    response = client.get("/analytics/reviews?language_code=es&bucket=month&from=2024-06-15&to=2024-06-15")
+    assert response.json()["from"] == "2024-06-01" and response.json()["to"] == "2024-06-30"
+    assert response.json()["items"] == [
+        {"start": "2024-06-01", "reviews": 1, "correct": 0, "accuracy": 0.0, "distinct_words": 1}
+    ]
+
+def test_review_buckets_match_python_on_random_reviews(client, db_session, history):
+    rng = random.Random(25)
+    ja_verbs, ja_nouns, _ = history["group_ids"]
+    reviews = []
+    for _ in range(500):
+        group_id = rng.choice((ja_verbs, ja_nouns))
+        word_id = rng.choice(history["word_ids"]["ja"])
+        correct = rng.random() < 0.7
+        created_at = datetime(2024, 1, 1) + timedelta(seconds=rng.randrange(200 * 86400))
+        add_review(db_session, history, group_id, word_id, correct, created_at)
+        reviews.append((word_id, correct, created_at))
+    db_session.commit()
+
+    first_day, last_day = date(2024, 1, 10), date(2024, 7, 10)
+    for bucket in ("day", "week", "month"):
+        response = client.get(f"/analytics/reviews?language_code=ja&bucket={bucket}&from={first_day}&to={last_day}")
+        assert response.status_code == 200
+        assert response.json()["items"] == expected_items(reviews, bucket, first_day, last_day)
+
+def test_default_range_ends_today(client, db_session, history):
+    today = datetime.utcnow().date()
+    response = client.get("/analytics/reviews?language_code=ja")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 30
+    assert (data["from"], data["to"]) == ((today - timedelta(days=29)).isoformat(), today.isoformat())
+
+    data = client.get("/analytics/reviews?language_code=ja&bucket=month").json()
+    assert len(data["items"]) == 12
+    assert data["items"][-1]["start"] == today.replace(day=1).isoformat()
+
+def test_ended_buckets_are_cached(client, db_session, history, query_counter):
+    ja_verbs = history["group_ids"][0]
+    word_id = history["word_ids"]["ja"][0]
+    today = datetime.utcnow().date()
+    yesterday = datetime.combine(today - timedelta(days=1), time(12))
+    add_review(db_session, history, ja_verbs, word_id, True, yesterday)
+    db_session.commit()
+    url = f"/analytics/reviews?language_code=ja&from={today - timedelta(days=1)}"
+
+    with query_counter() as executed:
+        assert [item["reviews"] for item in client.get(url).json()["items"]] == [1, 0]
+    assert len(executed) == 1
+
+    # Reviews are created now, so yesterday's bucket is final: only today's is queried again
+    add_review(db_session, history, ja_verbs, word_id, False, datetime.utcnow())
+    add_review(db_session, history, ja_verbs, word_id, False, yesterday)
+    db_session.commit()
+    with query_counter() as executed:
+        assert [item["reviews"] for item in client.get(url).json()["items"]] == [1, 1]
+    assert len(executed) == 1
+    assert "word_review_items.created_at >=" in executed[0]
+
+    # A range of ended buckets only is served from the cache alone
+    with query_counter() as executed:
+        response = client.get(f"/analytics/reviews?language_code=ja&from={today - timedelta(days=1)}&to={today - timedelta(days=1)}")
+    assert response.json()["items"][0]["reviews"] == 1
+    assert executed == []
+
+    # Reseeding or importing invalidates everything, the ended buckets included
+    client.portal.call(invalidate)
+    assert [item["reviews"] for item in client.get(url).json()["items"]] == [2, 1]
+
+def test_invalid_ranges(client, db_session, history):
+    assert client.get("/analytics/reviews?language_code=ja&bucket=year").status_code == 422
+    assert client.get("/analytics/reviews?language_code=ja&from=2024-06-02&to=2024-06-01").status_code == 400
+    too_long = date(2024, 1, 1) + timedelta(days=MAX_BUCKETS)
+    assert client.get(f"/analytics/reviews?language_code=ja&from=2024-01-01&to={too_long}").status_code == 400
+    assert client.get(f"/analytics/reviews?language_code=ja&bucket=week&from=2024-01-01&to={too_long}").status_code == 200
+
+def test_ranges_at_the_ends_of_the_calendar(client, db_session, history):
+    # The month after December 9999 and the week before 1 January 1 cannot be represented
+    for query in ("bucket=month&from=9999-11-01&to=9999-12-31", "bucket=week&to=0001-01-01", "to=9999-12-31"):
+        response = client.get(f"/analytics/reviews?language_code=ja&{query}")
+        assert response.status_code == 400, query
+        assert response.json()["detail"] == "The range's buckets must lie between 0001-01-01 and 9999-12-31"
+
+    response = client.get("/analytics/reviews?language_code=ja&bucket=month&from=9999-10-01&to=9999-11-30")
+    assert response.status_code == 200
+    assert response.json()["to"] == "9999-11-30"
+    response = client.get("/analytics/reviews?language_code=ja&bucket=week&from=0001-01-01&to=0001-01-03")
+    assert response.status_code == 200
+    assert response.json()["from"] == "0001-01-01"
+
+@pytest.mark.sqlite_only
+def test_buckets_read_reviews_through_covering_index(db_session, history):
+    statement = review_bucket_stats("week", "ja", None, date(2024, 1, 1), date(2024, 7, 1)).compile(db_session.get_bind())
+    plan = db_session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", tuple(statement.params[name] for name in statement.positiontup)
+    ).fetchall()
+    details = [row[3] for row in plan]
+    assert any(
+        detail.startswith(
+            "SEARCH word_review_items USING COVERING INDEX ix_word_review_items_session_id_created_at_correct_word_id"
+            " (study_session_id=? AND created_at>? AND created_at<?)"
+        )
+        for detail in details
+    ), details
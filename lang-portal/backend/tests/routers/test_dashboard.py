@@ -1,7 +1,10 @@
-from datetime import datetime, timedelta
+import random
+from datetime import datetime, time, timedelta
 import pytest
+from sqlalchemy import event, text
 from sqlalchemy.orm import Session
-from app.models import StudyActivity, Group, Word, StudySession, WordReviewItem, Language
+from app.models import PROGRESS_WINDOW_DAYS, StudyActivity, Group, Word, StudySession, WordGroup, WordReviewItem, Language
+from app.utils.stats import rebuild_progress_buckets
 
 def test_get_last_study_session_no_sessions(client, db_session: Session):
     """Test getting last study session when there are no sessions."""
@@ -9,7 +12,7 @@ def test_get_last_study_session_no_sessions(client, db_session: Session):
     assert response.status_code == 200
     assert response.json() is None
 
-def test_get_last_study_session(client, db_session: Session):
+def test_get_last_study_session(client, db_session: Session, languages):
     """Test getting last study session with review statistics."""
     # Create test data
     activity = StudyActivity(
@@ -45,6 +48,7 @@ def test_get_last_study_session(client, db_session: Session):
     ]
     db_session.add_all(reviews)
     db_session.commit()
+    group_id = group.id
     
     response = client.get("/dashboard/last-session?language_code=es")
     assert response.status_code == 200
@@ -55,7 +59,7 @@ def test_get_last_study_session(client, db_session: Session):
     assert data["stats"]["correct_count"] == 2
     assert data["stats"]["wrong_count"] == 1
     assert data["group"]["name"] == "Test Group"
-    assert data["group"]["id"] == group.id
+    assert data["group"]["id"] == group_id
 
 def test_get_study_progress_no_data(client, db_session: Session):
     """Test getting study progress when there is no data."""
@@ -67,7 +71,7 @@ def test_get_study_progress_no_data(client, db_session: Session):
     assert data["words_studied"] == 0
     assert data["progress_percentage"] == 0.0
 
-def test_get_study_progress(client, db_session: Session):
+def test_get_study_progress(client, db_session: Session, languages):
     """Test getting study progress with actual data."""
     # Create test data
     activity = StudyActivity(
@@ -127,7 +131,7 @@ def test_get_study_progress(client, db_session: Session):
     assert data["words_studied"] == 3  # Only 3 words were reviewed
     assert data["progress_percentage"] == 60.0  # (3/5) * 100
 
-def test_get_study_progress_old_session(client, db_session: Session):
+def test_get_study_progress_old_session(client, db_session: Session, languages):
     """Test that old sessions (>1 month) are not included."""
     # Create test data
     activity = StudyActivity(
@@ -189,7 +193,7 @@ def test_get_quick_stats_no_data(client, db_session: Session):
     assert data["active_groups"] == 0
     assert data["study_streak"] == 0
 
-def test_get_quick_stats(client, db_session: Session):
+def test_get_quick_stats(client, db_session: Session, languages):
     """Test getting quick stats with actual data."""
     # Create test data
     activity = StudyActivity(
@@ -252,7 +256,7 @@ def test_get_quick_stats(client, db_session: Session):
     assert data["active_groups"] == 2  # Both groups used
     assert data["study_streak"] == 3  # Three consecutive days
 
-def test_get_quick_stats_broken_streak(client, db_session: Session):
+def test_get_quick_stats_broken_streak(client, db_session: Session, languages):
     """Test that streak breaks correctly when there's a gap in study days."""
     # Create test data
     activity = StudyActivity(
@@ -312,7 +316,8 @@ def test_study_progress_broken_streak(client, db_session):
     db_session.commit()
     
     group = Group(name="Core Verbs", language_code="ja")
-    db_session.add(group)
+    word = Word(script="食べる", meaning="to eat", language_code="ja")
+    db_session.add_all([group, word])
     db_session.commit()
     
     activity = StudyActivity(
@@ -345,7 +350,7 @@ def test_study_progress_broken_streak(client, db_session):
     
     # Add some reviews to make the sessions valid
     review = WordReviewItem(
-        word_id=1,  # Dummy word ID
+        word_id=word.id,
         study_session_id=today_session.id,
         correct=True
     )
@@ -368,7 +373,8 @@ def test_study_streak_consecutive_gap(client, db_session):
     db_session.commit()
     
     group = Group(name="Core Verbs", language_code="ja")
-    db_session.add(group)
+    word = Word(script="食べる", meaning="to eat", language_code="ja")
+    db_session.add_all([group, word])
     db_session.commit()
     
     activity = StudyActivity(
@@ -415,7 +421,7 @@ def test_study_streak_consecutive_gap(client, db_session):
     # Add reviews for each session
     for session in [yesterday_session, four_days_ago_session, five_days_ago_session]:
         review = WordReviewItem(
-            word_id=1,  # Dummy word ID
+            word_id=word.id,
             study_session_id=session.id,
             correct=True,
             created_at=session.created_at
@@ -442,7 +448,8 @@ def test_study_streak_old_first_date(client, db_session):
     db_session.commit()
     
     group = Group(name="Core Verbs", language_code="ja")
-    db_session.add(group)
+    word = Word(script="食べる", meaning="to eat", language_code="ja")
+    db_session.add_all([group, word])
     db_session.commit()
     
     activity = StudyActivity(
@@ -480,7 +487,7 @@ def test_study_streak_old_first_date(client, db_session):
     # Add reviews for each session
     for session in [three_days_ago_session, four_days_ago_session]:
         review = WordReviewItem(
-            word_id=1,  # Dummy word ID
+            word_id=word.id,
             study_session_id=session.id,
             correct=True,
             created_at=session.created_at
@@ -494,4 +501,133 @@ def test_study_streak_old_first_date(client, db_session):
     data = response.json()
     
     # The streak should be 0 because the most recent session is more than 1 day old
-    assert data["study_streak"] == 0 
\ No newline at end of file
+    assert data["study_streak"] == 0 
+def test_get_dashboard_summary_no_data(client, db_session: Session):
+    """Test the dashboard summary when there is no data."""
+    response = client.get("/dashboard/summary?language_code=es")
+    assert response.status_code == 200
+    assert response.json() == {
+        "last_session": None,
+        "progress": {"words_studied": 0, "total_words": 0, "progress_percentage": 0.0},
+        "quick_stats": {"success_rate": 0.0, "study_sessions": 0, "active_groups": 0, "study_streak": 0}
+    }
+
+def test_get_dashboard_summary_matches_endpoints(client, db_session: Session):
+    """The summary runs one query and agrees with the three per-widget endpoints."""
+    from app.seed import seed_all
+    seed_all(db_session, include_test_data=True)
+
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get("/dashboard/summary?language_code=ja")
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code == 200
+    assert len(statements) == 1
+    summary = response.json()
+
+    assert summary["last_session"] is not None
+    assert summary["quick_stats"]["study_sessions"] > 0
+    assert summary["last_session"] == client.get("/dashboard/last-session?language_code=ja").json()
+    assert summary["progress"] == client.get("/dashboard/progress?language_code=ja").json()
+    assert summary["quick_stats"] == client.get("/dashboard/quick-stats?language_code=ja").json()
+
+# Progress computed from the raw rows, as the dashboard did before the per-day buckets
+RAW_PROGRESS = text("""
+    SELECT
+        (SELECT count(DISTINCT words.id)
+         FROM words
+         JOIN word_groups ON word_groups.word_id = words.id
+         JOIN study_sessions ON study_sessions.group_id = word_groups.group_id
+         JOIN groups ON groups.id = study_sessions.group_id
+         WHERE groups.language_code = :language_code AND study_sessions.created_at >= :start) AS total_words,
+        (SELECT count(DISTINCT words.id)
+         FROM words
+         JOIN word_review_items ON word_review_items.word_id = words.id
+         JOIN study_sessions ON study_sessions.id = word_review_items.study_session_id
+         JOIN groups ON groups.id = study_sessions.group_id
+         WHERE groups.language_code = :language_code AND word_review_items.created_at >= :start) AS words_studied
+""")
+
+def create_random_history(db_session, rng, now):
+    """Two languages of sessions and reviews over twice the progress window, inserted out of order."""
+    activity = StudyActivity(name="Flashcards", url="/flashcards", description="", image_url="", is_language_specific=False)
+    db_session.add(activity)
+    groups = {}
+    for code in ("ja", "es"):
+        db_session.add(Language(code=code, name=code))
+        words = [Word(script=f"{code}{i}", meaning=f"{code} {i}", language_code=code) for i in range(40)]
+        groups[code] = [Group(name=f"{code} group {g}", language_code=code) for g in range(5)]
+        db_session.add_all([*words, *groups[code]])
+        db_session.commit()
+        db_session.add_all([
+            WordGroup(word_id=word.id, group_id=group.id)
+            for word in words for group in rng.sample(groups[code], rng.randint(0, 2))
+        ])
+
+    def random_time():
+        return now - timedelta(days=rng.uniform(0, 2 * PROGRESS_WINDOW_DAYS))
+
+    sessions = [
+        StudySession(group_id=rng.choice(groups[code]).id, study_activity_id=activity.id, created_at=random_time())
+        for code in groups for _ in range(30)
+    ]
+    rng.shuffle(sessions)
+    db_session.add_all(sessions)
+    db_session.commit()
+    word_ids = {code: [word_id for (word_id,) in db_session.query(Word.id).filter(Word.language_code == code)] for code in groups}
+    reviews = []
+    for session in sessions:
+        code = "ja" if session.group_id in {group.id for group in groups["ja"]} else "es"
+        for _ in range(rng.randint(0, 15)):
+            reviews.append(WordReviewItem(
+                word_id=rng.choice(word_ids[code]), study_session_id=session.id, correct=rng.random() < 0.5,
+                created_at=random_time()
+            ))
+    rng.shuffle(reviews)
+    for review in reviews:
+        db_session.add(review)
+        db_session.flush()
+    db_session.commit()
+
+    # Edits go through the update and delete triggers
+    for review in rng.sample(reviews, 40):
+        db_session.delete(review)
+    db_session.commit()
+    remaining = db_session.query(WordReviewItem).all()
+    for review in rng.sample(remaining, 40):
+        review.created_at = random_time()
+    for session in rng.sample(sessions, 10):
+        code = "ja" if session.group_id in {group.id for group in groups["ja"]} else "es"
+        session.group_id = rng.choice(groups[code]).id
+        session.created_at = random_time()
+    db_session.commit()
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_study_progress_matches_raw_reviews(client, db_session: Session, seed):
+    """The per-day buckets give the same progress as counting over the raw rows of the window."""
+    now = datetime.utcnow()
+    create_random_history(db_session, random.Random(seed), now)
+    # The window is whole UTC days: today and the days before it
+    start = datetime.combine(now.date() - timedelta(days=PROGRESS_WINDOW_DAYS - 1), time())
+
+    expected = {}
+    for code in ("ja", "es"):
+        row = db_session.execute(RAW_PROGRESS, {"language_code": code, "start": start}).one()
+        # Reviews are not tied to the session's group, so more words can be studied than listed
+        assert row.words_studied > 0 and row.total_words > 0
+        expected[code] = {
+            "total_words": row.total_words,
+            "words_studied": row.words_studied,
+            "progress_percentage": round(row.words_studied / row.total_words * 100, 1)
+        }
+
+    for code in ("ja", "es"):
+        assert client.get(f"/dashboard/progress?language_code={code}").json() == expected[code]
+    rebuild_progress_buckets(db_session)
+    for code in ("ja", "es"):
+        assert client.get(f"/dashboard/progress?language_code={code}").json() == expected[code]
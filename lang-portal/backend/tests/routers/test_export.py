@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app.models import Group, StudyActivity, StudySession, Word, WordReviewItem
+from app.seed import seed_all
+
+def create_reviews(db_session):
+    """Three reviews of one Spanish word: two 10 days ago, one today."""
+    activity = StudyActivity(name="Flashcards", url="/study/flashcards", description="Practice", image_url="/test.png")
+    group = Group(name="Test Group", language_code="es")
+    word = Word(script="comer", transliteration=None, meaning="to eat", language_code="es")
+    db_session.add_all([activity, group, word])
+    db_session.commit()
+
+    now = datetime.utcnow()
+    session = StudySession(group_id=group.id, study_activity_id=activity.id, created_at=now - timedelta(days=10))
+    db_session.add(session)
+    db_session.commit()
+    db_session.add_all([
+        WordReviewItem(word_id=word.id, study_session_id=session.id, correct=True, created_at=now - timedelta(days=10)),
+        WordReviewItem(word_id=word.id, study_session_id=session.id, correct=False, created_at=now - timedelta(days=10)),
+        WordReviewItem(word_id=word.id, study_session_id=session.id, correct=True, created_at=now),
+    ])
+    db_session.commit()
+    return word.id, now
+
+def test_export_reviews_ndjson(client, db_session):
+    seed_all(db_session, include_test_data=True)
+
+    response = client.get("/export/reviews?language_code=ja")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="reviews.ndjson"'
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 30  # All test reviews of the Japanese sessions
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert set(rows[0]) == {
+        "id", "created_at", "study_session_id", "group_id", "study_activity_id", "word_id", "script", "correct"
+    }
+    taberu = [row for row in rows if row["script"] == "食べる"]
+    assert sum(row["correct"] for row in taberu) == 7
+    assert sum(not row["correct"] for row in taberu) == 2
+
+def test_export_reviews_csv_date_range(client, db_session, languages):
+    word_id, now = create_reviews(db_session)
+    today = now.date().isoformat()
+
+    response = client.get(f"/export/reviews?language_code=es&format=csv&date_from={today}&date_to={today}")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["word_id"] == str(word_id)
+    assert rows[0]["correct"] == "true"
+
+    response = client.get(f"/export/reviews?language_code=es&format=csv&date_to={(now - timedelta(days=1)).date()}")
+    assert len(list(csv.DictReader(io.StringIO(response.text)))) == 2
+
+def test_export_date_range_up_to_the_last_day(client, db_session, languages):
+    word_id, _ = create_reviews(db_session)
+
+    response = client.get("/export/reviews?language_code=es&date_to=9999-12-31")
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3
+
+    response = client.get("/export/words?language_code=es&date_from=0001-01-01&date_to=9999-12-31")
+    assert response.status_code == 200
+    [row] = [json.loads(line) for line in response.text.splitlines()]
+    assert (row["id"], row["correct_count"], row["wrong_count"]) == (word_id, 2, 1)
+
+def test_export_words(client, db_session, languages):
+    word_id, now = create_reviews(db_session)
+
+    response = client.get("/export/words?language_code=es")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [{
+        "id": word_id, "script": "comer", "transliteration": None, "meaning": "to eat",
+        "correct_count": 2, "wrong_count": 1
+    }]
+
+    # With a date range the counters only cover the reviews inside it
+    response = client.get(f"/export/words?language_code=es&format=csv&date_from={now.date()}")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["script"], row["correct_count"], row["wrong_count"]) for row in rows] == [("comer", "1", "0")]
+
+def test_export_empty(client, db_session):
+    response = client.get("/export/words?language_code=es&format=csv")
+    assert response.status_code == 200
+    assert response.text.splitlines() == ["id,script,transliteration,meaning,correct_count,wrong_count"]
+
+    response = client.get("/export/reviews?language_code=es")
+    assert response.status_code == 200
+    assert response.text == ""
+
+def test_export_invalid_parameters(client, db_session):
+    response = client.get("/export/reviews?language_code=es&date_from=2024-02-01&date_to=2024-01-01")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "date_from must not be after date_to"
+
+    response = client.get("/export/reviews?language_code=es&format=xml")
+    assert response.status_code == 422
+
+@pytest.mark.sqlite_only
+def test_export_streams_without_sorting(client, db_session, languages):
+    """Exports must emit rows in cursor order, never after sorting or materializing the result."""
+    seed_all(db_session, include_test_data=True)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    for url in [
+        "/export/reviews?language_code=ja",
+        "/export/words?language_code=ja",
+        "/export/words?language_code=ja&date_from=2000-01-01",
+    ]:
+        assert client.get(url).status_code == 200, url
+    event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+    assert len(statements) == 3
+    for statement, parameters in statements:
+        plan = [
+            row[3] for row in db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        ]
+        assert not [step for step in plan if step.startswith(("USE TEMP B-TREE", "MATERIALIZE"))], (statement, plan)
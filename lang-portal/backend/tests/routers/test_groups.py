@@ -8,10 +8,11 @@ def test_get_groups_empty(client, db_session):
         "total": 0,
         "items": [],
         "page": 1,
-        "per_page": 10  # Default page size
+        "per_page": 10,  # Default page size
+        "next_cursor": None
     }
 
-def test_get_groups(client, db_session):
+def test_get_groups(client, db_session, languages):
     # Create test groups
     groups = [
         Group(
@@ -66,7 +67,7 @@ def test_get_groups(client, db_session):
     assert data["items"][0]["name"] == "Verbes"
     assert data["items"][0]["words_count"] == 1  # One French word
 
-def test_get_group_details(client, db_session):
+def test_get_group_details(client, db_session, languages):
     # Create a group
     group = Group(name="Core Verbs", language_code="ja")
     db_session.add(group)
@@ -117,19 +118,23 @@ def test_get_group_details(client, db_session):
     db_session.add_all(review_items)
     db_session.commit()
 
+    # The request closes the session, so read the ids first
+    group_id = group.id
+    word_ids = [word.id for word in words]
+    
     # Test Japanese words
-    response = client.get(f"/groups/{group.id}")
+    response = client.get(f"/groups/{group_id}")
     assert response.status_code == 200
     data = response.json()
 
     assert data == {
-        "id": group.id,
+        "id": group_id,
         "name": "Core Verbs",
         "words_count": 2,  # Only Japanese words
         "words": {
             "items": [
                 {
-                    "id": words[0].id,
+                    "id": word_ids[0],
                     "script": "食べる",
                     "transliteration": "taberu",
                     "meaning": "to eat",
@@ -139,7 +144,7 @@ def test_get_group_details(client, db_session):
                     }
                 },
                 {
-                    "id": words[1].id,
+                    "id": word_ids[1],
                     "script": "飲む",
                     "transliteration": "nomu",
                     "meaning": "to drink",
@@ -150,7 +155,8 @@ def test_get_group_details(client, db_session):
                 }
             ],
             "page": 1,
-            "per_page": 10
+            "per_page": 10,
+            "next_cursor": None
         }
     }
 
@@ -163,7 +169,7 @@ def test_get_group_not_found(client, db_session):
     assert response.status_code == 404
     assert response.json()["detail"] == "Group with id 999 not found"
 
-def test_get_group_empty_words(client, db_session):
+def test_get_group_empty_words(client, db_session, languages):
     # Create a group without any words
     group = Group(name="Empty Group", language_code="ja")
     db_session.add(group)
@@ -178,7 +184,7 @@ def test_get_group_empty_words(client, db_session):
     assert data["words_count"] == 0
     assert data["words"]["items"] == []
 
-def test_get_groups_sorting(client, db_session):
+def test_get_groups_sorting(client, db_session, languages):
     """Test sorting functionality for groups endpoint."""
     # Create test groups with different word counts
     groups = [
@@ -247,7 +253,7 @@ def test_get_groups_sorting(client, db_session):
     word_counts = [item["words_count"] for item in data["items"]]
     assert word_counts == [5, 4, 3]
 
-def test_get_groups_pagination(client, db_session):
+def test_get_groups_pagination(client, db_session, languages):
     """Test pagination functionality for groups endpoint."""
     # Create 15 test groups
     groups = [
@@ -289,7 +295,7 @@ def test_get_groups_pagination(client, db_session):
     assert data["total"] == 15
     assert len(data["items"]) == 0
 
-def test_get_group_sorting(client, db_session):
+def test_get_group_sorting(client, db_session, languages):
     """Test sorting functionality for specific group endpoint."""
     # Create a test group
     group = Group(name="Test Group", language_code="ja")
@@ -419,4 +425,49 @@ def test_get_group_words_sorting(client, db_session):
     # 話 (U+8A71) comes last (lowest)
     assert items[0]["script"] == "飲む"
     assert items[1]["script"] == "食べる"
-    assert items[2]["script"] == "話す"
\ No newline at end of file
+    assert items[2]["script"] == "話す"
+def test_get_groups_cursor_pagination(client, db_session, languages):
+    """Test cursor pagination on groups sorted by name."""
+    groups = [Group(name=f"Group {i:02d}", language_code="ja") for i in range(5)]
+    db_session.add_all(groups)
+    db_session.commit()
+
+    response = client.get("/groups?language_code=ja&sort_by=name&order=desc&per_page=2")
+    data = response.json()
+    names = [item["name"] for item in data["items"]]
+    assert names == ["Group 04", "Group 03"]
+
+    response = client.get(f"/groups?language_code=ja&sort_by=name&order=desc&per_page=2&cursor={data['next_cursor']}")
+    data = response.json()
+    names = [item["name"] for item in data["items"]]
+    assert names == ["Group 02", "Group 01"]
+
+    response = client.get(f"/groups?language_code=ja&sort_by=name&order=desc&per_page=2&cursor={data['next_cursor']}")
+    data = response.json()
+    assert [item["name"] for item in data["items"]] == ["Group 00"]
+    assert data["next_cursor"] is None
+
+def test_get_group_words_cursor_pagination(client, db_session, languages):
+    """Test cursor pagination on a group's words with NULL transliterations."""
+    group = Group(name="Core Verbs", language_code="fr")
+    db_session.add(group)
+    db_session.commit()
+    words = [
+        Word(script="manger", meaning="to eat", language_code="fr"),
+        Word(script="boire", transliteration="bwar", meaning="to drink", language_code="fr"),
+        Word(script="parler", meaning="to speak", language_code="fr"),
+    ]
+    db_session.add_all(words)
+    db_session.commit()
+    for word in words:
+        db_session.add(WordGroup(word_id=word.id, group_id=group.id))
+    db_session.commit()
+
+    response = client.get(f"/groups/{group.id}?sort_by=transliteration&per_page=2")
+    data = response.json()["words"]
+    assert [item["script"] for item in data["items"]] == ["manger", "parler"]
+
+    response = client.get(f"/groups/{group.id}?sort_by=transliteration&per_page=2&cursor={data['next_cursor']}")
+    data = response.json()["words"]
+    assert [item["script"] for item in data["items"]] == ["boire"]
+    assert data["next_cursor"] is None
@@ -1,4 +1,4 @@
-from app.models import StudyActivity, StudySession, WordReviewItem, Group, Language, Word, WordGroup
+from app.models import StudyActivity, StudySession, WordReviewItem, Group, Language, Word, WordGroup, ReviewSchedule
 from datetime import datetime, timedelta
 
 def test_create_study_session(client, db_session):
@@ -86,6 +86,10 @@ def test_create_word_review(client, db_session):
     assert data["correct"] is True
     assert "created_at" in data
 
+    # The review is reflected in the word's stored counters
+    word_response = client.get(f"/words/{word_id}")
+    assert word_response.json()["stats"] == {"correct_count": 1, "wrong_count": 0}
+
 def test_get_study_sessions(client, db_session):
     # Create test data
     language = Language(code="ja", name="Japanese")
@@ -93,7 +97,8 @@ def test_get_study_sessions(client, db_session):
     db_session.commit()
     
     group = Group(name="Core Verbs", language_code="ja")
-    db_session.add(group)
+    word = Word(script="食べる", meaning="to eat", language_code="ja")
+    db_session.add_all([group, word])
     db_session.commit()
     
     activity = StudyActivity(
@@ -121,7 +126,7 @@ def test_get_study_sessions(client, db_session):
         # Add some reviews
         for _ in range(i + 1):  # Different number of reviews per session
             review = WordReviewItem(
-                word_id=1,  # Dummy word ID
+                word_id=word.id,
                 study_session_id=session.id,
                 correct=True,
                 created_at=datetime.now() - timedelta(hours=i)
@@ -160,7 +165,8 @@ def test_get_study_session(client, db_session):
     db_session.commit()
     
     group = Group(name="Core Verbs", language_code="ja")
-    db_session.add(group)
+    word = Word(script="食べる", meaning="to eat", language_code="ja")
+    db_session.add_all([group, word])
     db_session.commit()
     
     activity = StudyActivity(
@@ -185,7 +191,7 @@ def test_get_study_session(client, db_session):
     # Add reviews
     for i in range(3):
         review = WordReviewItem(
-            word_id=1,  # Dummy word ID
+            word_id=word.id,
             study_session_id=session.id,
             correct=True,
             created_at=datetime.now() - timedelta(hours=i)
@@ -193,6 +199,10 @@ def test_get_study_session(client, db_session):
         db_session.add(review)
     db_session.commit()
     
+    # The request closes the session, so read the expected values first
+    group_id, group_name = group.id, group.name
+    activity_id, activity_name = activity.id, activity.name
+    
     # Test getting session details
     response = client.get(f"/study-sessions/{session.id}")
     assert response.status_code == 200
@@ -200,10 +210,10 @@ def test_get_study_session(client, db_session):
     
     # Check response
     assert data["id"] == session.id
-    assert data["group"]["id"] == group.id
-    assert data["group"]["name"] == group.name
-    assert data["activity"]["id"] == activity.id
-    assert data["activity"]["name"] == activity.name
+    assert data["group"]["id"] == group_id
+    assert data["group"]["name"] == group_name
+    assert data["activity"]["id"] == activity_id
+    assert data["activity"]["name"] == activity_name
     assert data["reviews_count"] == 3
     assert "created_at" in data
     assert "last_review_at" in data
@@ -283,7 +293,8 @@ def test_get_study_sessions_sorting(client, db_session):
     db_session.commit()
     
     group = Group(name="Core Verbs", language_code="ja")
-    db_session.add(group)
+    word = Word(script="食べる", meaning="to eat", language_code="ja")
+    db_session.add_all([group, word])
     db_session.commit()
     
     activity = StudyActivity(
@@ -313,7 +324,7 @@ def test_get_study_sessions_sorting(client, db_session):
         # Add reviews with different last review times
         review_time = base_time - timedelta(hours=i*2)  # Different review times
         review = WordReviewItem(
-            word_id=1,  # Dummy word ID
+            word_id=word.id,
             study_session_id=session.id,
             correct=True,
             created_at=review_time
@@ -321,6 +332,9 @@ def test_get_study_sessions_sorting(client, db_session):
         db_session.add(review)
         db_session.commit()
     
+    # The request closes the session, so read the ids first
+    session_ids = [session.id for session in sessions]
+    
     # Test sorting by last_review_at in descending order
     response = client.get("/study-sessions?language_code=ja&sort_by=last_review_at&order=desc")
     assert response.status_code == 200
@@ -328,9 +342,9 @@ def test_get_study_sessions_sorting(client, db_session):
     items = data["items"]
     
     # Most recent review should be first
-    assert items[0]["id"] == sessions[0].id
-    assert items[1]["id"] == sessions[1].id
-    assert items[2]["id"] == sessions[2].id
+    assert items[0]["id"] == session_ids[0]
+    assert items[1]["id"] == session_ids[1]
+    assert items[2]["id"] == session_ids[2]
     
     # Test sorting by last_review_at in ascending order
     response = client.get("/study-sessions?language_code=ja&sort_by=last_review_at&order=asc")
@@ -339,6 +353,193 @@ def test_get_study_sessions_sorting(client, db_session):
     items = data["items"]
     
     # Oldest review should be first
-    assert items[0]["id"] == sessions[2].id
-    assert items[1]["id"] == sessions[1].id
-    assert items[2]["id"] == sessions[0].id 
\ No newline at end of file
+    assert items[0]["id"] == session_ids[2]
+    assert items[1]["id"] == session_ids[1]
+    assert items[2]["id"] == session_ids[0] 
+def test_get_study_sessions_cursor_pagination(client, db_session, languages):
+    """Test cursor pagination on study sessions sorted by created_at."""
+    group = Group(name="Core Verbs", language_code="ja")
+    db_session.add(group)
+    db_session.commit()
+    activity = StudyActivity(
+        name="Flashcards",
+        url="/study/flashcards",
+        description="Practice with flashcards",
+        image_url="/images/flashcards.png",
+        is_language_specific=False
+    )
+    db_session.add(activity)
+    db_session.commit()
+
+    base_time = datetime.now()
+    sessions = [
+        StudySession(group_id=group.id, study_activity_id=activity.id, created_at=base_time - timedelta(days=i))
+        for i in range(3)
+    ]
+    db_session.add_all(sessions)
+    db_session.commit()
+    session_ids = [session.id for session in sessions]
+
+    response = client.get("/study-sessions?language_code=ja&per_page=2")
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == session_ids[:2]
+
+    response = client.get(f"/study-sessions?language_code=ja&per_page=2&cursor={data['next_cursor']}")
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == session_ids[2:]
+    assert data["next_cursor"] is None
+
+    # Aggregate sort orders cannot be continued from a cursor
+    response = client.get("/study-sessions?language_code=ja&sort_by=reviews_count&cursor=abc")
+    assert response.status_code == 400
+
+def test_get_study_sessions_cursor_pages_sessions_created_through_api(client, db_session, languages):
+    """Cursors continue exactly after sessions created with POST /study-sessions, in the same second."""
+    group = Group(name="Core Verbs", language_code="ja")
+    activity = StudyActivity(name="Flashcards", url="/flashcards", description="", image_url="", is_language_specific=False)
+    db_session.add_all([group, activity])
+    db_session.commit()
+    group_id, activity_id = group.id, activity.id
+
+    session_ids = [
+        client.post("/study-sessions", json={"group_id": group_id, "study_activity_id": activity_id}).json()["id"]
+        for _ in range(7)
+    ]
+    for order, expected in (("desc", session_ids[::-1]), ("asc", session_ids)):
+        # per_page=2 and 3: pages end inside runs of sessions sharing a second
+        for per_page in (2, 3):
+            seen, cursor = [], None
+            while len(seen) <= len(session_ids):
+                url = f"/study-sessions?language_code=ja&order={order}&per_page={per_page}"
+                data = client.get(url + (f"&cursor={cursor}" if cursor else "")).json()
+                seen += [item["id"] for item in data["items"]]
+                cursor = data["next_cursor"]
+                if cursor is None:
+                    break
+            assert seen == expected, (order, per_page)
+
+def _create_session_with_words(db_session, word_count=3):
+    """Create a group with words, an activity and a session; return (session_id, word_ids)."""
+    group = Group(name="Core Verbs", language_code="ja")
+    db_session.add(group)
+    db_session.commit()
+    activity = StudyActivity(
+        name="Flashcards",
+        url="/study/flashcards",
+        description="Practice with flashcards",
+        image_url="/images/flashcards.png",
+        is_language_specific=False
+    )
+    db_session.add(activity)
+    db_session.commit()
+    words = [Word(script=f"word{i}", meaning=f"meaning{i}", language_code="ja") for i in range(word_count)]
+    db_session.add_all(words)
+    db_session.commit()
+    db_session.add_all([WordGroup(word_id=word.id, group_id=group.id) for word in words])
+    session = StudySession(group_id=group.id, study_activity_id=activity.id)
+    db_session.add(session)
+    db_session.commit()
+    return session.id, [word.id for word in words]
+
+def test_create_word_reviews_batch(client, db_session, languages):
+    session_id, word_ids = _create_session_with_words(db_session)
+
+    payload = [
+        {"word_id": word_ids[0], "correct": True},
+        {"word_id": word_ids[1], "correct": False},
+        {"word_id": word_ids[0], "correct": False},
+    ]
+    response = client.post(f"/study-sessions/{session_id}/reviews:batch", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+
+    # Rows come back in request order with their generated ids and timestamps
+    assert [(item["word_id"], item["correct"]) for item in data] == [
+        (review["word_id"], review["correct"]) for review in payload
+    ]
+    assert all(item["study_session_id"] == session_id for item in data)
+    assert len({item["id"] for item in data}) == 3
+    assert all(item["created_at"] for item in data)
+
+    assert db_session.query(WordReviewItem).filter_by(study_session_id=session_id).count() == 3
+    first_word = client.get(f"/words/{word_ids[0]}").json()
+    assert first_word["stats"] == {"correct_count": 1, "wrong_count": 1}
+
+def test_create_word_reviews_batch_rejects_foreign_words(client, db_session, languages):
+    """A single word outside the session's group rejects the whole batch."""
+    session_id, word_ids = _create_session_with_words(db_session)
+
+    response = client.post(f"/study-sessions/{session_id}/reviews:batch", json=[
+        {"word_id": word_ids[0], "correct": True},
+        {"word_id": 999, "correct": True},
+    ])
+    assert response.status_code == 404
+    assert "[999]" in response.json()["detail"]
+    assert db_session.query(WordReviewItem).count() == 0
+
+def test_create_word_reviews_batch_validation(client, db_session):
+    response = client.post("/study-sessions/999/reviews:batch", json=[{"word_id": 1, "correct": True}])
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Study session with id 999 not found"
+
+    response = client.post("/study-sessions/1/reviews:batch", json=[])
+    assert response.status_code == 422
+
+def test_get_next_words(client, db_session, languages):
+    """Test that /next returns the group's due words in due order and follows reviews."""
+    session_id, word_ids = _create_session_with_words(db_session, word_count=4)
+    group_id = db_session.get(StudySession, session_id).group_id
+
+    # Words are due from when they were linked; make the order explicit
+    now = datetime.utcnow()
+    for offset, word_id in zip((3, 1, 2, -1), word_ids):
+        db_session.query(ReviewSchedule).filter_by(group_id=group_id, word_id=word_id).update(
+            {"due_at": now - timedelta(hours=offset)}
+        )
+    db_session.commit()
+
+    response = client.get(f"/study-sessions/{session_id}/next")
+    assert response.status_code == 200
+    data = response.json()
+    # The last word is not due for another hour
+    assert [item["id"] for item in data] == [word_ids[0], word_ids[2], word_ids[1]]
+    assert data[0]["script"] == "word0"
+    assert (data[0]["interval_days"], data[0]["ease"], data[0]["repetitions"]) == (0, 2.5, 0)
+
+    response = client.get(f"/study-sessions/{session_id}/next?limit=1")
+    assert [item["id"] for item in response.json()] == [word_ids[0]]
+
+    # Reviewed words are rescheduled a day or more ahead and leave the queue
+    client.post(f"/study-sessions/{session_id}/reviews", json={"word_id": word_ids[0], "correct": True})
+    client.post(f"/study-sessions/{session_id}/reviews:batch", json=[{"word_id": word_ids[2], "correct": False}])
+    response = client.get(f"/study-sessions/{session_id}/next")
+    assert [item["id"] for item in response.json()] == [word_ids[1]]
+
+    schedules = {
+        row.word_id: row for row in db_session.query(ReviewSchedule).filter_by(group_id=group_id)
+    }
+    assert (schedules[word_ids[0]].interval_days, schedules[word_ids[0]].ease, schedules[word_ids[0]].repetitions) == (1, 2.6, 1)
+    assert (schedules[word_ids[2]].interval_days, schedules[word_ids[2]].ease, schedules[word_ids[2]].repetitions) == (1, 2.18, 0)
+    assert schedules[word_ids[0]].due_at > now + timedelta(hours=23)
+
+def test_create_word_reviews_batch_schedules_in_order(client, db_session, languages):
+    """Test that repeated reviews of a word in one batch advance its schedule in order."""
+    session_id, word_ids = _create_session_with_words(db_session, word_count=1)
+
+    client.post(f"/study-sessions/{session_id}/reviews:batch", json=[
+        {"word_id": word_ids[0], "correct": True},
+        {"word_id": word_ids[0], "correct": True},
+        {"word_id": word_ids[0], "correct": False},
+        {"word_id": word_ids[0], "correct": True},
+    ])
+    schedule = db_session.query(ReviewSchedule).filter_by(word_id=word_ids[0]).one()
+    assert (schedule.interval_days, schedule.ease, schedule.repetitions) == (1, 2.48, 1)
+
+def test_get_next_words_validation(client, db_session, languages):
+    response = client.get("/study-sessions/999/next")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Study session with id 999 not found"
+
+    session_id, _ = _create_session_with_words(db_session, word_count=1)
+    assert client.get(f"/study-sessions/{session_id}/next?limit=0").status_code == 422
+    assert client.get(f"/study-sessions/{session_id}/next?limit=101").status_code == 422
@@ -1,4 +1,8 @@
+import base64
+import json
+from datetime import datetime
 from app.models import Word, WordReviewItem, StudySession, StudyActivity, Group, WordGroup, Language
+from app.utils.difficulty import rebuild_word_difficulty
 
 def test_get_words_empty(client, db_session):
     response = client.get("/words?language_code=ja")
@@ -8,10 +12,11 @@ def test_get_words_empty(client, db_session):
         "total": 0,
         "items": [],
         "page": 1,
-        "per_page": 10  # Default page size
+        "per_page": 10,  # Default page size
+        "next_cursor": None
     }
 
-def test_get_words_pagination(client, db_session):
+def test_get_words_pagination(client, db_session, languages):
     # Create test words
     words = [
         Word(script="食べる", transliteration="taberu", meaning="to eat", language_code="ja"),
@@ -78,7 +83,7 @@ def test_get_words_pagination(client, db_session):
     assert data["per_page"] == 2
     assert len(data["items"]) == 1
 
-def test_get_words_sorting(client, db_session):
+def test_get_words_sorting(client, db_session, languages):
     # Create test words
     words = [
         Word(script="citron", meaning="lemon", language_code="fr"),
@@ -143,7 +148,7 @@ def test_get_words_sorting(client, db_session):
     assert data["items"][2]["stats"]["correct_count"] == 0
     assert data["items"][2]["stats"]["wrong_count"] == 0
 
-def test_get_word_details(client, db_session):
+def test_get_word_details(client, db_session, languages):
     # Create a word
     word = Word(
         script="食べる",
@@ -229,7 +234,7 @@ def test_get_word_not_found(client, db_session):
     assert response.status_code == 404
     assert response.json()["detail"] == "Word with id 999 not found"
 
-def test_get_word_no_reviews(client, db_session):
+def test_get_word_no_reviews(client, db_session, languages):
     # Create a word without any reviews
     word = Word(
         script="新しい",
@@ -313,15 +318,18 @@ def test_get_words_with_review_count_sorting(client, db_session):
     
     db_session.commit()
     
+    # The request closes the session, so read the ids first
+    word_ids = [word.id for word in words]
+    
     # Test sorting by correct_count desc
     response = client.get("/words?language_code=ja&sort_by=correct_count&order=desc")
     assert response.status_code == 200
     data = response.json()
     items = data["items"]
     
-    assert items[0]["id"] == words[0].id  # Most correct (3)
-    assert items[1]["id"] == words[1].id  # Medium correct (2)
-    assert items[2]["id"] == words[2].id  # Least correct (1)
+    assert items[0]["id"] == word_ids[0]  # Most correct (3)
+    assert items[1]["id"] == word_ids[1]  # Medium correct (2)
+    assert items[2]["id"] == word_ids[2]  # Least correct (1)
     
     # Test sorting by wrong_count desc
     response = client.get("/words?language_code=ja&sort_by=wrong_count&order=desc")
@@ -329,6 +337,209 @@ def test_get_words_with_review_count_sorting(client, db_session):
     data = response.json()
     items = data["items"]
     
-    assert items[0]["id"] == words[2].id  # Most wrong (3)
-    assert items[1]["id"] == words[1].id  # Medium wrong (2)
-    assert items[2]["id"] == words[0].id  # Least wrong (1)
\ No newline at end of file
+    assert items[0]["id"] == word_ids[2]  # Most wrong (3)
+    assert items[1]["id"] == word_ids[1]  # Medium wrong (2)
+    assert items[2]["id"] == word_ids[0]  # Least wrong (1)
+def test_get_words_cursor_pagination(client, db_session, languages):
+    """Test walking all pages with cursors matches offset pagination, including ties."""
+    words = [
+        Word(script=f"word{i}", meaning=f"meaning{i}", language_code="ja", correct_count=i % 3)
+        for i in range(7)
+    ]
+    db_session.add_all(words)
+    db_session.commit()
+
+    expected = client.get("/words?language_code=ja&sort_by=correct_count&order=desc&per_page=100").json()
+    expected_ids = [item["id"] for item in expected["items"]]
+
+    seen_ids = []
+    url = "/words?language_code=ja&sort_by=correct_count&order=desc&per_page=3"
+    response = client.get(url)
+    while True:
+        assert response.status_code == 200
+        data = response.json()
+        seen_ids.extend(item["id"] for item in data["items"])
+        if data["next_cursor"] is None:
+            break
+        response = client.get(url + f"&cursor={data['next_cursor']}")
+
+    assert seen_ids == expected_ids
+    assert len(seen_ids) == 7
+
+def test_get_words_invalid_cursor(client, db_session):
+    response = client.get("/words?language_code=ja&cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_get_words_cursor_with_non_scalar_value(client, db_session):
+    for value in ([1, 2], {"a": 1}):
+        cursor = base64.urlsafe_b64encode(json.dumps({"v": value, "id": 1, "s": "script", "o": "asc"}).encode()).decode()
+        response = client.get(f"/words?language_code=ja&sort_by=script&cursor={cursor}")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+def test_get_words_cursor_from_another_sort(client, db_session, languages):
+    db_session.add_all([Word(script=f"word{i}", meaning=f"meaning{i}", language_code="ja") for i in range(3)])
+    db_session.commit()
+    cursor = client.get("/words?language_code=ja&sort_by=script&per_page=2").json()["next_cursor"]
+
+    assert client.get(f"/words?language_code=ja&sort_by=script&per_page=2&cursor={cursor}").status_code == 200
+    for other_sort in ("sort_by=correct_count", "sort_by=script&order=desc", "sort_by=id"):
+        response = client.get(f"/words?language_code=ja&{other_sort}&per_page=2&cursor={cursor}")
+        assert response.status_code == 400, other_sort
+
+def test_get_words_per_page_limit(client, db_session):
+    response = client.get("/words?language_code=ja&per_page=101")
+    assert response.status_code == 422
+
+def test_get_words_without_total(client, db_session, languages):
+    """Test that include_total=false skips the count for infinite-scroll clients."""
+    db_session.add_all([
+        Word(script=f"word{i}", meaning=f"meaning{i}", language_code="ja")
+        for i in range(3)
+    ])
+    db_session.commit()
+
+    response = client.get("/words?language_code=ja&per_page=2&include_total=false")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] is not None
+
+    # The total is still counted on later pages when requested
+    response = client.get("/words?language_code=ja&per_page=2&page=2")
+    assert response.json()["total"] == 3
+
+def search_scripts(client, q, language_code, **params):
+    response = client.get("/words/search", params={"q": q, "language_code": language_code, **params})
+    assert response.status_code == 200
+    return [item["script"] for item in response.json()["items"]]
+
+def test_search_words(client, db_session, languages):
+    """Test prefix, accent-insensitive and Arabic-vocalization-insensitive search within a language."""
+    db_session.add_all([
+        Word(script="食べる", transliteration="taberu", meaning="to eat", language_code="ja"),
+        Word(script="食べ物", transliteration="tabemono", meaning="food", language_code="ja"),
+        Word(script="école", meaning="school", language_code="fr"),
+        Word(script="élève", meaning="pupil", language_code="fr"),
+        Word(script="mañana", meaning="tomorrow, morning", language_code="es"),
+        Word(script="tabla", meaning="board", language_code="es"),
+        Word(script="كِتَابٌ", transliteration="kitāb", meaning="book", language_code="ar"),
+        Word(script="مَدْرَسَة", transliteration="madrasa", meaning="school", language_code="ar"),
+        Word(script="أَكَلَ", transliteration="akala", meaning="to eat", language_code="ar"),
+    ])
+    db_session.commit()
+
+    # Terms match word prefixes in any of the text columns, only within the language
+    assert sorted(search_scripts(client, "tab", "ja")) == ["食べる", "食べ物"]
+    assert search_scripts(client, "tab", "es") == ["tabla"]
+    assert search_scripts(client, "eat", "ja") == ["食べる"]
+    assert search_scripts(client, "to eat", "ar") == ["أَكَلَ"]
+    assert search_scripts(client, "morn tomorrow", "es") == ["mañana"]
+    assert search_scripts(client, "school", "es") == []
+
+    # Case and diacritics are ignored on either side
+    assert search_scripts(client, "ECOLE", "fr") == ["école"]
+    assert search_scripts(client, "élè", "fr") == ["élève"]
+    assert search_scripts(client, "manana", "es") == ["mañana"]
+    assert search_scripts(client, "kitab", "ar") == ["كِتَابٌ"]
+
+    # Arabic matches with or without harakat, and hamza/ta marbuta forms are folded
+    assert search_scripts(client, "كتاب", "ar") == ["كِتَابٌ"]
+    assert search_scripts(client, "كِتَا", "ar") == ["كِتَابٌ"]
+    assert search_scripts(client, "مدرسه", "ar") == ["مَدْرَسَة"]
+    assert search_scripts(client, "اكل", "ar") == ["أَكَلَ"]
+
+def test_search_words_ranking(client, db_session, languages):
+    """Test that script and transliteration matches rank above meaning matches."""
+    db_session.add_all([
+        Word(script="parler", meaning="to speak", language_code="fr"),
+        Word(script="dire", meaning="to say, to tell, to speak up", language_code="fr"),
+        Word(script="speaker", meaning="speaker", language_code="fr"),
+    ])
+    db_session.commit()
+
+    assert search_scripts(client, "speak", "fr") == ["speaker", "parler", "dire"]
+
+def test_search_words_pagination(client, db_session, languages):
+    db_session.add_all([
+        Word(script=f"mot{i}", meaning="word", language_code="fr") for i in range(5)
+    ])
+    db_session.commit()
+
+    response = client.get("/words/search?q=word&language_code=fr&per_page=2&page=3")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 5
+    assert [item["script"] for item in data["items"]] == ["mot4"]
+    assert data["items"][0]["stats"] == {"correct_count": 0, "wrong_count": 0}
+
+def test_search_words_follows_updates(client, db_session, languages):
+    word = Word(script="chat", meaning="cat", language_code="fr")
+    db_session.add(word)
+    db_session.commit()
+    word_id = word.id
+
+    db_session.query(Word).filter(Word.id == word_id).update({"meaning": "tomcat"})
+    db_session.commit()
+    assert search_scripts(client, "cat", "fr") == []
+    assert search_scripts(client, "tomcat", "fr") == ["chat"]
+
+    db_session.query(Word).filter(Word.id == word_id).delete()
+    db_session.commit()
+    assert search_scripts(client, "tomcat", "fr") == []
+
+def test_search_words_query_syntax(client, db_session, languages):
+    """Test that FTS5 syntax in the query is searched as text, not interpreted."""
+    db_session.add(Word(script="or", meaning="gold", language_code="fr"))
+    db_session.commit()
+
+    for q in ['gold"', "gold*", "-gold", "(gold", "gold:", "^gold", "gold OR"]:
+        assert search_scripts(client, q, "fr") == ["or"]
+    # Operators are plain terms that must match too
+    assert search_scripts(client, "gold OR silver", "fr") == []
+    assert search_scripts(client, "NEAR(gold)", "fr") == []
+    assert search_scripts(client, "meaning:gold", "fr") == []
+    assert search_scripts(client, '" * ()', "fr") == []
+
+def test_search_words_requires_query(client, db_session):
+    assert client.get("/words/search?q=&language_code=fr").status_code == 422
+    assert client.get("/words/search?language_code=fr").status_code == 422
+
+def test_get_hardest_words(client, db_session, study_history):
+    # One review per word, two of every three wrong; nothing is ranked before the first refresh
+    wrong_ids = {
+        word_id for word_id, correct in db_session.query(WordReviewItem.word_id, WordReviewItem.correct) if not correct
+    }
+    response = client.get("/words/hardest?language_code=ja")
+    assert response.status_code == 200
+    assert response.json() == {"window_days": 30, "refreshed_at": None, "items": []}
+
+    # Reviews made at the same moment weigh the same
+    db_session.query(WordReviewItem).update({"created_at": datetime.utcnow()})
+    db_session.commit()
+    rebuild_word_difficulty(db_session)
+    data = client.get("/words/hardest?language_code=ja&window_days=7&limit=20").json()
+    assert data["window_days"] == 7
+    assert data["refreshed_at"] is not None
+    assert len(data["items"]) == len(wrong_ids) == 16
+    assert [item["rank"] for item in data["items"]] == list(range(1, 17))
+    # Equal records: ties are broken by id
+    assert [item["id"] for item in data["items"]] == sorted(wrong_ids)
+    item = data["items"][0]
+    assert set(item) == {"id", "script", "transliteration", "meaning", "rank", "error_rate", "reviews", "wrong"}
+    assert (item["reviews"], item["wrong"]) == (1, 1)
+    assert 0.5 < item["error_rate"] < 2 / 3
+
+    assert len(client.get("/words/hardest?language_code=ja").json()["items"]) == 10
+    assert len(client.get("/words/hardest?language_code=ja&limit=3").json()["items"]) == 3
+    assert client.get("/words/hardest?language_code=es").json()["items"] == []
+
+def test_get_hardest_words_validation(client, db_session):
+    assert client.get("/words/hardest").status_code == 422
+    response = client.get("/words/hardest?language_code=ja&window_days=14")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "window_days must be one of 7, 30, 90"
+    assert client.get("/words/hardest?language_code=ja&limit=0").status_code == 422
+    assert client.get("/words/hardest?language_code=ja&limit=101").status_code == 422
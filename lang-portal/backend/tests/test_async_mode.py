@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import response_cache
+from app.database import Base, get_async_db_url, setup_async_db, setup_db
+from app.main import app, get_db
+from app.seed import seed_all
+
+@pytest.fixture(scope="function")
+def async_client(tmp_path):
+    """Client whose routes receive an AsyncSession on a seeded file database."""
+    db_url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine, SessionLocal = setup_db(db_url)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        seed_all(db, include_test_data=True)
+
+    async_engine, AsyncSessionLocal = setup_async_db(db_url)
+
+    async def override_get_db():
+        async with AsyncSessionLocal() as db:
+            assert isinstance(db, AsyncSession)
+            yield db
+
+    with TestClient(app) as c:
+        app.dependency_overrides[get_db] = override_get_db
+        if response_cache is not None:
+            c.portal.call(response_cache.clear)
+        yield c
+        app.dependency_overrides.clear()
+        c.portal.call(async_engine.dispose)
+    engine.dispose()
+
+def test_get_async_db_url():
+    assert get_async_db_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert get_async_db_url("sqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+
+def test_async_mode_reads(async_client):
+    response = async_client.get("/words?language_code=ja")
+    assert response.status_code == 200
+    assert response.json()["total"] > 0
+
+    word_id = response.json()["items"][0]["id"]
+    response = async_client.get(f"/words/{word_id}")
+    assert response.status_code == 200
+    assert response.json()["groups"]
+
+    response = async_client.get("/dashboard/quick-stats?language_code=ja")
+    assert response.status_code == 200
+
+    # Session lists lazily load the group and activity of every session
+    response = async_client.get("/study-sessions?language_code=ja")
+    assert response.status_code == 200
+    assert all(item["group"]["id"] for item in response.json()["items"])
+
+def test_async_mode_writes(async_client):
+    group = async_client.get("/groups?language_code=ja").json()["items"][0]
+    word = async_client.get(f"/groups/{group['id']}").json()["words"]["items"][0]
+
+    response = async_client.post(
+        "/study-sessions",
+        json={"group_id": group["id"], "study_activity_id": 1}
+    )
+    assert response.status_code == 200
+    session_id = response.json()["id"]
+
+    response = async_client.post(
+        f"/study-sessions/{session_id}/reviews",
+        json={"word_id": word["id"], "correct": True}
+    )
+    assert response.status_code == 200
+
+    stats = async_client.get(f"/words/{word['id']}").json()["stats"]
+    assert stats["correct_count"] == word["stats"]["correct_count"] + 1
+
+def test_async_mode_not_found(async_client):
+    response = async_client.get("/study-sessions/999999")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Study session with id 999999 not found"
+
+def test_async_mode_export_streams(async_client):
+    response = async_client.get("/export/reviews?language_code=ja")
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 30
@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from fastapi import Request
+from app.cache import MemoryBackend, ResponseCache, response_cache
+from app.models import StudySession
+from app.seed import seed_all
+
+pytestmark = pytest.mark.skipif(response_cache is None, reason="response cache disabled")
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+
+    async def scenario():
+        await backend.set("a", b"1", ttl=60)
+        await backend.set("b", b"2", ttl=60)
+        await backend.get("a")  # "b" is now the least recently used
+        await backend.set("c", b"3", ttl=60)
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [b"1", None, b"3"]
+
+def test_memory_backend_expires_entries():
+    backend = MemoryBackend(max_entries=10)
+
+    async def scenario():
+        await backend.set("a", b"1", ttl=-1)
+        return await backend.get("a")
+
+    assert asyncio.run(scenario()) is None
+
+def test_cached_route_hit_and_etag(client, db_session):
+    seed_all(db_session)
+
+    first = client.get("/languages")
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    etag = first.headers["ETag"]
+
+    second = client.get("/languages")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == etag
+    assert second.json() == first.json()
+
+    # Query parameters are part of the key
+    assert client.get("/languages?active=true").headers["X-Cache"] == "MISS"
+
+    not_modified = client.get("/languages", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    stats = client.get("/admin/cache/stats").json()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["not_modified"] == 1
+
+def test_errors_are_not_cached(client, db_session):
+    assert client.get("/groups/999").status_code == 404
+    response = client.get("/groups/999")
+    assert response.status_code == 404
+    assert "X-Cache" not in response.headers
+
+def test_review_invalidates_group_words_only(client, db_session):
+    seed_all(db_session)
+    group = client.get("/groups?language_code=ja").json()["items"][0]
+    word = client.get(f"/groups/{group['id']}").json()["words"]["items"][0]
+    languages_etag = client.get("/languages").headers["ETag"]
+    group_etag = client.get(f"/groups/{group['id']}").headers["ETag"]
+
+    session = StudySession(group_id=group["id"], study_activity_id=1)
+    db_session.add(session)
+    db_session.commit()
+    response = client.post(
+        f"/study-sessions/{session.id}/reviews",
+        json={"word_id": word["id"], "correct": True}
+    )
+    assert response.status_code == 200
+
+    # The group's words carry review counters, so its cached page was dropped
+    response = client.get(f"/groups/{group['id']}", headers={"If-None-Match": group_etag})
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "MISS"
+    refreshed = next(w for w in response.json()["words"]["items"] if w["id"] == word["id"])
+    assert refreshed["stats"]["correct_count"] == word["stats"]["correct_count"] + 1
+
+    # Languages do not depend on reviews and stay cached
+    response = client.get("/languages", headers={"If-None-Match": languages_etag})
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "HIT"
+
+def test_seed_invalidates_everything(client, db_session):
+    assert client.get("/languages").json() == []
+    assert client.post("/admin/seed").status_code == 200
+
+    response = client.get("/languages")
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.json()) > 0
+
+def test_invalidation_keys_are_versioned():
+    cache = ResponseCache(MemoryBackend(max_entries=10), ttl=60)
+
+    request = Request({"type": "http", "path": "/groups", "query_string": b"language_code=ja", "headers": []})
+
+    async def scenario():
+        before = await cache.key_for(request, ["groups", "words"])
+        await cache.invalidate("study_sessions")
+        unrelated = await cache.key_for(request, ["groups", "words"])
+        await cache.invalidate("words")
+        after = await cache.key_for(request, ["groups", "words"])
+        return before, unrelated, after
+
+    before, unrelated, after = asyncio.run(scenario())
+    assert before == unrelated
+    assert after != before
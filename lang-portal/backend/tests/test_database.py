@@ -1,5 +1,105 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
 from sqlalchemy import text
+from sqlalchemy.exc import InternalError, OperationalError
+from app.core.config import settings
+from app.database import (
+    engine_options, file_lock, get_async_db_url, get_startup_lock_path, get_test_db_url, is_sqlite_file,
+    run_sqlite_maintenance, setup_async_db, setup_db
+)
 
 def test_database_connection(db_session):
     result = db_session.execute(text("SELECT 1")).scalar()
-    assert result == 1
\ No newline at end of file
+    assert result == 1
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine, _ = setup_db(f"sqlite:///{tmp_path / 'tuned.db'}", pragmas=settings.sqlite_pragmas)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # MEMORY
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == settings.SQLITE_CACHE_SIZE
+    run_sqlite_maintenance(engine)
+    engine.dispose()
+
+def test_sqlite_pragmas_applied_to_async_engine(tmp_path):
+    async_engine, _ = setup_async_db(f"sqlite:///{tmp_path / 'tuned.db'}", pragmas=settings.sqlite_pragmas)
+
+    async def journal_mode():
+        async with async_engine.connect() as conn:
+            mode = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar()
+        await async_engine.dispose()
+        return mode
+
+    assert asyncio.run(journal_mode()) == "wal"
+
+def test_read_only_engine_refuses_writes(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'split.db'}"
+    writer, _ = setup_db(db_url, pragmas=settings.sqlite_pragmas, pool_size=1)
+    reader, _ = setup_db(db_url, pragmas=settings.sqlite_pragmas, read_only=True)
+    with writer.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("SELECT x FROM t").scalar() == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.exec_driver_sql("INSERT INTO t VALUES (2)")
+    assert writer.pool.size() == 1
+    reader.dispose()
+    writer.dispose()
+
+def test_server_engine_options():
+    options = {"pool_size": 20, "max_overflow": 5, "pool_recycle": 600, "statement_timeout_ms": 3000}
+    assert engine_options("postgresql://db/lang_portal", None, False, options) == {
+        "pool_size": 20, "max_overflow": 5, "pool_recycle": 600, "pool_pre_ping": True,
+        "connect_args": {"options": "-c statement_timeout=3000"},
+    }
+    # The async driver takes server settings instead of a command line
+    assert engine_options("postgresql+asyncpg://db/lang_portal", None, True, options)["connect_args"] == {
+        "server_settings": {"statement_timeout": "3000", "default_transaction_read_only": "on"}
+    }
+    # SQLite ignores the server options
+    assert engine_options("sqlite:///app.db", 1, False, options) == {
+        "connect_args": {"check_same_thread": False}, "pool_size": 1, "max_overflow": 0
+    }
+
+def test_async_db_url():
+    assert get_async_db_url("sqlite:///app.db") == "sqlite+aiosqlite:///app.db"
+    assert get_async_db_url("postgresql://u:p@db/lp") == "postgresql+asyncpg://u:p@db/lp"
+    assert get_async_db_url("postgresql+psycopg2://u:p@db/lp") == "postgresql+asyncpg://u:p@db/lp"
+    assert get_async_db_url("postgresql+asyncpg://u:p@db/lp") == "postgresql+asyncpg://u:p@db/lp"
+
+@pytest.mark.postgresql_only
+def test_postgresql_timeout_and_read_only():
+    options = {**settings.db_options, "statement_timeout_ms": 100}
+    reader, _ = setup_db(get_test_db_url(), read_only=True, options=options)
+    with reader.connect() as conn:
+        with pytest.raises(OperationalError, match="statement timeout"):
+            conn.exec_driver_sql("SELECT pg_sleep(1)")
+    with reader.connect() as conn:
+        with pytest.raises(InternalError, match="read-only transaction"):
+            conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+    reader.dispose()
+
+def test_startup_lock_path():
+    assert is_sqlite_file("sqlite:////data/app.db")
+    assert not is_sqlite_file("sqlite:///:memory:")
+    assert get_startup_lock_path("sqlite:////data/app.db") == "/data/app.db.startup.lock"
+
+def test_file_lock_excludes_other_processes(tmp_path):
+    path = str(tmp_path / "startup.lock")
+    try_lock = (
+        "import fcntl, sys\n"
+        f"f = open({path!r}, 'a')\n"
+        "try:\n"
+        "    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)\n"
+        "except BlockingIOError:\n"
+        "    sys.exit(1)\n"
+    )
+    with file_lock(path):
+        assert subprocess.run([sys.executable, "-c", try_lock]).returncode == 1
+    assert subprocess.run([sys.executable, "-c", try_lock]).returncode == 0
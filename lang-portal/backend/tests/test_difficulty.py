@@ -0,0 +1,217 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.database import Base, setup_db
+from app.models import Group, Language, StudyActivity, StudySession, Word, WordDifficulty, WordReviewItem
+from app.utils.difficulty import (
+    HALF_LIFE_DAYS, MAX_HARDEST_WORDS, WINDOWS, rebuild_word_difficulty, refresh_word_difficulty, word_difficulty_ranking
+)
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+@pytest.fixture
+def review(db_session):
+    """Add a review of a word made days_ago days before now (NOW by default)."""
+    activity = StudyActivity(name="Flashcards", url="/flashcards", description="", image_url="", is_language_specific=False)
+    db_session.add(activity)
+    db_session.commit()
+    sessions = {}
+
+    def add(word, correct, days_ago, now=NOW):
+        if word.language_code not in sessions:
+            group = Group(name=f"Group {word.language_code}", language_code=word.language_code)
+            db_session.add(group)
+            db_session.commit()
+            sessions[word.language_code] = StudySession(group_id=group.id, study_activity_id=activity.id)
+            db_session.add(sessions[word.language_code])
+            db_session.commit()
+        db_session.add(WordReviewItem(
+            word_id=word.id,
+            study_session_id=sessions[word.language_code].id,
+            correct=correct,
+            created_at=now - timedelta(days=days_ago)
+        ))
+
+    return add
+
+def add_words(db_session, language_code, count):
+    if db_session.get(Language, language_code) is None:
+        db_session.add(Language(code=language_code, name=language_code))
+    words = [Word(script=f"{language_code}{i}", meaning=f"meaning {i}", language_code=language_code) for i in range(count)]
+    db_session.add_all(words)
+    db_session.commit()
+    return words
+
+def ranking(db_session, language_code, window_days):
+    return [
+        (row.word_id, row.error_rate, row.reviews, row.wrong)
+        for row in db_session.query(WordDifficulty)
+        .filter_by(language_code=language_code, window_days=window_days)
+        .order_by(WordDifficulty.rank)
+    ]
+
+def expected_ranking(reviews, window_days):
+    """The ranking computed in Python from (word_id, correct, days_ago) reviews."""
+    per_word = {}
+    for word_id, correct, days_ago in reviews:
+        if days_ago <= window_days:
+            weight = 0.5 ** (days_ago / HALF_LIFE_DAYS)
+            total, wrong_weight, count, wrong = per_word.get(word_id, (0.0, 0.0, 0, 0))
+            per_word[word_id] = (total + weight, wrong_weight + (0 if correct else weight), count + 1, wrong + (not correct))
+    rows = [
+        (word_id, (wrong_weight + 1) / (total + 2), count, wrong)
+        for word_id, (total, wrong_weight, count, wrong) in per_word.items()
+        if wrong > 0
+    ]
+    rows.sort(key=lambda row: (-row[1], -row[3], row[0]))
+    return rows[:MAX_HARDEST_WORDS]
+
+def test_recent_mistakes_rank_first(db_session, review):
+    old, recent, correct = add_words(db_session, "ja", 3)
+    for _ in range(3):
+        review(old, False, 20)
+        review(recent, False, 1)
+    review(old, True, 1)
+    review(recent, True, 20)
+    review(correct, True, 1)
+    db_session.commit()
+
+    # Both words in the 30- and 90-day windows, only recent in the 7-day one
+    assert rebuild_word_difficulty(db_session, NOW) == 2 + 2 + 1
+    [first, second] = ranking(db_session, "ja", 30)
+    assert first[0] == recent.id and second[0] == old.id
+    # Both have 3 of 4 reviews wrong; only the weights differ
+    assert first[2:] == second[2:] == (4, 3)
+    assert first[1] > 0.75 > second[1]
+    # The 7-day window only sees yesterday's reviews: three misses of recent, a correct answer for old
+    weight = 0.5 ** (1 / HALF_LIFE_DAYS)
+    assert ranking(db_session, "ja", 7) == [(recent.id, pytest.approx((3 * weight + 1) / (3 * weight + 2), rel=1e-6), 3, 3)]
+
+def test_single_mistake_does_not_outrank_repeated_ones(db_session, review):
+    once, often = add_words(db_session, "ja", 2)
+    review(once, False, 1)
+    for _ in range(9):
+        review(often, False, 1)
+    review(often, True, 1)
+    db_session.commit()
+
+    rebuild_word_difficulty(db_session, NOW)
+    assert [row[0] for row in ranking(db_session, "ja", 30)] == [often.id, once.id]
+
+def test_ranking_matches_python_on_random_reviews(db_session, review):
+    rng = random.Random(22)
+    words = {code: add_words(db_session, code, 150) for code in ("ja", "es")}
+    reviews = {code: [] for code in words}
+    for code, language_words in words.items():
+        # Some words are much harder than others, and reviews spread beyond the longest window
+        difficulty = {word.id: rng.random() for word in language_words}
+        for _ in range(3000):
+            word = rng.choice(language_words)
+            correct = rng.random() > difficulty[word.id]
+            days_ago = rng.uniform(0, 120)
+            review(word, correct, days_ago)
+            reviews[code].append((word.id, correct, days_ago))
+    db_session.commit()
+
+    rebuild_word_difficulty(db_session, NOW)
+    for code in words:
+        # The longest window has more words with mistakes than are ranked
+        assert len(expected_ranking(reviews[code], max(WINDOWS))) == MAX_HARDEST_WORDS
+        for window_days in WINDOWS:
+            expected = expected_ranking(reviews[code], window_days)
+            actual = ranking(db_session, code, window_days)
+            assert [row[0] for row in actual] == [row[0] for row in expected]
+            assert [row[1] for row in actual] == [pytest.approx(row[1], rel=1e-6) for row in expected]
+            assert [row[2:] for row in actual] == [row[2:] for row in expected]
+
+def test_rebuild_replaces_the_ranking(db_session, review):
+    [word] = add_words(db_session, "ja", 1)
+    review(word, False, 1)
+    db_session.commit()
+    rebuild_word_difficulty(db_session, NOW)
+    assert len(ranking(db_session, "ja", 30)) == 1
+
+    # A month later the mistake has left the 30-day window
+    rebuild_word_difficulty(db_session, NOW + timedelta(days=31))
+    assert ranking(db_session, "ja", 30) == []
+    assert len(ranking(db_session, "ja", 90)) == 1
+    assert {row.refreshed_at for row in db_session.query(WordDifficulty)} == {NOW + timedelta(days=31)}
+
+def test_refresh_skips_a_recent_ranking(db_session, review):
+    [word] = add_words(db_session, "ja", 1)
+    review(word, False, 0, now=datetime.utcnow())
+    db_session.commit()
+    SessionLocal = sessionmaker(bind=db_session.connection())
+
+    assert refresh_word_difficulty(SessionLocal, 3600)
+    assert not refresh_word_difficulty(SessionLocal, 3600)
+    # Another worker's ranking from two hours ago is stale
+    db_session.query(WordDifficulty).update({"refreshed_at": datetime.utcnow() - timedelta(hours=2)})
+    db_session.commit()
+    assert refresh_word_difficulty(SessionLocal, 3600)
+
+@pytest.mark.sqlite_only
+def test_refresh_ranks_without_the_writer_connection(tmp_path):
+    # The read/write split of a file database: one writer connection and a read-only pool
+    db_url = f"sqlite:///{tmp_path / 'split.db'}"
+    writer, SessionLocal = setup_db(db_url, pragmas=settings.sqlite_pragmas, pool_size=1)
+    reader, ReadSessionLocal = setup_db(db_url, pragmas=settings.sqlite_pragmas, read_only=True)
+    Base.metadata.create_all(bind=writer)
+    with SessionLocal() as db:
+        db.add(Language(code="ja", name="Japanese"))
+        db.add(StudyActivity(name="Flashcards", url="/flashcards", description="", image_url="", is_language_specific=False))
+        db.add(Group(name="Verbs", language_code="ja"))
+        db.add(Word(script="ja0", meaning="meaning 0", language_code="ja"))
+        db.commit()
+        db.add(StudySession(group_id=1, study_activity_id=1))
+        db.commit()
+        db.add(WordReviewItem(word_id=1, study_session_id=1, correct=False))
+        db.commit()
+
+    written = []
+
+    @event.listens_for(reader, "before_cursor_execute")
+    def write_during_ranking(conn, cursor, statement, parameters, context, executemany):
+        if "row_number" in statement and not written:
+            # A request's write gets the writer connection while the ranking query runs
+            assert writer.pool.checkedout() == 0
+            with SessionLocal() as db:
+                db.add(WordReviewItem(word_id=1, study_session_id=1, correct=True))
+                db.commit()
+            written.append(statement)
+
+    assert refresh_word_difficulty(SessionLocal, 3600, ReadSessionLocal)
+    assert written
+    with SessionLocal() as db:
+        assert db.query(WordReviewItem).count() == 2
+        assert db.query(WordDifficulty).count() == len(WINDOWS)
+    reader.dispose()
+    writer.dispose()
+
+@pytest.mark.sqlite_only
+def test_ranking_reads_recent_reviews_through_covering_index(db_session):
+    statement = word_difficulty_ranking(30, NOW).compile(db_session.get_bind())
+    plan = db_session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", tuple(statement.params[name] for name in statement.positiontup)
+    ).fetchall()
+    details = [row[3] for row in plan]
+    assert any(
+        detail.startswith("SEARCH word_review_items USING COVERING INDEX ix_word_review_items_created_at_word_id_correct")
+        for detail in details
+    ), details
+
+def test_rebuild_writes_only_after_ranking(db_session, review, query_counter):
+    words = add_words(db_session, "ja", 3)
+    for word in words:
+        review(word, False, 1)
+    db_session.commit()
+
+    with query_counter() as statements:
+        assert rebuild_word_difficulty(db_session, NOW) == 3 * len(WINDOWS)
+    # The rankings are read first, then swapped in by one delete and one batched insert
+    assert [statement.split()[0] for statement in statements] == ["SELECT"] * len(WINDOWS) + ["DELETE", "INSERT"]
+    assert {row.refreshed_at for row in db_session.query(WordDifficulty)} == {NOW}
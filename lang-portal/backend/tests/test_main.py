@@ -1,5 +1,13 @@
+import os
+import subprocess
+import sys
+
 import pytest
+from fastapi import Request
 from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.core.config import settings
 from app.main import app, get_db
 
 def test_health_check():
@@ -19,7 +27,7 @@ def test_development_database_initialization(development_env, client, db_session
 def test_database_session_management():
     """Test database session management."""
     # Get database session
-    db = next(get_db())
+    db = next(get_db(Request({"type": "http", "method": "GET", "app": app})))
     assert db is not None
 
 def test_production_environment(production_env, client, db_session):
@@ -27,4 +35,48 @@ def test_production_environment(production_env, client, db_session):
     # This test verifies that no seeding occurs in production environment
     # The verification happens implicitly during lifespan setup
     # Test will pass only if application starts without attempting to seed
-    pass
\ No newline at end of file
+    pass
+
+# Starts the app (lifespan included) against DATABASE_URL and prints the languages it serves
+START_WORKER = """
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    print(len(client.get("/languages").json()))
+"""
+
+def test_concurrent_workers_prepare_the_database_once(tmp_path):
+    """Workers starting together create and seed the database once, under the startup lock."""
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'workers.db'}",
+        "ENVIRONMENT": "development",
+        "TESTING": "false",
+        "RESPONSE_CACHE_BACKEND": "off",
+        "SQLITE_MAINTENANCE_INTERVAL": "0",
+    }
+    env.pop("RUNNING_TEST_ON_DEV", None)
+    workers = [
+        subprocess.Popen([sys.executable, "-c", START_WORKER], env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                         text=True)
+        for _ in range(4)
+    ]
+    results = [worker.communicate(timeout=120) for worker in workers]
+    assert [worker.returncode for worker in workers] == [0] * 4, [stderr for _, stderr in results]
+    # Only the first worker seeded; the others found the data in place
+    assert sum("Seeding database" in stdout for stdout, _ in results) == 1
+    languages = {stdout.splitlines()[-1] for stdout, _ in results}
+    assert len(languages) == 1 and int(languages.pop()) > 0
+
+def test_reads_and_writes_use_separate_pools(tmp_path, monkeypatch):
+    """GET requests get a read-only session, other methods the single writer connection."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'split.db'}")
+    monkeypatch.setenv("TESTING", "false")
+    monkeypatch.setattr(settings, "SQLITE_MAINTENANCE_INTERVAL", 0)
+    with TestClient(app):
+        assert app.state.engine.pool.size() == 1
+        with app.state.ReadSessionLocal() as db:
+            with pytest.raises(OperationalError, match="readonly"):
+                db.execute(text("INSERT INTO languages (code, name) VALUES ('xx', 'Test')"))
+        assert next(get_db(Request({"type": "http", "method": "GET", "app": app}))).get_bind() is not app.state.engine
+        assert next(get_db(Request({"type": "http", "method": "POST", "app": app}))).get_bind() is app.state.engine
@@ -0,0 +1,84 @@
+import logging
+import re
+
+import pytest
+from sqlalchemy import text
+from app.metrics import instrument_engine, log_slow_query, metrics
+
+@pytest.fixture
+def instrumented(db_session):
+    """Reset the process metrics and instrument the test engine."""
+    metrics.clear()
+    instrument_engine(db_session.get_bind().engine)
+    yield
+    metrics.clear()
+
+def sample(body: str, name: str, **labels) -> float:
+    """Value of the sample of metric name carrying (at least) the given labels."""
+    for line in body.splitlines():
+        match = re.fullmatch(rf'{name}\{{(.*)\}} (\S+)', line)
+        if match and all(f'{key}="{value}"' in match.group(1) for key, value in labels.items()):
+            return float(match.group(2))
+    raise AssertionError(f"No sample {name} {labels} in:\n{body}")
+
+def test_requests_are_labelled_by_route_template(client, db_session, study_history, instrumented):
+    for group_id in (study_history["group_id"], study_history["group_id"] + 1):
+        assert client.get(f"/groups/{group_id}").status_code == 200
+    assert client.get("/groups/999").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    labels = {"method": "GET", "route": "/groups/{group_id}"}
+    assert sample(body, "http_requests_total", **labels, status=200) == 2
+    assert sample(body, "http_requests_total", **labels, status=404) == 1
+    assert sample(body, "http_request_duration_seconds_count", **labels) == 3
+    assert sample(body, "http_request_duration_seconds_bucket", **labels, le="+Inf") == 3
+    # Each found group takes two statements (group, words page), a missing one only the lookup
+    assert sample(body, "http_request_db_statements_sum", **labels) == 5
+    assert sample(body, "http_request_db_statements_bucket", **labels, le="2.0") == 3
+    assert sample(body, "http_request_db_duration_seconds_sum", **labels) > 0
+    assert f"/groups/{study_history['group_id']}" not in body
+
+def test_unmatched_paths_share_one_series(client, instrumented):
+    for path in ("/nope", "/nope/1", "/nope/2"):
+        assert client.get(path).status_code == 404
+    body = client.get("/metrics").text
+    assert sample(body, "http_requests_total", method="GET", route="unmatched", status=404) == 3
+    assert "/nope" not in body
+
+def test_statements_outside_requests_are_not_attributed(client, db_session, instrumented):
+    db_session.execute(text("SELECT 1"))
+    assert client.get("/health").status_code == 200
+    body = client.get("/metrics").text
+    assert sample(body, "http_request_db_statements_sum", route="/health") == 0
+
+@pytest.mark.sqlite_only
+def test_slow_queries_are_logged_with_their_plan(db_session, instrumented, monkeypatch, caplog):
+    monkeypatch.setattr("app.metrics.settings.SLOW_QUERY_MS", 1)
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        count = db_session.execute(text(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < :n) SELECT count(*) FROM c"
+        ), {"n": 200000}).scalar()
+    assert count == 200000
+    assert metrics.slow_queries == 1
+    [record] = [record for record in caplog.records if record.message.startswith("Slow query")]
+    assert "WITH RECURSIVE c(x)" in record.message
+    # EXPLAIN QUERY PLAN of a recursive CTE mentions its setup and recursive steps
+    assert "SETUP" in record.message and "RECURSIVE STEP" in record.message
+
+def test_failed_explain_leaves_the_transaction_usable(db_session, instrumented, caplog):
+    # On PostgreSQL the failure is rolled back to a savepoint instead of aborting the transaction
+    connection = db_session.connection()
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        log_slow_query(connection, "SELECT * FROM missing_table", (), 1.0, False)
+    [record] = caplog.records
+    assert "(EXPLAIN failed: " in record.message
+    assert db_session.execute(text("SELECT 1")).scalar() == 1
+
+def test_fast_queries_are_not_logged(db_session, instrumented, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        db_session.execute(text("SELECT 1"))
+    assert metrics.slow_queries == 0
+    assert not caplog.records
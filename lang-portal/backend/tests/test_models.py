@@ -1,6 +1,9 @@
 import pytest
+from datetime import date, datetime, timedelta
 from sqlalchemy.exc import IntegrityError
-from app.models import Word, Group, WordGroup, StudyActivity, StudySession, WordReviewItem, Language
+from app.models import Word, Group, WordGroup, StudyActivity, StudySession, WordReviewItem, Language, DailyActivity, ReviewSchedule
+from app.models import DailyActiveGroup, DailyStudiedWord
+from app.utils.stats import rebuild_daily_activity, rebuild_group_word_counts, rebuild_progress_buckets
 
 def create_test_language(db_session, code="ja"):
     language = Language(code=code, name=f"{code} language")
@@ -214,4 +217,221 @@ def test_word_with_language(db_session):
     # Test relationships
     assert word.language.code == "ja"
     assert word.language.name == "Japanese"
-    assert language.words[0].script == "食べる" 
\ No newline at end of file
+    assert language.words[0].script == "食べる" 
+def test_word_review_counters_follow_review_rows(db_session):
+    language = create_test_language(db_session)
+    word = Word(script="食べる", meaning="to eat", language_code=language.code)
+    group = Group(name="Verbs", language_code=language.code)
+    db_session.add_all([word, group])
+    db_session.commit()
+    activity = StudyActivity(name="Flashcards", url="/study/flashcards", description="Practice", image_url="/images/flashcards.png")
+    db_session.add(activity)
+    db_session.commit()
+    session = StudySession(group_id=group.id, study_activity_id=activity.id)
+    db_session.add(session)
+    db_session.commit()
+
+    reviews = [
+        WordReviewItem(word_id=word.id, study_session_id=session.id, correct=True),
+        WordReviewItem(word_id=word.id, study_session_id=session.id, correct=True),
+        WordReviewItem(word_id=word.id, study_session_id=session.id, correct=False),
+    ]
+    db_session.add_all(reviews)
+    db_session.commit()
+    db_session.refresh(word)
+    assert (word.correct_count, word.wrong_count) == (2, 1)
+
+    # Flipping a result moves it between counters
+    reviews[0].correct = False
+    db_session.commit()
+    db_session.refresh(word)
+    assert (word.correct_count, word.wrong_count) == (1, 2)
+
+    db_session.delete(reviews[1])
+    db_session.commit()
+    db_session.refresh(word)
+    assert (word.correct_count, word.wrong_count) == (0, 2)
+
+def test_daily_activity_follows_sessions_and_reviews(db_session):
+    language = create_test_language(db_session)
+    word = Word(script="食べる", meaning="to eat", language_code=language.code)
+    group = Group(name="Verbs", language_code=language.code)
+    activity = StudyActivity(name="Flashcards", url="/study/flashcards", description="Practice", image_url="/images/flashcards.png")
+    db_session.add_all([word, group, activity])
+    db_session.commit()
+
+    day = datetime(2024, 3, 1, 9, 30)
+    session = StudySession(group_id=group.id, study_activity_id=activity.id, created_at=day)
+    db_session.add(session)
+    db_session.commit()
+    reviews = [
+        WordReviewItem(word_id=word.id, study_session_id=session.id, correct=True, created_at=day),
+        WordReviewItem(word_id=word.id, study_session_id=session.id, correct=False, created_at=day),
+    ]
+    db_session.add_all(reviews)
+    db_session.commit()
+
+    def activity_rows():
+        return [
+            (row.date, row.sessions, row.reviews, row.correct)
+            for row in db_session.query(DailyActivity).filter(DailyActivity.sessions + DailyActivity.reviews > 0)
+            .order_by(DailyActivity.date)
+        ]
+
+    assert activity_rows() == [(date(2024, 3, 1), 1, 2, 1)]
+
+    # Moving a review to the next day moves it between rollup rows
+    reviews[0].created_at = day + timedelta(days=1)
+    db_session.commit()
+    assert activity_rows() == [(date(2024, 3, 1), 1, 1, 0), (date(2024, 3, 2), 0, 1, 1)]
+
+    db_session.delete(reviews[1])
+    db_session.commit()
+    assert activity_rows() == [(date(2024, 3, 1), 1, 0, 0), (date(2024, 3, 2), 0, 1, 1)]
+
+    # The triggers agree with a rebuild from the raw rows
+    rebuild_daily_activity(db_session)
+    assert activity_rows() == [(date(2024, 3, 1), 1, 0, 0), (date(2024, 3, 2), 0, 1, 1)]
+
+def test_group_words_count_follows_word_groups(db_session):
+    language = create_test_language(db_session)
+    other = Language(code="es", name="Spanish")
+    words = [Word(script=script, meaning=script, language_code=language.code) for script in ("本", "猫", "犬")]
+    group = Group(name="Nouns", language_code=language.code)
+    other_group = Group(name="Sustantivos", language_code="es")
+    db_session.add_all([other, *words, group, other_group])
+    db_session.commit()
+
+    def words_counts():
+        db_session.expire_all()
+        return group.words_count, other_group.words_count
+
+    assert words_counts() == (0, 0)
+    db_session.add_all([WordGroup(word_id=word.id, group_id=group.id) for word in words])
+    db_session.commit()
+    assert words_counts() == (3, 0)
+
+    # Words of another language are linked but not counted
+    db_session.add(WordGroup(word_id=words[0].id, group_id=other_group.id))
+    db_session.commit()
+    assert words_counts() == (3, 0)
+
+    db_session.query(WordGroup).filter(WordGroup.word_id == words[1].id).delete()
+    db_session.commit()
+    assert words_counts() == (2, 0)
+
+    # A word moving language moves between the counts of its groups
+    words[0].language_code = "es"
+    db_session.commit()
+    assert words_counts() == (1, 1)
+
+    # The triggers agree with a rebuild from the links
+    rebuild_group_word_counts(db_session)
+    assert words_counts() == (1, 1)
+
+@pytest.mark.postgresql_only
+def test_group_words_count_follows_deleted_words(db_session):
+    """A deleted word leaves the counts of its groups, although ON DELETE CASCADE unlinks it after the row is gone."""
+    language = create_test_language(db_session)
+    words = [Word(script=script, meaning=script, language_code=language.code) for script in ("本", "猫")]
+    group = Group(name="Nouns", language_code=language.code)
+    db_session.add_all([*words, group])
+    db_session.commit()
+    db_session.add_all([WordGroup(word_id=word.id, group_id=group.id) for word in words])
+    db_session.commit()
+    assert group.words_count == 2
+
+    # A bulk delete, so the links are left to the database rather than unlinked by the ORM
+    db_session.query(Word).filter(Word.id == words[0].id).delete()
+    db_session.commit()
+    assert group.words_count == 1
+    assert db_session.query(WordGroup).count() == 1
+    rebuild_group_word_counts(db_session)
+    db_session.expire_all()
+    assert group.words_count == 1
+
+def test_review_schedules_follow_word_groups(db_session):
+    language = create_test_language(db_session)
+    words = [Word(script=script, meaning=script, language_code=language.code) for script in ("本", "猫")]
+    groups = [Group(name=name, language_code=language.code) for name in ("Nouns", "Animals")]
+    db_session.add_all([*words, *groups])
+    db_session.commit()
+
+    def schedules():
+        return sorted(
+            (row.group_id, row.word_id, row.repetitions)
+            for row in db_session.query(ReviewSchedule)
+        )
+
+    db_session.add_all([
+        WordGroup(word_id=words[0].id, group_id=groups[0].id),
+        WordGroup(word_id=words[1].id, group_id=groups[0].id),
+        WordGroup(word_id=words[1].id, group_id=groups[1].id),
+    ])
+    db_session.commit()
+    assert schedules() == [
+        (groups[0].id, words[0].id, 0), (groups[0].id, words[1].id, 0), (groups[1].id, words[1].id, 0)
+    ]
+    assert all(row.due_at is not None for row in db_session.query(ReviewSchedule))
+
+    db_session.query(WordGroup).filter(WordGroup.group_id == groups[0].id).delete()
+    db_session.commit()
+    assert schedules() == [(groups[1].id, words[1].id, 0)]
+
+def test_progress_buckets_follow_sessions_and_reviews(db_session):
+    language = create_test_language(db_session)
+    words = [Word(script=script, meaning=script, language_code=language.code) for script in ("食べる", "飲む")]
+    groups = [Group(name=name, language_code=language.code) for name in ("Verbs", "Food")]
+    activity = StudyActivity(name="Flashcards", url="/study/flashcards", description="Practice", image_url="/images/flashcards.png")
+    db_session.add_all([*words, *groups, activity])
+    db_session.commit()
+
+    day = datetime(2024, 3, 1, 9, 30)
+    session = StudySession(group_id=groups[0].id, study_activity_id=activity.id, created_at=day)
+    db_session.add(session)
+    db_session.commit()
+    reviews = [
+        WordReviewItem(word_id=words[0].id, study_session_id=session.id, correct=True, created_at=day),
+        WordReviewItem(word_id=words[0].id, study_session_id=session.id, correct=False, created_at=day),
+        WordReviewItem(word_id=words[1].id, study_session_id=session.id, correct=True, created_at=day),
+    ]
+    db_session.add_all(reviews)
+    db_session.commit()
+
+    def buckets():
+        studied = [
+            (row.date, row.word_id, row.reviews)
+            for row in db_session.query(DailyStudiedWord).order_by(DailyStudiedWord.date, DailyStudiedWord.word_id)
+        ]
+        active = [
+            (row.date, row.group_id, row.sessions)
+            for row in db_session.query(DailyActiveGroup).order_by(DailyActiveGroup.date, DailyActiveGroup.group_id)
+        ]
+        return studied, active
+
+    first, second = date(2024, 3, 1), date(2024, 3, 2)
+    assert buckets() == ([(first, words[0].id, 2), (first, words[1].id, 1)], [(first, groups[0].id, 1)])
+
+    # A word leaves a day's set with its last review of the day
+    db_session.delete(reviews[2])
+    db_session.commit()
+    reviews[0].created_at = day + timedelta(days=1)
+    db_session.commit()
+    assert buckets()[0] == [(first, words[0].id, 1), (second, words[0].id, 1)]
+
+    # Moving the session moves its group between sets
+    session.group_id = groups[1].id
+    db_session.commit()
+    assert buckets()[1] == [(first, groups[1].id, 1)]
+
+    # The triggers agree with a rebuild from the raw rows
+    expected = buckets()
+    rebuild_progress_buckets(db_session, today=second)
+    assert buckets() == expected
+
+    # Activity more than a window later drops the language's old days
+    later = day + timedelta(days=40)
+    db_session.add(StudySession(group_id=groups[0].id, study_activity_id=activity.id, created_at=later))
+    db_session.add(WordReviewItem(word_id=words[1].id, study_session_id=session.id, correct=True, created_at=later))
+    db_session.commit()
+    assert buckets() == ([(later.date(), words[1].id, 1)], [(later.date(), groups[0].id, 1)])
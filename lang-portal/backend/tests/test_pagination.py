@@ -0,0 +1,73 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from app.models import Word
+from app.utils.pagination import count_rows, decode_cursor, encode_cursor, paginate
+
+@pytest.fixture
+def executed_statements(db_session):
+    """Collect the SQL statements executed on the test connection."""
+    statements = []
+    connection = db_session.connection()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture
+def japanese_words(db_session, languages):
+    words = [Word(script=f"w{i}", meaning="m", language_code="ja") for i in range(3)]
+    db_session.add_all(words)
+    db_session.commit()
+    return words
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("食べる", 7)) == ("食べる", 7)
+    assert decode_cursor(encode_cursor(None, 3)) == (None, 3)
+    created_at = datetime(2025, 2, 17, 22, 17, 28)
+    assert decode_cursor(encode_cursor(created_at, 1)) == (created_at, 1)
+
+def test_decode_invalid_cursor():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("%%%")
+    assert exc_info.value.status_code == 400
+
+def test_decode_cursor_checks_sort():
+    cursor = encode_cursor(3, 7, "correct_count", "desc")
+    assert decode_cursor(cursor, "correct_count", "desc") == (3, 7)
+    for sort_by, order in (("correct_count", "asc"), ("script", "desc"), (None, "asc")):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor, sort_by, order)
+        assert exc_info.value.status_code == 400
+
+def test_count_rows_does_not_wrap_in_subquery(db_session, japanese_words, executed_statements):
+    query = db_session.query(Word).filter(Word.language_code == "ja").order_by(Word.script)
+    assert count_rows(query) == 3
+    assert len(executed_statements) == 1
+    assert "FROM (SELECT" not in executed_statements[0]
+    assert "ORDER BY" not in executed_statements[0]
+
+def test_paginate_first_page_skips_count(db_session, japanese_words, executed_statements):
+    """When every row fits on the first page the total comes from the fetched rows."""
+    query = db_session.query(Word).filter(Word.language_code == "ja")
+    result_page = paginate(
+        query, page=1, per_page=10, count_query=query,
+        id_column=Word.id, row_key=lambda word: (None, word.id)
+    )
+    assert result_page.total == 3
+    assert result_page.next_cursor is None
+    assert len(executed_statements) == 1
+
+def test_paginate_without_total(db_session, japanese_words, executed_statements):
+    query = db_session.query(Word).filter(Word.language_code == "ja")
+    result_page = paginate(
+        query, page=2, per_page=1, count_query=query, include_total=False,
+        id_column=Word.id, row_key=lambda word: (None, word.id)
+    )
+    assert result_page.total is None
+    assert [word.script for word in result_page.items] == ["w1"]
+    assert len(executed_statements) == 1
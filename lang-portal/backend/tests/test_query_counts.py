@@ -0,0 +1,31 @@
+import pytest
+
+# Statements per request, including the total count and the activity lookup; group and
+# activity names come from the page query itself, so none may grow with per_page
+LIST_ROUTES = [
+    ("/words?language_code=ja", 2),
+    ("/words/search?q=meaning&language_code=ja", 2),
+    ("/groups?language_code=ja", 2),
+    ("/groups/{group_id}", 2),
+    ("/study-sessions?language_code=ja", 2),
+    ("/study-sessions?language_code=ja&sort_by=reviews_count", 2),
+    ("/study-sessions/{session_id}/next", 2),
+    ("/study-activities/{activity_id}?language_code=ja", 3),
+]
+
+@pytest.mark.parametrize("url, statements", LIST_ROUTES)
+def test_list_routes_run_constant_statements(client, study_history, query_counter, url, statements):
+    for per_page in (2, 3):
+        separator = "&" if "?" in url else "?"
+        page_url = url.format(**study_history) + f"{separator}per_page={per_page}&limit={per_page}"
+        with query_counter() as executed:
+            response = client.get(page_url)
+        assert response.status_code == 200
+        assert len(executed) == statements, f"{page_url}:\n" + "\n\n".join(executed)
+
+def test_session_detail_runs_one_statement(client, study_history, query_counter):
+    with query_counter() as executed:
+        response = client.get(f"/study-sessions/{study_history['session_id']}")
+    assert response.status_code == 200
+    assert response.json()["group"]["name"] == "Group 0"
+    assert len(executed) == 1
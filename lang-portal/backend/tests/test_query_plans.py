@@ -0,0 +1,82 @@
+import re
+import pytest
+from sqlalchemy import event
+from app.seed import seed_all
+from app.utils.difficulty import rebuild_word_difficulty
+from app.models import Group, StudyActivity, StudySession, Word
+
+# Tables that grow with usage; a router query must never read them with a bare table scan
+# or with an automatic index (which SQLite builds by scanning the table on every query)
+HOT_TABLES = {"words", "word_groups", "groups", "study_sessions", "word_review_items", "review_schedules"}
+TABLE_SCAN = re.compile(r"^(?:SCAN (\w+)$|SEARCH (\w+) USING AUTOMATIC)")
+
+@pytest.fixture
+def captured_statements(db_session):
+    """Record every SELECT issued on the test connection while the fixture is active."""
+    statements = []
+    connection = db_session.connection()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+def table_scans(db_session, statement, parameters):
+    """Return the hot tables a statement reads with a full table scan."""
+    plan = db_session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    ).fetchall()
+    scans = set()
+    for row in plan:
+        match = TABLE_SCAN.match(row[3])
+        table = match and (match.group(1) or match.group(2))
+        if table in HOT_TABLES:
+            scans.add(table)
+    return scans
+
+@pytest.mark.sqlite_only
+def test_router_queries_use_indexes(client, db_session, captured_statements):
+    """Every list/detail/dashboard route must resolve its queries through indexes."""
+    seed_all(db_session, include_test_data=True)
+    group = db_session.query(Group).filter(Group.language_code == "ja").first()
+    word = db_session.query(Word).filter(Word.language_code == "ja").first()
+    activity = db_session.query(StudyActivity).first()
+    session = db_session.query(StudySession).first()
+    rebuild_word_difficulty(db_session)
+    captured_statements.clear()
+
+    urls = [
+        "/words?language_code=ja",
+        "/words?language_code=ja&sort_by=correct_count&order=desc",
+        f"/words/{word.id}",
+        "/words/search?q=eat&language_code=ja",
+        "/words/hardest?language_code=ja",
+        "/groups?language_code=ja",
+        "/groups?language_code=ja&sort_by=words_count&order=desc",
+        f"/groups/{group.id}",
+        f"/groups/{group.id}?sort_by=wrong_count&order=desc",
+        "/study-sessions?language_code=ja",
+        "/study-sessions?language_code=ja&sort_by=reviews_count",
+        f"/study-sessions/{session.id}",
+        f"/study-sessions/{session.id}/next",
+        f"/study-activities/{activity.id}?language_code=ja",
+        "/dashboard/summary?language_code=ja",
+        "/dashboard/last-session?language_code=ja",
+        "/dashboard/progress?language_code=ja",
+        "/dashboard/quick-stats?language_code=ja",
+        "/analytics/reviews?language_code=ja&bucket=week",
+        f"/analytics/reviews?language_code=ja&bucket=month&group_id={group.id}",
+    ]
+    for url in urls:
+        assert client.get(url).status_code == 200, url
+
+    assert captured_statements
+    failures = []
+    for statement, parameters in captured_statements:
+        scans = table_scans(db_session, statement, parameters)
+        if scans:
+            failures.append((sorted(scans), statement))
+    assert not failures, failures
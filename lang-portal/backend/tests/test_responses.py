@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import List
+
+import pytest
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.models import StudySession
+from app.responses import FastJSONResponse
+from app.utils.difficulty import rebuild_word_difficulty
+from app.schemas import DueWord, GroupDetail, HardestWords, PaginatedGroups, PaginatedStudySessions, PaginatedWords
+from app.schemas import ReviewAnalytics, StudyActivityWithSessions, StudySessionDetail
+
+def test_fast_json_response_matches_json_response():
+    content = {"script": "食べる", "transliteration": None, "ease": 2.5, "count": 3, "items": [True, False]}
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+def test_fast_json_response_renders_datetimes_as_isoformat():
+    for value in (datetime(2024, 1, 2, 3, 4, 5), datetime(2024, 1, 2, 3, 4, 5, 678)):
+        assert FastJSONResponse({"created_at": value}).body == f'{{"created_at":"{value.isoformat()}"}}'.encode()
+
+# Routes answering with FastJSONResponse and the schema documented as their response_model
+FAST_ROUTES = [
+    ("/words?language_code=ja", PaginatedWords),
+    ("/words/search?q=meaning&language_code=ja", PaginatedWords),
+    ("/words/hardest?language_code=ja", HardestWords),
+    ("/groups?language_code=ja", PaginatedGroups),
+    ("/groups/{group_id}", GroupDetail),
+    ("/study-sessions?language_code=ja", PaginatedStudySessions),
+    ("/study-sessions?language_code=ja&sort_by=reviews_count", PaginatedStudySessions),
+    ("/study-sessions/{session_id}", StudySessionDetail),
+    ("/study-sessions/{session_id}/next", List[DueWord]),
+    ("/study-activities/{activity_id}?language_code=ja", StudyActivityWithSessions),
+    ("/analytics/reviews?language_code=ja", ReviewAnalytics),
+    ("/analytics/reviews?language_code=ja&bucket=month&group_id={group_id}", ReviewAnalytics),
+]
+
+@pytest.mark.parametrize("url, schema", FAST_ROUTES)
+def test_fast_routes_match_response_model(client, db_session, study_history, url, schema):
+    # A session without reviews has no last_review_at
+    db_session.add(StudySession(group_id=study_history["group_id"], study_activity_id=study_history["activity_id"]))
+    db_session.commit()
+    rebuild_word_difficulty(db_session)
+
+    response = client.get(url.format(**study_history))
+    assert response.status_code == 200
+    # The body is exactly what validating and serializing through the response_model would produce
+    adapter = TypeAdapter(schema)
+    assert adapter.dump_json(adapter.validate_json(response.content), by_alias=True) == response.content
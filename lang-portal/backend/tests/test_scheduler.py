@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta
+from app.utils.scheduler import INITIAL_EASE, MIN_EASE, Schedule, next_schedule
+
+START = datetime(2024, 3, 1, 12, 0)
+
+def test_next_schedule_correct_answers():
+    """Correct answers space a word out by 1 day, 6 days, then the interval times the ease."""
+    schedule = Schedule(START, 0, INITIAL_EASE, 0)
+    expected = [(1, 2.6, 1), (6, 2.7, 2), (16, 2.8, 3), (45, 2.9, 4)]
+    for interval_days, ease, repetitions in expected:
+        reviewed_at = schedule.due_at
+        schedule = next_schedule(schedule, True, reviewed_at)
+        assert schedule == Schedule(reviewed_at + timedelta(days=interval_days), interval_days, ease, repetitions)
+
+def test_next_schedule_wrong_answers():
+    """A wrong answer restarts the word at 1 day and lowers its ease, never below the minimum."""
+    schedule = Schedule(START, 16, 2.8, 3)
+    schedule = next_schedule(schedule, False, START)
+    assert schedule == Schedule(START + timedelta(days=1), 1, 2.48, 0)
+
+    for _ in range(10):
+        schedule = next_schedule(schedule, False, START)
+    assert schedule.ease == MIN_EASE
+
+    # The interval of a lapsed word grows again from the start with its lowered ease
+    schedule = next_schedule(schedule, True, START)
+    schedule = next_schedule(schedule, True, START)
+    schedule = next_schedule(schedule, True, START)
+    assert (schedule.interval_days, schedule.repetitions) == (round(6 * 1.5), 3)
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import text
+from app.utils.search import (
+    ARABIC_FOLDS, LATIN_FOLDS, build_match_query, build_tsquery, fold_diacritics, fold_diacritics_sql, fold_sql,
+    fold_text
+)
+
+SAMPLES = ["كِتَابٌ", "آمَنَ", "ـعَرَبِيّـ", "ٱلْقُرْآن", "食べる", "élève", "", "".join(ARABIC_FOLDS)]
+
+def test_fold_text():
+    assert fold_text("كِتَابٌ") == "كتاب"
+    assert fold_text("مَدْرَسَةٌ") == "مدرسه"
+    assert fold_text("إِلَى") == "الي"
+    assert fold_text("école mañana") == "école mañana"
+
+@pytest.mark.sqlite_only
+def test_fold_sql_matches_fold_text(db_session):
+    """The SQL used by the index triggers folds exactly like queries are folded."""
+    for sample in SAMPLES:
+        folded = db_session.execute(text(f"SELECT {fold_sql(':value')}"), {"value": sample}).scalar()
+        assert folded == fold_text(sample)
+
+def test_fold_diacritics():
+    assert fold_diacritics("École Mañana Łódź") == "Ecole Manana Łodz"
+    assert fold_diacritics("كِتَابٌ") == "كتاب"
+
+@pytest.mark.postgresql_only
+def test_fold_diacritics_sql_matches_fold_diacritics(db_session):
+    """The SQL of PostgreSQL's index triggers folds exactly like its queries are folded."""
+    for sample in SAMPLES + ["École Mañana Łódź", "".join(LATIN_FOLDS)]:
+        folded = db_session.execute(text(f"SELECT {fold_diacritics_sql('CAST(:value AS VARCHAR)')}"), {"value": sample}).scalar()
+        assert folded == fold_diacritics(sample)
+
+def test_build_match_query():
+    assert build_match_query("Tab eat", "ja") == (
+        '{script transliteration meaning} : ("Tab"* AND "eat"*) AND language_code : "ja"'
+    )
+    assert build_match_query('a"b OR كِتَاب', 'x"y') == (
+        '{script transliteration meaning} : ("a"* AND "b"* AND "OR"* AND "كتاب"*) AND language_code : "x""y"'
+    )
+    assert build_match_query(' "*- ', "ja") is None
+
+def test_build_tsquery():
+    assert build_tsquery("Tab école") == "'Tab':* & 'ecole':*"
+    assert build_tsquery("a'b | !كِتَاب") == "'a':* & 'b':* & 'كتاب':*"
+    assert build_tsquery(" '*:& ") is None
@@ -161,4 +161,50 @@ def test_seed_all_error(db_session):
     with pytest.raises(Exception) as exc_info:
         seed_all(db_session, include_test_data=False)
     
-    assert "Error seeding database" in str(exc_info.value) 
\ No newline at end of file
+    assert "Error seeding database" in str(exc_info.value) 
+def test_seed_synthetic(db_session):
+    """The synthetic generator writes consistent, derived-data-complete rows."""
+    from app.seed import seed_synthetic
+    from app.models import StudySession, WordReviewItem, WordGroup, DailyActivity
+    from sqlalchemy import func
+
+    report = seed_synthetic(db_session, languages=3, words=50, sessions=20, reviews=400, groups=4, batch_size=64)
+
+    assert report["rows"]["languages"] == 3
+    assert report["rows"]["words"] == 150
+    assert report["rows"]["groups"] == 12
+    assert report["rows"]["word_groups"] == 150
+    assert report["rows"]["study_sessions"] == 60
+    assert report["rows"]["word_review_items"] == 1200
+    assert report["rows_per_second"] > 0
+    assert db_session.query(WordReviewItem).count() == 1200
+
+    # Every review is for a word of its session's group
+    in_group = db_session.query(WordReviewItem).join(
+        StudySession, StudySession.id == WordReviewItem.study_session_id
+    ).join(
+        WordGroup,
+        (WordGroup.word_id == WordReviewItem.word_id) & (WordGroup.group_id == StudySession.group_id)
+    ).count()
+    assert in_group == 1200
+
+    # Bulk inserts still go through the triggers maintaining derived data
+    assert db_session.query(func.sum(Word.correct_count + Word.wrong_count)).scalar() == 1200
+    assert db_session.query(func.sum(DailyActivity.reviews)).scalar() == 1200
+    assert db_session.query(func.sum(DailyActivity.sessions)).scalar() == 60
+
+def test_command_line_synthetic_seeding():
+    """Test the synthetic mode of the seed script."""
+    # Run as a module from the backend directory, as documented, so the app package is importable
+    backend_dir = os.path.dirname(os.path.dirname(__file__))
+
+    result = subprocess.run([sys.executable, "-m", "app.seed", "--synthetic", "--languages", "1",
+                             "--words", "20", "--sessions", "5", "--reviews", "50"],
+                          capture_output=True,
+                          text=True,
+                          cwd=backend_dir,
+                          env={**os.environ, "RUNNING_TEST_ON_DEV": "true"})
+    assert result.returncode == 0
+    assert "word_review_items: 50 rows" in result.stdout
+    assert "rows/sec" in result.stdout
+    assert "Database seeding completed successfully!" in result.stdout
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from app.database import BASE_DIR, Base, get_alembic_heads, schema_is_current, setup_db
+
+# Seconds allowed for importing app.main, and for the lifespan plus the first request after it
+IMPORT_BUDGET = 5.0
+FIRST_RESPONSE_BUDGET = 1.0
+
+# Run in a fresh interpreter so nothing is imported or connected yet
+MEASURE_STARTUP = """
+import json, time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+import app.main
+imported = time.perf_counter()
+with TestClient(app.main.app) as client:
+    response = client.get("/languages")
+    responded = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_response": responded - imported, "status": response.status_code}))
+"""
+
+def stamp(engine, revision: str):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)")
+        conn.exec_driver_sql("DELETE FROM alembic_version")
+        conn.exec_driver_sql("INSERT INTO alembic_version (version_num) VALUES (?)", (revision,))
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    """A database with every table, stamped with the latest migration."""
+    db_url = f"sqlite:///{tmp_path / 'startup.db'}"
+    engine, _ = setup_db(db_url)
+    Base.metadata.create_all(bind=engine)
+    stamp(engine, *get_alembic_heads())
+    yield db_url, engine
+    engine.dispose()
+
+def test_alembic_heads_match_alembic():
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    assert get_alembic_heads() == set(ScriptDirectory.from_config(config).get_heads())
+
+def test_schema_is_current(migrated_db):
+    _, engine = migrated_db
+    assert schema_is_current(engine)
+
+    # One migration behind: create_all must still run
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    [head] = get_alembic_heads()
+    stamp(engine, ScriptDirectory.from_config(config).get_revision(head).down_revision)
+    assert not schema_is_current(engine)
+
+def test_unstamped_schema_is_not_current(tmp_path):
+    engine, _ = setup_db(f"sqlite:///{tmp_path / 'unstamped.db'}")
+    Base.metadata.create_all(bind=engine)
+    assert not schema_is_current(engine)
+    engine.dispose()
+
+def test_cold_start_within_budget(migrated_db):
+    db_url, _ = migrated_db
+    env = {
+        **os.environ,
+        "DATABASE_URL": db_url,
+        "ENVIRONMENT": "production",
+        "TESTING": "false",
+        "SQLITE_MAINTENANCE_INTERVAL": "0",
+    }
+    env.pop("RUNNING_TEST_ON_DEV", None)
+    result = subprocess.run([sys.executable, "-c", MEASURE_STARTUP], env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    timings = json.loads(result.stdout.splitlines()[-1])
+    assert timings["status"] == 200
+    assert timings["import"] < IMPORT_BUDGET, timings
+    assert timings["first_response"] < FIRST_RESPONSE_BUDGET, timings
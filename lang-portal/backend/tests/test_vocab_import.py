@@ -0,0 +1,74 @@
+import io
+import json
+import pytest
+from app.models import Group, Language, Word
+from app.utils.vocab_import import VocabImportError, import_vocab, iter_vocab_groups
+
+def vocab_json(groups, **extra) -> bytes:
+    return json.dumps({"generated_by": "vocab-importer", "vocab_examples": groups, **extra}, ensure_ascii=False).encode()
+
+def test_iter_vocab_groups_small_reads():
+    """Groups are decoded one by one even when reads split values and UTF-8 characters."""
+    groups = [
+        {"language": "ja", "group": f"グループ{i}", "vocab": [{"script": "食べる" * 20, "meaning": "to eat"}]}
+        for i in range(5)
+    ]
+    data = vocab_json(groups, version=12345)
+    for read_size in (1, 7, 64, len(data)):
+        assert list(iter_vocab_groups(io.BytesIO(data), read_size=read_size)) == groups
+
+@pytest.mark.parametrize("data, message", [
+    (b"", "Unexpected end of file"),
+    (b"[]", "Invalid JSON: expected '{'"),
+    (b'{"vocab": []}', "Missing vocab_examples"),
+    (b'{"vocab_examples": [1]}', "vocab_examples must be a list of groups"),
+    (b'{"vocab_examples": [{"language": "ja"', "Invalid JSON: Expecting ',' delimiter"),
+    (b'{"vocab_examples": []', "Unexpected end of file"),
+    (b'\xff\xfe{}', "File is not valid UTF-8"),
+])
+def test_iter_vocab_groups_invalid(data, message):
+    with pytest.raises(VocabImportError, match=message):
+        list(iter_vocab_groups(io.BytesIO(data), read_size=4))
+
+@pytest.mark.parametrize("group, message", [
+    ({"language": "ja", "vocab": []}, "Every group needs a group name and a vocab list"),
+    ({"language": "ja", "group": "Food", "vocab": {}}, "Every group needs a group name and a vocab list"),
+    ({"group": "Food", "vocab": []}, "Every group needs a language code"),
+    ({"language": ["ja"], "group": "Food", "vocab": []}, "Every group needs a language code"),
+    ({"language": {"code": "ja"}, "group": "Food", "vocab": []}, "Every group needs a language code"),
+    ({"language": "xx", "group": "Food", "vocab": []}, "Unknown language code: xx"),
+])
+def test_import_vocab_invalid_group(db_session, group, message):
+    db_session.add(Language(code="ja", name="Japanese"))
+    db_session.commit()
+    with pytest.raises(VocabImportError, match=message):
+        import_vocab(db_session, [io.BytesIO(vocab_json([group]))])
+
+def test_import_vocab_batches(db_session):
+    """Words are upserted across groups and batches; a repeated word counts once per change."""
+    db_session.add(Language(code="es", name="Spanish"))
+    db_session.commit()
+    data = vocab_json([
+        {"language": "es", "group": "Food", "vocab": [
+            {"script": "pan", "transliteration": "", "meaning": "bread"},
+            {"script": "queso", "meaning": "cheese"},
+            {"script": "agua", "meaning": "water"},
+        ]},
+        {"language": "es", "group": "Drinks", "vocab": [
+            {"script": "agua", "meaning": "water"},
+            {"script": "vino", "meaning": "wine"},
+            {"script": "pan", "meaning": "bread roll"},
+            {"script": "leche"},
+        ]},
+    ])
+
+    report = import_vocab(db_session, [io.BytesIO(data)], batch_size=2)
+    assert (report["groups_created"], report["inserted"], report["updated"], report["skipped"]) == (2, 4, 1, 2)
+    assert report["links_created"] == 6
+
+    words = {word.script: word for word in db_session.query(Word)}
+    assert sorted(words) == ["agua", "pan", "queso", "vino"]
+    assert words["pan"].meaning == "bread roll"
+    assert words["pan"].transliteration is None
+    assert sorted(group.name for group in words["agua"].groups) == ["Drinks", "Food"]
+    assert db_session.query(Group).count() == 2